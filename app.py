@@ -1,5 +1,12 @@
+import functools
+import time
+from collections import namedtuple
+
 import streamlit as st
-from data_loader import load_data, get_command_details
+
+import metrics
+import profiling
+from data_loader import data_fingerprint, open_catalog
 
 # Page configuration
 st.set_page_config(
@@ -8,20 +15,205 @@ st.set_page_config(
     layout="centered"
 )
 
-# Header with clear description
-st.title("🛰️ Satellite Command Lookup")
-st.markdown("**Find satellite commands and their parameters quickly**")
-st.markdown("---")
+# Commands listed per page of the picker; only the visible page is rendered
+PAGE_SIZE = 50
 
-try:
-    # Load data with loading message
-    with st.spinner("Loading satellite command database..."):
-        commands_df, params_df, enums_df = load_data()
+# Rendered details kept for the most recently viewed commands
+DETAILS_CACHE_ENTRIES = 256
+
+# Input hint for parameters without enum values, by type
+FORMAT_HINTS = {
+    'int': "Enter whole numbers",
+    'float': "Enter decimal numbers",
+    'bool': "Use true/false or 1/0",
+}
+
+# A command's details as the strings the details panel shows
+CommandView = namedtuple(
+    "CommandView", ["command", "hex_code", "description", "params", "summary", "param_list"]
+)
+ParamView = namedtuple("ParamView", ["heading", "type", "range", "values", "format_hint"])
+
+# True while the whole script runs. A fragment rerunning on its own sees
+# False: its globals are those of the last full run, reset on the way out.
+_full_rerun = False
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def get_catalog(fingerprint):
+    """
+    Return the command catalog shared by every session in this process.
+
+    The memory-mapped catalog, so replicas on one host share its pages
+    (the in-memory one if the data directory is read-only). Keyed on the
+    CSV fingerprint: when a data file changes, the next rerun gets a new
+    key, rebuilds once, and the old catalog is evicted.
+    """
+    return open_catalog()
+
+@st.cache_resource(max_entries=DETAILS_CACHE_ENTRIES, show_spinner=False)
+def command_view(_catalog, fingerprint, command_name):
+    """
+    Return the rendered details of a command, memoized per fingerprint.
+
+    Views are immutable tuples of strings, so every session shares them
+    (cache_resource) instead of unpickling a copy per hit.
+    """
+    hex_code, description, param_details = _catalog.get_command_details(command_name)
+    params, param_list = [], []
+    for i, param in enumerate(param_details, 1):
+        values = None
+        if param['enum_values']:
+            values = "  \n".join(
+                f"• `{value}` → {label}" for value, label in param['enum_values'].items()
+            )
+        params.append(ParamView(
+            f"### Parameter {i}: `{param['name']}`",
+            param['type'],
+            param['range'],
+            values,
+            FORMAT_HINTS.get(param['type'], "Enter text value"),
+        ))
+        line = f"• `{param['name']}` ({param['type']})"
+        if param['range']:
+            line += f" - Range: {param['range']}"
+        param_list.append(line)
+    summary = f"""
+    **Command:** `{command_name}`  
+    **Hex Code:** `{hex_code}`  
+    **Parameters:** {len(params)} parameter(s)  
+    **Description:** {description}
+    """
+    return CommandView(command_name, hex_code, description, tuple(params), summary,
+                       "  \n".join(param_list))
+
+def fragment(func):
+    """
+    st.fragment whose own reruns are profiled and export metrics like a
+    full rerun does; called during a full rerun, it just runs.
+
+    The fragment takes (catalog, fingerprint, ...). Its own reruns reuse
+    those of the last full run, so when the data files have changed since,
+    it reruns the whole app instead, which loads the new catalog.
+    """
+    @st.fragment
+    @functools.wraps(func)
+    def run(catalog, fingerprint, *args, **kwargs):
+        if _full_rerun:
+            return func(catalog, fingerprint, *args, **kwargs)
+        try:
+            current = data_fingerprint()
+        except FileNotFoundError:
+            current = None
+        if current != fingerprint:
+            st.rerun(scope="app")
+        profile = profiling.start_rerun(
+            force=st.query_params.get(profiling.PROFILE_QUERY_PARAM) == "1"
+        )
+        try:
+            return func(catalog, fingerprint, *args, **kwargs)
+        finally:
+            profiling.finish_rerun(profile)
+            metrics.export_from_env()
+    return run
+
+def render_details(view):
+    """Display a CommandView."""
+    st.markdown("---")
+    st.subheader("🎯 Command Details")
     
-    # Success message
-    st.success(f"✅ Loaded {len(commands_df)} commands successfully")
+    # Command info in columns for better layout
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"**Command Name:**")
+        st.code(view.command)
+    with col2:
+        st.markdown(f"**Hex Code:**")
+        st.code(view.hex_code)
     
-    # Search section
+    st.markdown(f"**Description:**")
+    st.info(view.description)
+    
+    # Parameters section
+    st.markdown("---")
+    st.subheader("⚙️ Parameters")
+    
+    if not view.params:
+        st.success("✅ This command has no parameters - ready to use!")
+    else:
+        st.markdown(f"This command requires **{len(view.params)} parameter(s)**:")
+        
+        # Display parameters in a clean, organized way
+        for i, param in enumerate(view.params, 1):
+            with st.container():
+                st.markdown(param.heading)
+                
+                # Parameter details in columns
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.markdown("**Type:**")
+                    st.code(param.type)
+                    
+                    if param.range:
+                        st.markdown("**Range:**")
+                        st.code(param.range)
+                
+                with col2:
+                    if param.values:
+                        # One element for the whole set, not one per value
+                        st.markdown("**Possible Values:**")
+                        st.markdown(param.values)
+                    else:
+                        st.markdown("**Format:**")
+                        st.write(param.format_hint)
+                
+                # Add separator between parameters
+                if i < len(view.params):
+                    st.markdown("---")
+    
+    # Quick reference section
+    st.markdown("---")
+    st.subheader("📖 Quick Reference")
+    
+    # Summary in expandable section
+    with st.expander("View command summary", expanded=False):
+        st.markdown(view.summary)
+        
+        if view.params:
+            st.markdown("**Parameter List:**")
+            st.markdown(view.param_list)
+
+@fragment
+def command_details(catalog, fingerprint, labels):
+    """
+    Command picker and details panel.
+
+    Picking another command reruns only this fragment, with the options
+    built by the last run of command_search().
+    """
+    selected_command = st.selectbox(
+        "Choose a command to view details:",
+        list(labels),
+        format_func=labels.get,
+        help="Commands are shown with their descriptions for easier selection"
+    )
+    
+    if selected_command:
+        # Get command details (memoized for recently viewed commands)
+        with metrics.STAGE_SECONDS.time(stage="details"):
+            view = command_view(catalog, fingerprint, selected_command)
+        render_start = time.perf_counter()
+        render_details(view)
+        metrics.STAGE_SECONDS.observe(time.perf_counter() - render_start, stage="render")
+
+@fragment
+def command_search(catalog, fingerprint):
+    """
+    Search box, result pages and the command_details() fragment.
+
+    Typing a query or turning a page reruns from here, without the page
+    header and the catalog load.
+    """
     st.subheader("🔍 Search Commands")
     search_query = st.text_input(
         "Type to search commands or descriptions:",
@@ -29,126 +221,76 @@ try:
         help="Search works on both command names and descriptions"
     )
     
-    # Filter commands if search query provided
+    # Filter commands if search query provided (served from the prebuilt index)
     if search_query:
-        filtered_commands = commands_df[
-            commands_df['Command'].str.contains(search_query, case=False, na=False) |
-            commands_df['Description'].str.contains(search_query, case=False, na=False)
-        ]
-        if not filtered_commands.empty:
-            st.info(f"Found {len(filtered_commands)} matching commands")
+        with metrics.STAGE_SECONDS.time(stage="search"):
+            result_rows = catalog.search_rows(search_query)
+            exact = len(result_rows) > 0
+            if not exact:
+                # Fall back to typo-tolerant, ranked suggestions
+                result_rows = [m.row for m in catalog.fuzzy_searcher.search(search_query)]
+        metrics.SEARCH_RESULTS.observe(len(result_rows))
+        if exact:
+            st.info(f"Found {len(result_rows)} matching commands")
+        elif result_rows:
+            st.info(f"No exact matches. Showing {len(result_rows)} closest commands")
         else:
             st.warning("No commands found. Try different search terms.")
     else:
-        filtered_commands = commands_df
-        st.info(f"Showing all {len(commands_df)} available commands")
+        result_rows = catalog.search_rows("")
+        st.info(f"Showing all {len(catalog)} available commands")
     
     # Command selection
-    if not filtered_commands.empty:
+    if len(result_rows):
         st.markdown("---")
         st.subheader("📋 Select Command")
         
-        # Create a more user-friendly display for the selectbox
-        command_options = []
-        for _, row in filtered_commands.iterrows():
-            command_options.append(f"{row['Command']} - {row['Description']}")
+        # Only the visible page of results is turned into options
+        page_count = -(-len(result_rows) // PAGE_SIZE)
+        page = 1
+        if page_count > 1:
+            page = st.number_input(
+                f"Page (of {page_count})",
+                min_value=1, max_value=page_count, value=1, step=1,
+                # A new query starts again from page 1
+                key=f"page:{search_query}"
+            )
+        first = (page - 1) * PAGE_SIZE
+        page_rows = result_rows[first:first + PAGE_SIZE]
+        if page_count > 1:
+            st.caption(f"Showing {first + 1}–{first + len(page_rows)} of {len(result_rows)}")
         
-        selected_display = st.selectbox(
-            "Choose a command to view details:",
-            command_options,
-            help="Commands are shown with their descriptions for easier selection"
-        )
+        # Options are Command names; the display strings are precomputed
+        with metrics.STAGE_SECONDS.time(stage="options"):
+            labels = {}
+            for row in page_rows:
+                labels.setdefault(catalog.command_names[row], catalog.display_strings[row])
         
-        if selected_display:
-            # Extract actual command name from the display string
-            selected_command = selected_display.split(" - ")[0]
-            
-            # Get command details
-            hex_code, description, param_list = get_command_details(
-                selected_command, commands_df, params_df, enums_df
-            )
-            
-            # Display command information in a clean format
-            st.markdown("---")
-            st.subheader("🎯 Command Details")
-            
-            # Command info in columns for better layout
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown(f"**Command Name:**")
-                st.code(selected_command)
-            with col2:
-                st.markdown(f"**Hex Code:**")
-                st.code(hex_code)
-            
-            st.markdown(f"**Description:**")
-            st.info(description)
-            
-            # Parameters section
-            st.markdown("---")
-            st.subheader("⚙️ Parameters")
-            
-            if not param_list:
-                st.success("✅ This command has no parameters - ready to use!")
-            else:
-                st.markdown(f"This command requires **{len(param_list)} parameter(s)**:")
-                
-                # Display parameters in a clean, organized way
-                for i, param in enumerate(param_list, 1):
-                    with st.container():
-                        st.markdown(f"### Parameter {i}: `{param['name']}`")
-                        
-                        # Parameter details in columns
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            st.markdown("**Type:**")
-                            st.code(param['type'])
-                            
-                            if param['range']:
-                                st.markdown("**Range:**")
-                                st.code(param['range'])
-                        
-                        with col2:
-                            if param['enum_values']:
-                                st.markdown("**Possible Values:**")
-                                for value, label in param['enum_values'].items():
-                                    st.markdown(f"• `{value}` → {label}")
-                            else:
-                                st.markdown("**Format:**")
-                                if param['type'] == 'int':
-                                    st.write("Enter whole numbers")
-                                elif param['type'] == 'float':
-                                    st.write("Enter decimal numbers")
-                                elif param['type'] == 'bool':
-                                    st.write("Use true/false or 1/0")
-                                else:
-                                    st.write("Enter text value")
-                        
-                        # Add separator between parameters
-                        if i < len(param_list):
-                            st.markdown("---")
-            
-            # Quick reference section
-            st.markdown("---")
-            st.subheader("📖 Quick Reference")
-            
-            # Summary in expandable section
-            with st.expander("View command summary", expanded=False):
-                st.markdown(f"""
-                **Command:** `{selected_command}`  
-                **Hex Code:** `{hex_code}`  
-                **Parameters:** {len(param_list)} parameter(s)  
-                **Description:** {description}
-                """)
-                
-                if param_list:
-                    st.markdown("**Parameter List:**")
-                    for param in param_list:
-                        param_info = f"• `{param['name']}` ({param['type']})"
-                        if param['range']:
-                            param_info += f" - Range: {param['range']}"
-                        st.markdown(param_info)
+        command_details(catalog, fingerprint, labels)
+
+# Header with clear description
+st.title("🛰️ Satellite Command Lookup")
+st.markdown("**Find satellite commands and their parameters quickly**")
+st.markdown("---")
+
+# Opt-in profiling of this rerun (sampled, or forced with ?profile=1)
+rerun_profile = profiling.start_rerun(
+    force=st.query_params.get(profiling.PROFILE_QUERY_PARAM) == "1"
+)
+_full_rerun = True
+
+try:
+    # Load data with loading message
+    with st.spinner("Loading satellite command database..."), \
+            metrics.STAGE_SECONDS.time(stage="load"):
+        fingerprint = data_fingerprint()
+        catalog = get_catalog(fingerprint)
+    
+    # Success message
+    st.success(f"✅ Loaded {len(catalog)} commands successfully")
+    
+    # Search, picker and details rerun as fragments from here on
+    command_search(catalog, fingerprint)
 
 except FileNotFoundError:
     st.error("❌ CSV files not found!")
@@ -158,7 +300,8 @@ except FileNotFoundError:
     if st.button("🔄 Generate Sample Data", type="primary"):
         with st.spinner("Generating sample data..."):
             try:
-                exec(open('generate_data.py').read())
+                import generate_data
+                generate_data.write_sample_data()
                 st.success("✅ Sample data generated! Please refresh the page.")
             except Exception as e:
                 st.error(f"Error: {str(e)}")
@@ -172,3 +315,7 @@ except Exception as e:
     3. Try running `python generate_data.py` to recreate the files
     """)
 
+finally:
+    _full_rerun = False
+    profiling.finish_rerun(rerun_profile)
+    metrics.export_from_env()
@@ -0,0 +1,364 @@
+"""
+Benchmark Suite for the Load, Search and Details Hot Paths
+
+Generates reproducible synthetic dictionaries (see generate_data.py) at
+several sizes and times:
+- load_cold_csv:      load_catalog() with no snapshot and an empty cache
+- load_cold_snapshot: load_catalog() from the compiled snapshot
+- load_warm:          load_catalog() on a warm in-process cache
+- search:             CommandCatalog.search() over a fixed query mix
+- fuzzy_search:       CommandCatalog.fuzzy_search() over misspelled queries
+- details:            get_command_details() for the most parameter-heavy commands
+- app_rerun:          one Streamlit script rerun of app.py (needs streamlit)
+
+Each benchmark reports count, mean, min, max and p50/p95/p99 in
+milliseconds. Memory is reported per size as well: the catalog's own
+estimate (CommandCatalog.memory_bytes()) and the resident memory a fresh
+process adds by loading the catalog from its snapshot. Results are
+written as JSON tagged with the git commit, so runs from two commits can
+be compared with --compare.
+
+Usage:
+    python benchmark.py --sizes 1000,100000 --output results.json
+    python benchmark.py --compare before.json after.json
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import data_loader
+import generate_data
+
+DEFAULT_SIZES = "1000,10000,100000"
+DEFAULT_DATA_DIR = ".bench_data"
+DEFAULT_OUTPUT = "benchmark_results.json"
+
+
+def summarize(samples):
+    """
+    Summarize latency samples.
+
+    Args:
+        samples (list): Durations in seconds
+
+    Returns:
+        dict: count, mean, min, max, p50, p95, p99 in milliseconds
+    """
+    ordered = sorted(samples)
+
+    def percentile(p):
+        # Nearest-rank percentile
+        rank = max(1, math.ceil(p / 100 * len(ordered)))
+        return ordered[rank - 1] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "min_ms": ordered[0] * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "p50_ms": percentile(50),
+        "p95_ms": percentile(95),
+        "p99_ms": percentile(99),
+    }
+
+
+def time_calls(func, args_list):
+    """Time func(*args) for each args tuple, returning durations in seconds."""
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def prepare_dataset(size, seed, data_root):
+    """
+    Generate (or reuse) a synthetic dictionary of a given size.
+
+    Args:
+        size (int): Number of commands
+        seed (int): Generator seed
+        data_root (str): Directory holding generated datasets
+
+    Returns:
+        str: Directory containing the CSV files
+    """
+    data_dir = os.path.join(data_root, f"{size}-seed{seed}")
+    if not all(os.path.exists(os.path.join(data_dir, f)) for f in data_loader.DATA_FILES):
+        generate_data.write_synthetic_data(
+            data_dir, commands=size, params_per_command=8, seed=seed
+        )
+    return data_dir
+
+
+def _reset_cache(data_dir, remove_snapshot):
+    data_loader._cache_entry = None
+    if remove_snapshot:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.path.join(data_dir, data_loader.SNAPSHOT_FILE))
+
+
+def bench_load(data_dir, repeats):
+    """Cold (CSV and snapshot) and warm load_catalog() timings."""
+    results = {}
+
+    def cold_csv():
+        _reset_cache(data_dir, remove_snapshot=True)
+        data_loader.load_catalog(data_dir)
+
+    def cold_snapshot():
+        _reset_cache(data_dir, remove_snapshot=False)
+        data_loader.load_catalog(data_dir)
+
+    results["load_cold_csv"] = time_calls(cold_csv, [()] * repeats)
+    results["load_cold_snapshot"] = time_calls(cold_snapshot, [()] * repeats)
+    results["load_warm"] = time_calls(
+        lambda: data_loader.load_catalog(data_dir), [()] * (repeats * 100)
+    )
+    return results
+
+
+def make_queries(catalog, count, seed):
+    """
+    Build a reproducible query mix: description words, command fragments,
+    multi-word phrases and misses.
+    """
+    rng = random.Random(seed)
+    commands = catalog.commands_df['Command']
+    queries = []
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            queries.append(rng.choice(generate_data.DESCRIPTION_WORDS))
+        elif kind == 1:
+            name = commands.iloc[rng.randrange(len(commands))]
+            start = rng.randrange(max(1, len(name) - 6))
+            queries.append(name[start:start + rng.randint(4, 10)])
+        elif kind == 2:
+            queries.append(" ".join(rng.sample(generate_data.DESCRIPTION_WORDS, 2)))
+        else:
+            queries.append(f"nomatch{rng.randrange(10**6)}")
+    return queries
+
+
+def misspell(text, rng):
+    """Drop one random character, as a cheap typo."""
+    if len(text) < 4:
+        return text
+    i = rng.randrange(1, len(text) - 1)
+    return text[:i] + text[i + 1:]
+
+
+def bench_search(catalog, queries, seed):
+    """Substring and fuzzy search latency distributions."""
+    rng = random.Random(seed)
+    commands = catalog.commands_df['Command']
+    typos = [
+        misspell(commands.iloc[rng.randrange(len(commands))], rng)
+        for _ in range(max(10, len(queries) // 10))
+    ]
+    return {
+        "search": time_calls(catalog.search, [(q,) for q in queries]),
+        "fuzzy_search": time_calls(catalog.fuzzy_search, [(q,) for q in typos]),
+    }
+
+
+def bench_details(catalog, count):
+    """get_command_details() latency for the most parameter-heavy commands."""
+    param_counts = catalog.commands_df['Params'].fillna("").str.count(",")
+    heavy = catalog.commands_df['Command'][param_counts.nlargest(count).index]
+    return {"details": time_calls(catalog.get_command_details, [(c,) for c in heavy])}
+
+
+def bench_app_rerun(data_dir, repeats, query):
+    """
+    Time Streamlit reruns of app.py against a dataset.
+
+    Returns an empty dict when streamlit is not installed.
+    """
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        return {}
+
+    app_path = os.path.abspath("app.py")
+    previous_dir = os.getcwd()
+    os.chdir(data_dir)
+    try:
+        app = AppTest.from_file(app_path, default_timeout=600)
+        app.run()
+        rerun = time_calls(app.run, [()] * repeats)
+        app.text_input[0].input(query)
+        search_rerun = time_calls(app.run, [()] * repeats)
+    finally:
+        os.chdir(previous_dir)
+    return {"app_rerun": rerun, "app_rerun_search": search_rerun}
+
+
+# Run in a fresh interpreter, so earlier benchmarks don't skew its RSS
+_MEMORY_SCRIPT = """
+import json, sys
+import data_loader, metrics
+before = metrics.resident_bytes()
+catalog = data_loader.load_catalog(sys.argv[1])
+print(json.dumps({"catalog_mb": catalog.memory_bytes() / 2**20,
+                  "rss_mb": (metrics.resident_bytes() - before) / 2**20}))
+"""
+
+
+def bench_memory(data_dir):
+    """
+    Memory held by a catalog loaded from its (already written) snapshot.
+
+    Returns:
+        dict: catalog_mb (memory_bytes() estimate) and rss_mb (resident
+            memory added by loading), in MiB
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", _MEMORY_SCRIPT, data_dir],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def git_commit():
+    """Return the current git commit hash, or None outside a repo."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes, seed=0, repeats=3, queries=200, details=50,
+                   data_root=DEFAULT_DATA_DIR, app=True):
+    """
+    Run the whole suite.
+
+    Args:
+        sizes (list): Dataset sizes (number of commands)
+        seed (int): Dataset and query seed
+        repeats (int): Repetitions of the load and app benchmarks
+        queries (int): Number of search queries per size
+        details (int): Number of details lookups per size
+        data_root (str): Directory for generated datasets
+        app (bool): Include the Streamlit rerun benchmark
+
+    Returns:
+        dict: {"meta": {...}, "results": [{size, benchmark, count, ...}],
+            "memory": [{size, catalog_mb, rss_mb}]}
+    """
+    results = []
+    memory = []
+    for size in sizes:
+        data_dir = prepare_dataset(size, seed, data_root)
+        print(f"Benchmarking {size} commands ({data_dir})...")
+
+        samples = bench_load(data_dir, repeats)
+        catalog = data_loader.load_catalog(data_dir)
+        query_list = make_queries(catalog, queries, seed)
+        samples.update(bench_search(catalog, query_list, seed))
+        samples.update(bench_details(catalog, details))
+        if app:
+            samples.update(bench_app_rerun(data_dir, repeats, query_list[0]))
+
+        for name, values in samples.items():
+            row = {"size": size, "benchmark": name, **summarize(values)}
+            results.append(row)
+            print(f"  {name:20} p50 {row['p50_ms']:10.3f} ms   "
+                  f"p95 {row['p95_ms']:10.3f} ms   p99 {row['p99_ms']:10.3f} ms")
+
+        usage = {"size": size, **bench_memory(data_dir)}
+        memory.append(usage)
+        print(f"  {'memory':20} catalog {usage['catalog_mb']:9.1f} MiB   "
+              f"rss {usage['rss_mb']:9.1f} MiB")
+
+    meta = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "seed": seed,
+    }
+    return {"meta": meta, "results": results, "memory": memory}
+
+
+def compare(before_path, after_path):
+    """
+    Print p50/p95 ratios between two result files.
+
+    Args:
+        before_path (str): Baseline results JSON
+        after_path (str): New results JSON
+    """
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+
+    baseline = {(r["size"], r["benchmark"]): r for r in before["results"]}
+    print(f"{'size':>9} {'benchmark':20} {'p50 before':>12} {'p50 after':>12} {'ratio':>7}")
+    for row in after["results"]:
+        old = baseline.get((row["size"], row["benchmark"]))
+        if old is None:
+            continue
+        ratio = row["p50_ms"] / old["p50_ms"] if old["p50_ms"] else float("inf")
+        print(f"{row['size']:>9} {row['benchmark']:20} {old['p50_ms']:12.3f} "
+              f"{row['p50_ms']:12.3f} {ratio:7.2f}")
+
+    old_memory = {row["size"]: row for row in before.get("memory", [])}
+    for row in after.get("memory", []):
+        old = old_memory.get(row["size"])
+        if old is None:
+            continue
+        for key in ("catalog_mb", "rss_mb"):
+            ratio = row[key] / old[key] if old[key] else float("inf")
+            print(f"{row['size']:>9} {key:20} {old[key]:12.1f} {row[key]:12.1f} {ratio:7.2f}")
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark load, search and details paths")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"Comma-separated dataset sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("--seed", type=int, default=0, help="Dataset and query seed")
+    parser.add_argument("--repeats", type=int, default=3, help="Load/app repetitions")
+    parser.add_argument("--queries", type=int, default=200, help="Search queries per size")
+    parser.add_argument("--details", type=int, default=50, help="Details lookups per size")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR,
+                        help=f"Where generated datasets are kept (default: {DEFAULT_DATA_DIR})")
+    parser.add_argument("--no-app", action="store_true", help="Skip the Streamlit rerun benchmark")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT,
+                        help=f"Results JSON path (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="Compare two results files instead of running")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = run_benchmarks(
+        [int(s) for s in args.sizes.split(",")],
+        seed=args.seed, repeats=args.repeats, queries=args.queries,
+        details=args.details, data_root=args.data_dir, app=not args.no_app,
+    )
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Catalog Data Files
+
+Names of the CSV files (and their per-subsystem shards) that make up a
+command dictionary, the compiled files derived from them, and the
+fingerprint used to tell when those are stale.
+
+Standard library only, so that the fast lookup path (quick_lookup.py)
+can check the mapped catalog without importing pandas.
+"""
+
+import glob
+import os
+
+# Data file names, relative to the data directory
+COMMANDS_FILE = "master_commands.csv"
+PARAMS_FILE = "parameter_metadata.csv"
+ENUMS_FILE = "enum_definitions.csv"
+DATA_FILES = (COMMANDS_FILE, PARAMS_FILE, ENUMS_FILE)
+
+# Per-subsystem shards, e.g. master_commands_power.csv, loaded alongside
+# (or instead of) the base files and merged in file name order
+SHARD_PATTERNS = {
+    COMMANDS_FILE: "master_commands_*.csv",
+    PARAMS_FILE: "parameter_metadata_*.csv",
+    ENUMS_FILE: "enum_definitions_*.csv",
+}
+
+# Compiled catalog snapshot, rebuilt automatically when the CSVs change
+SNAPSHOT_FILE = "command_catalog.snapshot"
+
+# Memory-mapped catalog layout, shared by every process on the host
+MAPPED_FILE = "command_catalog.cmap"
+
+
+def data_files(data_dir="."):
+    """
+    List the CSV files of a data directory, base file first, then shards.
+
+    Args:
+        data_dir (str): Directory containing the CSV files
+
+    Returns:
+        tuple: (commands_files, params_files, enums_files), lists of paths
+
+    Raises:
+        FileNotFoundError: If there is neither a base file nor a shard of
+            one of the three kinds
+    """
+    files = []
+    for name in DATA_FILES:
+        paths = sorted(glob.glob(os.path.join(glob.escape(data_dir), SHARD_PATTERNS[name])))
+        base = os.path.join(data_dir, name)
+        if os.path.exists(base):
+            paths.insert(0, base)
+        if not paths:
+            raise FileNotFoundError(f"No {name} or {SHARD_PATTERNS[name]} in {data_dir}")
+        files.append(paths)
+    return tuple(files)
+
+
+def data_fingerprint(data_dir="."):
+    """
+    Fingerprint the CSV data files by size and modification time.
+
+    Args:
+        data_dir (str): Directory containing the CSV files
+
+    Returns:
+        tuple: ((file_name, size, mtime_ns), ...) for each data file,
+            including every shard
+
+    Raises:
+        FileNotFoundError: If a data file is missing
+    """
+    fingerprint = []
+    for paths in data_files(data_dir):
+        for path in paths:
+            stat = os.stat(path)
+            fingerprint.append((os.path.basename(path), stat.st_size, stat.st_mtime_ns))
+    return tuple(fingerprint)
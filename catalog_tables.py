@@ -0,0 +1,748 @@
+"""
+Compact Parameter and Enum Tables
+
+Array-backed tables behind CommandCatalog's details lookups, replacing
+per-row Python objects:
+- every distinct parameter is one interned ParamSpec record, and its Type
+  and EnumSet are categorical codes into small vocabularies
+- each command's parameter list is an integer range of a flat code array
+  (CSR: codes[offsets[row]:offsets[row + 1]]) instead of its comma-joined
+  Params string, which is split once per catalog
+- enum values and labels are flat arrays grouped per EnumSet, with one
+  offset range per set
+
+Memory then grows with the number of parameter references (4 bytes each),
+not with the number of per-row strings.
+"""
+
+import math
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # Optional: pandas-only splitting is slower, not different
+    pa = None
+
+# One parameter definition. range and enum_set are None when unset;
+# parameters referenced by a command but not defined get type "unknown".
+ParamSpec = namedtuple("ParamSpec", ["name", "type", "range", "enum_set"])
+
+UNKNOWN_TYPE = "unknown"
+
+# A Range is "<min>-<max>". Each bound carries its own sign, so the
+# separator is the dash after a complete number: "-180.0-180.0" and
+# "-10--5" split unambiguously where str.split("-") would not.
+_NUMBER = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+RANGE_PATTERN = rf"^\s*({_NUMBER})\s*-\s*({_NUMBER})\s*$"
+_RANGE_RE = re.compile(RANGE_PATTERN)
+
+# A HexCode: optional 0x prefix, then up to 15 hex digits (fits int64)
+HEX_CODE_PATTERN = r"^\s*(?:0[xX])?([0-9A-Fa-f]{1,15})\s*$"
+_HEX_CODE_RE = re.compile(HEX_CODE_PATTERN)
+
+# Commands whose parameter lists are split per pass
+_SPLIT_ROWS = 65_536
+
+# An enum set gets a dense value -> label table when its value span is at
+# most this many slots, or when at least a quarter of the span is used;
+# otherwise its values are looked up through a hash index
+DENSE_ENUM_SPAN = 4096
+DENSE_ENUM_FILL = 0.25
+
+
+def _missing(value):
+    return value is None or value is pd.NA or value != value
+
+
+def parse_opcode(hex_code):
+    """
+    Parse a HexCode such as "0xAF23" (prefix optional, any case).
+
+    Args:
+        hex_code (str): HexCode text
+
+    Returns:
+        int: Opcode, or None if the text isn't a hexadecimal number
+    """
+    match = _HEX_CODE_RE.match(hex_code) if isinstance(hex_code, str) else None
+    return None if match is None else int(match.group(1), 16)
+
+
+def parse_opcodes(hex_codes):
+    """
+    Parse a column of HexCodes (or opcodes) in one pass.
+
+    Distinct values are parsed once, so a log repeating a few opcodes
+    millions of times costs one factorize plus a handful of int() calls.
+
+    Args:
+        hex_codes (array-like): HexCode strings, or integer opcodes
+
+    Returns:
+        ndarray: int64 opcodes, -1 where a value isn't valid hex (or is a
+            negative integer)
+    """
+    if not isinstance(hex_codes, (pd.Series, pd.Index, np.ndarray)):
+        hex_codes = np.array(list(hex_codes), dtype=object)
+    if hex_codes.dtype.kind in "iu":
+        return np.where(hex_codes >= 0, hex_codes, -1).astype(np.int64)
+
+    value_codes, uniques = pd.factorize(hex_codes)
+    parsed = np.full(len(uniques) + 1, -1, dtype=np.int64)
+    if isinstance(uniques.dtype, pd.StringDtype):
+        # Validate with the (Arrow) regex kernel; int() accepts the prefix
+        # and surrounding whitespace by itself
+        texts = pd.Series(uniques)
+        valid = texts.str.fullmatch(HEX_CODE_PATTERN).fillna(False).to_numpy(dtype=bool)
+        parsed[np.flatnonzero(valid)] = [int(text, 16) for text in texts[valid].tolist()]
+    else:
+        parsed[:-1] = [opcode_value(value) for value in np.asarray(uniques, dtype=object).tolist()]
+    return parsed[value_codes]
+
+
+def opcode_value(value):
+    """Opcode of one HexCode string or integer, -1 if it has none."""
+    if isinstance(value, (int, np.integer)) and not isinstance(value, (bool, np.bool_)):
+        return int(value) if value >= 0 else -1
+    opcode = parse_opcode(value)
+    return -1 if opcode is None else opcode
+
+
+def parse_range(text):
+    """
+    Parse a Range string such as "0-300" or "-180.0-180.0".
+
+    Args:
+        text (str): Range
+
+    Returns:
+        tuple: (min, max) floats
+
+    Raises:
+        ValueError: If the text isn't "<min>-<max>" or min > max
+    """
+    match = _RANGE_RE.match(text)
+    if match is None:
+        raise ValueError(f"Malformed range {text!r}: expected '<min>-<max>'")
+    low, high = float(match.group(1)), float(match.group(2))
+    if low > high:
+        raise ValueError(f"Malformed range {text!r}: min is greater than max")
+    return low, high
+
+
+def parse_ranges(ranges):
+    """
+    Parse a column of Range strings in one vectorized pass.
+
+    Args:
+        ranges (Series): Range strings; NA or blank means no range
+
+    Returns:
+        tuple: (low, high, errors) - float64 bounds, NaN where there is no
+            usable range, and {position: message} for malformed entries
+    """
+    ranges = ranges.astype(object).reset_index(drop=True)
+    bounds = ranges.str.extract(RANGE_PATTERN)
+    low = pd.to_numeric(bounds[0]).to_numpy(dtype=np.float64, na_value=np.nan)
+    high = pd.to_numeric(bounds[1]).to_numpy(dtype=np.float64, na_value=np.nan)
+
+    given = ranges.notna().to_numpy() & (ranges.str.strip() != "").fillna(False).to_numpy()
+    bad = given & (np.isnan(low) | (low > high))
+    errors = {}
+    for position in np.flatnonzero(bad).tolist():
+        try:
+            parse_range(ranges[position])
+        except ValueError as e:
+            errors[position] = str(e)
+    low[bad] = np.nan
+    high[bad] = np.nan
+    return low, high, errors
+
+
+# Parameter value converters, shared by encoder.CommandEncoder (one value
+# at a time) and CommandCatalog.validate_params() (via convert_values()).
+# Each returns the value to encode or raises ValueError. They check the
+# exact builtin type first: most values are plain ints, floats and strs,
+# and isinstance() against numpy types is slower.
+
+
+def to_int(value):
+    """int parameter: an integral number, not a bool."""
+    if type(value) is int:
+        return value
+    if isinstance(value, (int, np.integer)) and not isinstance(value, (bool, np.bool_)):
+        return int(value)
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return int(value)
+    raise ValueError(f"expected an integer, got {value!r}")
+
+
+def to_float(value):
+    """float parameter: a finite number, not a bool."""
+    if type(value) is float and math.isfinite(value):
+        return value
+    if isinstance(value, (int, float, np.integer, np.floating)) \
+            and not isinstance(value, (bool, np.bool_)):
+        value = float(value)
+        if math.isfinite(value):
+            return value
+    raise ValueError(f"expected a finite number, got {value!r}")
+
+
+def to_bool(value):
+    """bool parameter: True/False, or the integers 0 and 1."""
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)) and value in (0, 1):
+        return bool(value)
+    raise ValueError(f"expected a boolean, got {value!r}")
+
+
+VALUE_CONVERTERS = {"int": to_int, "float": to_float, "bool": to_bool}
+
+
+def enum_converter(codec):
+    """
+    Converter for an enum parameter: a raw integer value of the set or
+    one of its labels, returned as the raw value.
+
+    Args:
+        codec (EnumCodec): The parameter's enum set
+    """
+    # Labels and raw values in one dict; a label keeps its first value
+    lookup = dict(zip(codec.values.tolist(), codec.values.tolist()))
+    for label, value in zip(codec.labels.tolist(), codec.values.tolist()):
+        lookup.setdefault(label, value)
+
+    def convert(value):
+        if type(value) is str or type(value) is int:
+            result = lookup.get(value)
+            if result is not None:
+                return result
+        elif isinstance(value, np.integer) and not isinstance(value, np.bool_):
+            result = lookup.get(int(value))
+            if result is not None:
+                return result
+        elif isinstance(value, str):
+            result = lookup.get(str(value))
+            if result is not None:
+                return result
+        raise ValueError(f"{value!r} is not a value or label of enum set {codec.name}")
+    return convert
+
+
+def convert_values(convert, values):
+    """
+    Run a value converter over an array, once per distinct value.
+
+    Args:
+        convert (callable): Converter, e.g. from VALUE_CONVERTERS
+        values (ndarray): Values to convert
+
+    Returns:
+        tuple: (ok, converted) - bool mask of accepted values, and their
+            converted values as float64 (NaN where rejected)
+    """
+    values = np.asarray(values)
+    ok = np.zeros(len(values), dtype=bool)
+    converted = np.full(len(values), np.nan)
+    if values.dtype == object:
+        # 1, 1.0 and True are equal dict keys but not equally valid:
+        # convert each Python type apart
+        type_codes, types = pd.factorize(pd.Series(values, dtype=object).map(type))
+        parts = [np.flatnonzero(type_codes == code) for code in range(len(types))]
+    else:
+        parts = [np.arange(len(values))]
+    for at in parts:
+        part = values[at]
+        try:
+            codes, uniques = pd.factorize(part)
+        except TypeError:
+            # Unhashable values: convert one by one
+            codes, uniques = np.arange(len(part)), part
+        # Trailing slot for missing values (code -1)
+        unique_ok = np.zeros(len(uniques) + 1, dtype=bool)
+        unique_converted = np.full(len(uniques) + 1, np.nan)
+        for i, value in enumerate(uniques):
+            try:
+                unique_converted[i] = convert(value)
+            except ValueError:
+                continue
+            unique_ok[i] = True
+        ok[at] = unique_ok[codes]
+        converted[at] = unique_converted[codes]
+    return ok, converted
+
+
+def encode_param_lists(params, defined):
+    """
+    Split comma-joined parameter lists into codes over a name vocabulary.
+
+    Names are stripped of surrounding whitespace. Missing and blank lists
+    count as empty; otherwise empty names (``"A,,B"``, a trailing comma)
+    are kept, and resolve like any undefined name, as in the
+    per-command lookup this replaced. With pyarrow the names are split and
+    matched inside Arrow buffers, without a Python string per reference.
+
+    Args:
+        params (Series): Params column, one comma-joined string per command
+        defined (sequence): Known parameter names; name i gets code i
+
+    Returns:
+        tuple: (offsets, codes, undefined) - row r owns codes[offsets[r]:
+            offsets[r + 1]] (int64 offsets, int32 codes); referenced names
+            missing from ``defined`` get codes len(defined) + i for
+            undefined[i], in order of first reference
+    """
+    if pa is not None:
+        # Object columns from a plain read_csv hold NaN for empty cells
+        values = pa.array(params.array, from_pandas=True)
+        if pa.types.is_null(values.type):
+            values = values.cast(pa.string())
+        value_set = pa.array(list(defined), type=pa.string())
+        undefined_codes = {}
+        counts = np.zeros(len(values), dtype=np.int64)
+        code_parts = []
+        # In slices, so the split strings never exist for the whole column
+        for start in range(0, len(values), _SPLIT_ROWS):
+            chunk = values.slice(start, _SPLIT_ROWS)
+            lists = pc.split_pattern(chunk, ",")
+            flat = pc.utf8_trim_whitespace(pc.list_flatten(lists))
+            blank = pc.fill_null(pc.equal(pc.utf8_trim_whitespace(chunk), ""), True)
+            rows = pc.list_parent_indices(lists).to_numpy()
+            keep = ~blank.to_numpy(zero_copy_only=False)[rows]
+            rows = rows[keep]
+            counts[start:start + len(lists)] = np.bincount(rows, minlength=len(lists))
+            flat = flat.filter(pa.array(keep))
+            found = pc.index_in(flat, value_set=value_set)
+            codes = pc.fill_null(found, -1).to_numpy().astype(np.int32)
+            missing = np.flatnonzero(codes < 0)
+            if len(missing):
+                names = flat.take(pa.array(missing)).to_pylist()
+                codes[missing] = [
+                    len(defined) + undefined_codes.setdefault(name, len(undefined_codes))
+                    for name in names
+                ]
+            code_parts.append(codes)
+        codes = np.concatenate(code_parts) if code_parts else np.empty(0, dtype=np.int32)
+        undefined = list(undefined_codes)
+    else:
+        params = params.reset_index(drop=True)
+        blank = params.str.strip().fillna("").eq("").to_numpy(dtype=bool)
+        split = params.str.split(",").explode().str.strip()
+        split = split[split.notna().to_numpy(dtype=bool) & ~blank[split.index.to_numpy()]]
+        counts = np.bincount(split.index.to_numpy(dtype=np.int64), minlength=len(params))
+        codes = pd.Index(list(defined), dtype=object).get_indexer(split.to_numpy(dtype=object))
+        missing = codes < 0
+        undefined = []
+        if missing.any():
+            extra_codes, extra_names = pd.factorize(split.to_numpy(dtype=object)[missing])
+            codes[missing] = len(defined) + extra_codes
+            undefined = list(extra_names)
+        codes = codes.astype(np.int32)
+
+    offsets = np.zeros(len(params) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets, codes, undefined
+
+
+class ArrowTextColumn:
+    """
+    Read-only row access to an Arrow-backed string column.
+
+    Indexing the pandas extension array costs several microseconds per
+    cell. A single-chunk column without missing values is read straight
+    from its offsets and data buffers instead (under a microsecond);
+    anything else goes through pyarrow scalars. Missing cells read as
+    pd.NA, as from the pandas column.
+
+    Args:
+        array (ArrowStringArray): Column values, e.g. ``series.array``
+    """
+
+    __slots__ = ("_chunks", "_offsets", "_data")
+
+    def __init__(self, array):
+        self._chunks = array.__arrow_array__()
+        self._offsets = self._data = None
+        if self._chunks.num_chunks == 1 and self._chunks.null_count == 0:
+            chunk = self._chunks.chunk(0)
+            offset_type = np.int64 if pa.types.is_large_string(chunk.type) else np.int32
+            _, offsets, data = chunk.buffers()
+            self._offsets = np.frombuffer(offsets, dtype=offset_type)[
+                chunk.offset:chunk.offset + len(chunk) + 1]
+            self._data = memoryview(data) if data is not None else memoryview(b"")
+
+    def __len__(self):
+        return len(self._chunks)
+
+    def __getitem__(self, row):
+        if self._offsets is not None:
+            return str(self._data[self._offsets[row]:self._offsets[row + 1]], "utf-8")
+        value = self._chunks[int(row)].as_py()
+        return pd.NA if value is None else value
+
+    def __iter__(self):
+        return (pd.NA if value is None else value for value in self._chunks.to_pylist())
+
+
+def text_column(series):
+    """
+    Row-indexable view of a string column that doesn't copy its values.
+
+    Args:
+        series (Series): String column
+
+    Returns:
+        ArrowTextColumn for Arrow-backed columns; otherwise an object
+            ndarray sharing the column's Python strings
+    """
+    if pa is not None and getattr(series.dtype, "storage", None) in ("pyarrow", "pyarrow_numpy"):
+        return ArrowTextColumn(series.array)
+    return series.to_numpy(dtype=object)
+
+
+class EnumCodec:
+    """
+    Vectorized value <-> label translation for one EnumSet.
+
+    Values are kept sorted and unique (a repeated value takes its last
+    label, as in EnumTable.mapping()). Decoding uses a dense table indexed
+    by value - base for compact sets and a hash index of the sorted values
+    for sparse ones. Encoding goes through a hash index of the labels (a
+    label used by several values encodes to the first of them, in file
+    order).
+
+    Args:
+        name (str): EnumSet name
+        values (ndarray): Integer values, in file order
+        labels (ndarray): Label of each value
+
+    Attributes:
+        name (str): EnumSet name
+        values (ndarray): int64 sorted unique values
+        labels (ndarray): Object array, label of each of ``values``
+        dense (bool): Whether decoding uses a dense table
+    """
+
+    __slots__ = ("name", "values", "labels", "dense", "_base", "_table",
+                 "_value_index", "_label_index", "_label_values")
+
+    def __init__(self, name, values, labels):
+        self.name = name
+        values = np.asarray(values, dtype=np.int64)
+        labels = np.asarray(labels, dtype=object)
+
+        # Last label of each value, like the row-by-row dict
+        reverse = np.arange(len(values) - 1, -1, -1)
+        self.values, last = np.unique(values[reverse], return_index=True)
+        self.labels = labels[reverse[last]]
+
+        span = int(self.values[-1] - self.values[0]) + 1 if len(self.values) else 0
+        self.dense = 0 < span and (span <= DENSE_ENUM_SPAN
+                                   or len(self.values) >= span * DENSE_ENUM_FILL)
+        self._base = int(self.values[0]) if len(self.values) else 0
+        self._table = None
+        if self.dense:
+            self._table = np.full(span, -1, dtype=np.int64)
+            self._table[self.values - self._base] = np.arange(len(self.values))
+        self._value_index = None if self.dense else pd.Index(self.values)
+
+        # First value (in file order) of each label
+        label_codes, label_index = pd.factorize(labels)
+        named = np.flatnonzero(label_codes >= 0)
+        first = named[np.unique(label_codes[named], return_index=True)[1]]
+        self._label_index = pd.Index(label_index, dtype=object)
+        self._label_values = values[first]
+
+    def __len__(self):
+        return len(self.values)
+
+    def positions(self, values):
+        """
+        Position in ``self.values`` of each raw value, -1 where unknown.
+
+        Args:
+            values (array-like): Raw values; floats must be integral, and
+                NaN or fractional values count as unknown
+
+        Returns:
+            ndarray: int64 positions
+        """
+        raw = np.asarray(values)
+        known = None
+        if raw.dtype.kind == "f":
+            known = np.isfinite(raw) & (np.floor(raw) == raw)
+            known &= (raw >= -2.0**63) & (raw < 2.0**63)
+            keys = np.where(known, raw, 0).astype(np.int64)
+        elif raw.dtype.kind == "u" and raw.dtype.itemsize == 8:
+            known = raw <= np.iinfo(np.int64).max
+            keys = np.where(known, raw, 0).astype(np.int64)
+        elif raw.dtype.kind in "iub":
+            keys = raw.astype(np.int64, copy=False)
+        else:
+            raise TypeError(f"Enum values must be numeric, got dtype {raw.dtype}")
+
+        if not len(self.values):
+            return np.full(raw.shape, -1, dtype=np.int64)
+        if self.dense:
+            # Negative offsets wrap to huge unsigned ones, so one compare
+            # bounds-checks both ends; holes in the table are already -1
+            offset = keys - self._base
+            outside = offset.view(np.uint64) >= len(self._table)
+            positions = self._table.take(offset, mode="clip")
+        else:
+            # pandas' int64 hash engine over the sorted values; ~4x faster
+            # than np.searchsorted on large unsorted inputs
+            positions = self._value_index.get_indexer(keys.ravel()).reshape(keys.shape)
+            outside = positions < 0
+        if known is not None:
+            outside |= ~known
+        positions[outside] = -1
+        return positions
+
+    def contains(self, values):
+        """Boolean mask of raw values that are members of the set."""
+        return self.positions(values) >= 0
+
+    def contains_labels(self, labels):
+        """Boolean mask of labels (exact match) that belong to the set."""
+        labels = np.asarray(labels, dtype=object)
+        return self._label_index.get_indexer(labels.ravel()).reshape(labels.shape) >= 0
+
+    def decode(self, values, unknown=None):
+        """
+        Translate raw values to labels in one pass.
+
+        Args:
+            values (array-like): Raw values, any shape
+            unknown: Label for values outside the set, or "raise" to
+                raise KeyError if there are any
+
+        Returns:
+            ndarray: Object array of labels, same shape as ``values``
+
+        Raises:
+            KeyError: If unknown="raise" and a value is not in the set
+        """
+        positions = self.positions(values)
+        missing = positions < 0
+        if unknown == "raise" and missing.any():
+            examples = np.unique(np.asarray(values)[missing])[:5].tolist()
+            raise KeyError(f"{np.count_nonzero(missing)} values not in enum set "
+                           f"{self.name}, e.g. {examples}")
+        if not len(self.labels):
+            return np.full(positions.shape, unknown, dtype=object)
+        # -1 picks the last label; overwritten just below
+        labels = self.labels.take(positions)
+        labels[missing] = unknown
+        return labels
+
+    def encode(self, labels, unknown=-1):
+        """
+        Translate labels back to raw values in one pass.
+
+        Args:
+            labels (array-like): Labels, any shape (matched exactly,
+                case-sensitive)
+            unknown (int or str): Value for labels outside the set, or
+                "raise" to raise KeyError if there are any
+
+        Returns:
+            ndarray: int64 values, same shape as ``labels``
+
+        Raises:
+            KeyError: If unknown="raise" and a label is not in the set
+        """
+        labels = np.asarray(labels, dtype=object)
+        positions = self._label_index.get_indexer(labels.ravel()).reshape(labels.shape)
+        missing = positions < 0
+        if unknown == "raise":
+            if missing.any():
+                examples = list(dict.fromkeys(labels[missing].tolist()))[:5]
+                raise KeyError(f"{np.count_nonzero(missing)} labels not in enum set "
+                               f"{self.name}, e.g. {examples}")
+            unknown = 0
+        values = np.full(labels.shape, unknown, dtype=np.int64)
+        values[~missing] = self._label_values[positions[~missing]]
+        return values
+
+
+class EnumTable:
+    """
+    Enum values and labels grouped per EnumSet.
+
+    Sets keep their first-appearance order and values their file order;
+    a repeated value keeps its first position and its last label, like
+    the dict built row by row that this replaces.
+
+    Args:
+        enums_df (DataFrame): Enum definitions (EnumSet, Value, Label)
+    """
+
+    __slots__ = ("set_names", "set_offsets", "values", "labels",
+                 "_set_codes", "_value_strs", "_codecs")
+
+    def __init__(self, enums_df):
+        codes, uniques = pd.factorize(enums_df['EnumSet'])
+        valid = np.flatnonzero(codes >= 0)
+        order = valid[np.argsort(codes[valid], kind="stable")]
+
+        self.set_names = list(uniques)
+        self.set_offsets = np.zeros(len(uniques) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes[valid], minlength=len(uniques)),
+                  out=self.set_offsets[1:])
+        self.values = enums_df['Value'].to_numpy()[order]
+        self.labels = enums_df['Label'].to_numpy(dtype=object)[order]
+        self._set_codes = {name: code for code, name in enumerate(self.set_names)}
+        self._value_strs = [str(value) for value in self.values]
+        self._codecs = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def codec(self, enum_set):
+        """
+        Vectorized decoder of one set, compiled on first use.
+
+        Args:
+            enum_set (str): EnumSet name
+
+        Returns:
+            EnumCodec: Value <-> label tables of the set
+
+        Raises:
+            KeyError: If the set has no values
+        """
+        codec = self._codecs.get(enum_set)
+        if codec is None:
+            code = self._set_codes[enum_set]
+            start, stop = self.set_offsets[code], self.set_offsets[code + 1]
+            codec = EnumCodec(enum_set, self.values[start:stop], self.labels[start:stop])
+            self._codecs[enum_set] = codec
+        return codec
+
+    def code(self, enum_set):
+        """Position of an EnumSet name, or -1 when it has no values."""
+        return self._set_codes.get(enum_set, -1)
+
+    def mapping(self, enum_set):
+        """
+        Values of one set as a new {str(value): label} dict.
+
+        Args:
+            enum_set (str): EnumSet name
+
+        Returns:
+            dict: Fresh mapping the caller may modify, or None if the set
+                has no values
+        """
+        code = self._set_codes.get(enum_set)
+        if code is None:
+            return None
+        start, stop = self.set_offsets[code], self.set_offsets[code + 1]
+        return dict(zip(self._value_strs[start:stop], self.labels[start:stop]))
+
+    @property
+    def nbytes(self):
+        return self.set_offsets.nbytes + self.values.nbytes + self.labels.nbytes
+
+
+class ParamTable:
+    """
+    Parameter definitions plus every command's parameter list.
+
+    Codes index a vocabulary of parameter names: the defined ParamIDs
+    (first definition wins) followed by names that commands reference but
+    params_df doesn't define. Per code there is one shared ParamSpec and
+    categorical Type / EnumSet codes.
+
+    Args:
+        params_df (DataFrame): Parameter metadata
+        command_params (Series): Params column of the commands, by row
+
+    Attributes:
+        offsets (ndarray): int64, command row r owns codes[offsets[r]:offsets[r + 1]]
+        codes (ndarray): int32 vocabulary code of each parameter reference
+        names (ndarray): Object array of parameter names, by code
+        specs (list): ParamSpec by code
+        type_names (list): Type vocabulary; type_codes index it
+        type_codes (ndarray): int16 Type code by parameter code (-1 missing)
+        enum_set_names (list): EnumSet vocabulary; enum_set_codes index it
+        enum_set_codes (ndarray): int32 EnumSet code by parameter code (-1 none)
+        range_min (ndarray): float64 parsed Range minimum by parameter code,
+            NaN where there is no usable range
+        range_max (ndarray): float64 parsed Range maximum, likewise
+        range_errors (dict): ParamID -> message, for malformed Ranges
+    """
+
+    __slots__ = ("offsets", "codes", "names", "specs", "type_names",
+                 "type_codes", "enum_set_names", "enum_set_codes",
+                 "range_min", "range_max", "range_errors", "_name_index")
+
+    def __init__(self, params_df, command_params):
+        defined = params_df[params_df['ParamID'].notna()].drop_duplicates('ParamID')
+        defined_names = defined['ParamID'].to_numpy(dtype=object)
+        self.offsets, self.codes, undefined = encode_param_lists(command_params, defined_names)
+        self.names = np.concatenate((defined_names, np.array(undefined, dtype=object)))
+        n_undefined = len(undefined)
+
+        type_codes, self.type_names = pd.factorize(pd.concat([
+            defined['Type'].astype(object),
+            pd.Series([UNKNOWN_TYPE] * n_undefined, dtype=object),
+        ], ignore_index=True))
+        self.type_names = list(self.type_names)
+        self.type_codes = type_codes.astype(np.int16)
+        enum_set_codes, self.enum_set_names = pd.factorize(pd.concat([
+            defined['EnumSet'].astype(object),
+            pd.Series([None] * n_undefined, dtype=object),
+        ], ignore_index=True))
+        self.enum_set_names = list(self.enum_set_names)
+        self.enum_set_codes = enum_set_codes.astype(np.int32)
+
+        # Ranges parsed once; undefined parameters have none
+        low, high, errors = parse_ranges(defined['Range'])
+        self.range_min = np.concatenate((low, np.full(n_undefined, np.nan)))
+        self.range_max = np.concatenate((high, np.full(n_undefined, np.nan)))
+        self.range_errors = {defined_names[position]: message
+                             for position, message in errors.items()}
+        self._name_index = None
+
+        # Interned records, shared by every command that uses the parameter
+        types = defined['Type'].to_numpy(dtype=object)
+        ranges = defined['Range'].to_numpy(dtype=object)
+        enum_sets = defined['EnumSet'].to_numpy(dtype=object)
+        self.specs = [
+            ParamSpec(name, param_type,
+                      None if _missing(range_str) else range_str,
+                      None if _missing(enum_set) else enum_set)
+            for name, param_type, range_str, enum_set
+            in zip(self.names, types, ranges, enum_sets)
+        ] + [ParamSpec(name, UNKNOWN_TYPE, None, None)
+             for name in self.names[len(defined):]]
+
+    def __len__(self):
+        return len(self.specs)
+
+    def command_specs(self, row):
+        """ParamSpec of each parameter of one command row, in order."""
+        specs = self.specs
+        return [specs[code] for code in
+                self.codes[self.offsets[row]:self.offsets[row + 1]].tolist()]
+
+    def lookup(self, names):
+        """Code of each parameter name, -1 where it isn't known."""
+        if self._name_index is None:
+            self._name_index = pd.Index(self.names, dtype=object)
+        return self._name_index.get_indexer(np.asarray(names, dtype=object))
+
+    @property
+    def nbytes(self):
+        return (self.offsets.nbytes + self.codes.nbytes + self.names.nbytes
+                + self.type_codes.nbytes + self.enum_set_codes.nbytes
+                + self.range_min.nbytes + self.range_max.nbytes)
@@ -0,0 +1,21 @@
+"""
+Shared pytest fixtures.
+"""
+
+import os
+import shutil
+
+import pytest
+
+import data_loader
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Scratch copy of the CSV files with an empty in-memory cache"""
+    for name in data_loader.DATA_FILES:
+        shutil.copy(os.path.join(HERE, name), tmp_path / name)
+    monkeypatch.setattr(data_loader, "_cache_entry", None)
+    return tmp_path
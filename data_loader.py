@@ -12,62 +12,1128 @@ CSV Files Required:
 
 Usage:
     python data_loader.py [command_name]
+    python data_loader.py --batch [names.txt] > details.jsonl
 """
 
-import pandas as pd
-import argparse
 import sys
 
-# Global cache for data
-_cached_data = None
+if __name__ == "__main__":
+    # Single lookups are answered from the mapped catalog before the heavy
+    # imports below (see quick_lookup.py)
+    import quick_lookup
+    if quick_lookup.main():
+        sys.exit(0)
+
+import numpy as np
+import pandas as pd
+import json
+import os
+import threading
+import warnings
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import metrics
+from catalog_files import (
+    COMMANDS_FILE, DATA_FILES, ENUMS_FILE, MAPPED_FILE, PARAMS_FILE, SNAPSHOT_FILE,
+    data_files, data_fingerprint,
+)
+from catalog_tables import (
+    UNKNOWN_TYPE, VALUE_CONVERTERS, EnumTable, ParamSpec, ParamTable, convert_values,
+    enum_converter, opcode_value, parse_opcodes, text_column,
+)
+from fuzzy_search import FuzzySearcher
+from mapped_catalog import MappedCatalog, MappedCatalogBuilder, read_mapped_fingerprint
+from quick_lookup import print_command_details
+from search_index import SearchIndex
+from snapshot import read_snapshot, write_snapshot
+
+# Rows per chunk when streaming the CSVs into a mapped catalog
+INGEST_CHUNK_ROWS = 100_000
+
+# Free text is kept in Arrow buffers when pyarrow is available (one heap
+# per column instead of a Python object per cell). Command names stay
+# Python strings: the same objects are the keys of the command index.
+try:
+    import pyarrow  # noqa: F401
+    TEXT_DTYPE = 'string[pyarrow]'
+except ImportError:
+    TEXT_DTYPE = 'string'
+
+# Define data types for faster loading (2-3x improvement)
+# Specifying dtypes prevents pandas from inferring types, which is slow
+COMMANDS_DTYPES = {
+    'Command': 'string',
+    'HexCode': TEXT_DTYPE,
+    'Description': TEXT_DTYPE,
+    'Params': TEXT_DTYPE
+}
+
+PARAMS_DTYPES = {
+    'ParamID': 'string',
+    'Type': 'string',
+    'EnumSet': 'string',
+    'Range': 'string'
+}
+
+ENUMS_DTYPES = {
+    'EnumSet': 'string',
+    'Value': 'int32',
+    'Label': 'string'
+}
 
-def load_data():
+# Low-cardinality columns stored as categoricals once the shards are merged
+CATEGORY_COLUMNS = {
+    PARAMS_FILE: ['Type', 'EnumSet'],
+    ENUMS_FILE: ['EnumSet'],
+}
+
+# Row-level changes between two versions of one CSV. added / changed /
+# removed list row keys; row_map gives the new position of every old row
+# (-1 if removed or changed), or is None if surviving rows were reordered.
+FrameDiff = namedtuple("FrameDiff", ["added", "changed", "removed", "row_map"])
+
+# Columns identifying a row of each file when reporting changes
+ROW_KEYS = {
+    COMMANDS_FILE: ['Command'],
+    PARAMS_FILE: ['ParamID'],
+    ENUMS_FILE: ['EnumSet', 'Value'],
+}
+
+class DuplicateEntryWarning(UserWarning):
+    """The same Command or HexCode is defined by more than one shard."""
+
+class MalformedRangeWarning(UserWarning):
+    """A parameter's Range can't be parsed; its values can't be range-checked."""
+
+# Process-wide cache: one immutable (key, data, catalog) entry, replaced
+# as a whole so readers always see a consistent version
+_cache_entry = None
+_cache_lock = threading.Lock()
+
+# Catalog of the last DataFrames passed to get_command_details() and
+# friends that aren't the cached ones; see _catalog_for()
+_adhoc_catalog = None
+
+def _read_csv(path, dtypes):
+    # Module-level so process pools can pickle it
+    return pd.read_csv(path, dtype=dtypes)
+
+def find_shard_duplicates(commands_files, commands_frames):
+    """
+    Find Command and HexCode values defined by more than one shard.
+
+    HexCodes are compared case-insensitively ("0xaf23" == "0xAF23").
+
+    Args:
+        commands_files (list): Shard paths, in merge order
+        commands_frames (list): Parsed master_commands frame of each shard
+
+    Returns:
+        DataFrame: Columns Column, Value and Shards (tuple of file names,
+            first definition first); empty when the shards are disjoint
+    """
+    rows = []
+    for column in ('Command', 'HexCode'):
+        seen = pd.concat([
+            pd.DataFrame({
+                'Value': frame[column].str.strip().str.upper() if column == 'HexCode'
+                else frame[column],
+                'Shard': os.path.basename(path),
+            }).dropna().drop_duplicates()
+            for path, frame in zip(commands_files, commands_frames)
+        ])
+        shared = seen[seen.duplicated('Value', keep=False)]
+        for value, group in shared.groupby('Value', sort=True):
+            rows.append((column, value, tuple(group['Shard'])))
+    return pd.DataFrame(rows, columns=['Column', 'Value', 'Shards'])
+
+def read_shards(commands_files, params_files, enums_files, workers=None, processes=False):
+    """
+    Parse and merge any number of CSV shards concurrently.
+
+    Every file is parsed as its own task on a thread pool (or a process
+    pool, which sidesteps the GIL for the Python-level parts of parsing at
+    the cost of pickling the frames back). Shards are concatenated in the
+    order given, so duplicate keys keep resolving to their first
+    occurrence. Commands or HexCodes defined by more than one shard raise a
+    DuplicateEntryWarning; see find_shard_duplicates().
+
+    Args:
+        commands_files, params_files, enums_files (list): CSV paths per kind,
+            e.g. from data_files() or a glob
+        workers (int): Pool size; defaults to one per file, capped at the
+            CPU count
+        processes (bool): Use a process pool instead of threads
+
+    Returns:
+        tuple: (commands_df, params_df, enums_df)
+    """
+    kinds = ((commands_files, COMMANDS_DTYPES),
+             (params_files, PARAMS_DTYPES),
+             (enums_files, ENUMS_DTYPES))
+    tasks = [(path, dtypes) for paths, dtypes in kinds for path in paths]
+    if workers is None:
+        workers = min(len(tasks), os.cpu_count() or 1)
+    pool_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool_class(max_workers=max(1, workers)) as pool:
+        frames = list(pool.map(_read_csv, *zip(*tasks)))
+
+    if len(commands_files) > 1:
+        duplicates = find_shard_duplicates(commands_files, frames[:len(commands_files)])
+        if len(duplicates):
+            examples = "; ".join(
+                f"{row.Column} {row.Value} in {', '.join(row.Shards)}"
+                for row in duplicates.head(5).itertuples()
+            )
+            warnings.warn(
+                f"{len(duplicates)} duplicate entries across shards "
+                f"(first definition wins): {examples}",
+                DuplicateEntryWarning, stacklevel=2,
+            )
+
+    merged = []
+    for name, (paths, _) in zip(DATA_FILES, kinds):
+        parts, frames = frames[:len(paths)], frames[len(paths):]
+        df = parts[0] if len(parts) == 1 else pd.concat(parts, ignore_index=True)
+        # After the concat, so all shards share one set of categories
+        categories = CATEGORY_COLUMNS.get(name)
+        if categories:
+            df = df.astype({column: 'category' for column in categories})
+        merged.append(df)
+    return tuple(merged)
+
+def read_data_files(data_dir=".", workers=None, processes=False):
+    """
+    Parse the CSV files (and any shards) without caching.
+
+    Args:
+        data_dir (str): Directory containing the CSV files
+        workers (int): Parser pool size, see read_shards()
+        processes (bool): Parse in a process pool instead of threads
+
+    Returns:
+        tuple: (commands_df, params_df, enums_df)
+    """
+    return read_shards(*data_files(data_dir), workers=workers, processes=processes)
+
+def iter_data_chunks(data_dir=".", chunksize=INGEST_CHUNK_ROWS):
+    """
+    Parse the three CSV files as a stream of bounded DataFrame chunks.
+
+    Chunks use the same dtypes and shard order as read_data_files(), so
+    concatenating them gives the same frames; only one chunk is alive at a
+    time.
+
+    Args:
+        data_dir (str): Directory containing the CSV files
+        chunksize (int): Maximum rows per chunk
+
+    Yields:
+        tuple: (kind, chunk) where kind is COMMANDS_FILE, PARAMS_FILE or
+            ENUMS_FILE, in file order, one file after another
+    """
+    dtypes = (COMMANDS_DTYPES, PARAMS_DTYPES, ENUMS_DTYPES)
+    for name, kind_dtypes, paths in zip(DATA_FILES, dtypes, data_files(data_dir)):
+        for path in paths:
+            with pd.read_csv(path, dtype=kind_dtypes, chunksize=chunksize) as reader:
+                for chunk in reader:
+                    yield name, chunk
+
+def build_mapped_catalog(data_dir=".", fingerprint=None, chunksize=INGEST_CHUNK_ROWS):
+    """
+    Stream the CSV files into the memory-mapped catalog file.
+
+    Never builds full DataFrames: each chunk is encoded into the mapped
+    layout and dropped, so peak memory follows chunksize rather than the
+    size of the dictionary.
+
+    Args:
+        data_dir (str): Directory containing the CSV files
+        fingerprint (tuple): Current data_fingerprint(), computed if omitted
+        chunksize (int): Maximum rows parsed at a time
+
+    Returns:
+        str: Path of the written file
+    """
+    if fingerprint is None:
+        fingerprint = data_fingerprint(data_dir)
+
+    path = os.path.join(data_dir, MAPPED_FILE)
+    builder = MappedCatalogBuilder(path)
+    add_chunk = {
+        COMMANDS_FILE: builder.add_commands,
+        PARAMS_FILE: builder.add_params,
+        ENUMS_FILE: builder.add_enums,
+    }
+    for name, chunk in iter_data_chunks(data_dir, chunksize):
+        add_chunk[name](chunk)
+    builder.finish(fingerprint)
+    return path
+
+def row_hashes(df):
+    """
+    Hash every row of a DataFrame over all of its columns.
+
+    Uses Python's tuple hash, so values are only comparable within one
+    process (string hashing is randomized per interpreter).
+
+    Returns:
+        ndarray: int64 hash per row
+    """
+    columns = [df[column].to_numpy() for column in df.columns]
+    return np.fromiter(map(hash, zip(*columns)), dtype=np.int64, count=len(df))
+
+def _match_rows(old_hashes, new_hashes):
+    """
+    Pair identical rows of two versions, in order of appearance.
+
+    Returns:
+        ndarray: Old row of each new row, or -1 if it has no unused twin
+    """
+    if len(old_hashes) == 0:
+        return np.full(len(new_hashes), -1, dtype=np.int64)
+    old_order = np.argsort(old_hashes, kind="stable")
+    old_sorted = old_hashes[old_order]
+    new_order = np.argsort(new_hashes, kind="stable")
+    new_sorted = new_hashes[new_order]
+
+    # The k-th copy of a row in the new version pairs with the k-th old copy
+    occurrence = np.empty(len(new_hashes), dtype=np.int64)
+    occurrence[new_order] = (np.arange(len(new_sorted))
+                             - np.searchsorted(new_sorted, new_sorted, side="left"))
+    positions = np.searchsorted(old_sorted, new_hashes, side="left") + occurrence
+    found = positions < len(old_sorted)
+    found[found] = old_sorted[positions[found]] == new_hashes[found]
+    return np.where(found, old_order[np.minimum(positions, len(old_sorted) - 1)], -1)
+
+def diff_rows(old_df, new_df, key_columns, old_hashes=None, new_hashes=None):
+    """
+    Compare two versions of a table row by row.
+
+    Rows are matched by a 64-bit hash of their full contents (see
+    row_hashes()), so a row counts as kept only if every column is
+    unchanged. Rows that are only in one version are reported by key: a
+    key on both sides is "changed".
+
+    Args:
+        old_df (DataFrame): Previous version
+        new_df (DataFrame): Current version, same columns and dtypes
+        key_columns (list): Columns identifying a row in the report
+        old_hashes, new_hashes (ndarray): Precomputed row_hashes(), if any
+
+    Returns:
+        FrameDiff: Keys added, changed and removed, plus the old -> new
+            row_map (None when kept rows changed order)
+    """
+    if old_hashes is None:
+        old_hashes = row_hashes(old_df)
+    if new_hashes is None:
+        new_hashes = row_hashes(new_df)
+
+    source = _match_rows(old_hashes, new_hashes)
+    new_kept = source >= 0
+    row_map = np.full(len(old_df), -1, dtype=np.int64)
+    row_map[source[new_kept]] = np.flatnonzero(new_kept)
+    kept_targets = row_map[row_map >= 0]
+    removed_rows = np.flatnonzero(row_map < 0)
+    if np.any(kept_targets[1:] <= kept_targets[:-1]):
+        row_map = None
+
+    def keys(df, rows):
+        values = df.iloc[rows][key_columns].itertuples(index=False, name=None)
+        return [v[0] if len(key_columns) == 1 else v for v in values]
+
+    removed = keys(old_df, removed_rows)
+    added = keys(new_df, np.flatnonzero(~new_kept))
+    both = set(removed) & set(added)
+    return FrameDiff(
+        added=[k for k in added if k not in both],
+        changed=[k for k in added if k in both],
+        removed=[k for k in removed if k not in both],
+        row_map=row_map,
+    )
+
+def compile_catalog(data_dir=".", fingerprint=None, previous=None):
+    """
+    Return the CommandCatalog for a data directory, via its snapshot.
+
+    Loads the compiled snapshot when it matches the current CSV fingerprint.
+    Otherwise parses the CSVs and builds the catalog - by patching
+    ``previous`` when given, see CommandCatalog.updated() - and rewrites
+    the snapshot so the next cold start is fast. A snapshot that can't be
+    written (e.g. read-only directory) only costs a warning.
+
+    Args:
+        data_dir (str): Directory containing the CSV files
+        fingerprint (tuple): Current data_fingerprint(), computed if omitted
+        previous (CommandCatalog): Older catalog of the same directory
+
+    Returns:
+        CommandCatalog: Catalog for the current CSV contents
+    """
+    if fingerprint is None:
+        fingerprint = data_fingerprint(data_dir)
+
+    snapshot_path = os.path.join(data_dir, SNAPSHOT_FILE)
+    catalog = read_snapshot(snapshot_path, fingerprint)
+    if catalog is not None:
+        metrics.CATALOG_BUILDS.inc(source="snapshot")
+        return catalog
+
+    if previous is not None:
+        catalog = previous.updated(*read_data_files(data_dir))
+        metrics.CATALOG_BUILDS.inc(source="reload")
+    else:
+        catalog = CommandCatalog(*read_data_files(data_dir))
+        metrics.CATALOG_BUILDS.inc(source="csv")
+    try:
+        write_snapshot(snapshot_path, fingerprint, catalog)
+    except OSError as e:
+        warnings.warn(f"Could not write catalog snapshot {snapshot_path}: {e}")
+    return catalog
+
+def _load_cached(data_dir):
+    """
+    Return the current cache entry, rebuilding it if the files changed.
+
+    The fingerprint is checked on every call (one stat per file). Concurrent
+    first access is serialized by a lock so only one thread loads the
+    snapshot or parses the files; the others wait and reuse its result.
+    When the files of an already loaded directory change, the new catalog
+    is patched from the old one; readers keep the old entry until the
+    finished one is swapped in.
+    """
+    global _cache_entry
+
+    key = (os.path.abspath(data_dir), data_fingerprint(data_dir))
+    entry = _cache_entry
+    if entry is not None and entry[0] == key:
+        metrics.CACHE_LOOKUPS.inc(result="hit")
+        return entry
+
+    with _cache_lock:
+        # Another thread may have finished the rebuild while we waited
+        entry = _cache_entry
+        if entry is not None and entry[0] == key:
+            metrics.CACHE_LOOKUPS.inc(result="hit")
+            return entry
+
+        metrics.CACHE_LOOKUPS.inc(result="miss")
+        previous = entry[2] if entry is not None and entry[0][0] == key[0] else None
+        with metrics.STAGE_SECONDS.time(stage="build"):
+            catalog = compile_catalog(data_dir, key[1], previous)
+        data = (catalog.commands_df, catalog.params_df, catalog.enums_df)
+        entry = (key, data, catalog)
+        # Single reference assignment swaps the whole version atomically
+        _cache_entry = entry
+    return entry
+
+def load_data(data_dir="."):
     """
     Load and cache CSV data files with performance optimizations.
+
+    Args:
+        data_dir (str): Directory containing the CSV files
     
     Returns:
         Pandas DataFrame: (commands_df, params_df, enums_df) - DataFrames containing
                command data, parameter metadata, and enum definitions
     
     Note:
-        Data is cached globally to avoid reloading on subsequent calls.
+        Data is cached process-wide and shared by every thread and Streamlit
+        session. The cache is keyed on the size and mtime of the CSV files,
+        so an edited file is picked up by the next call. The CommandCatalog
+        indexes are built alongside; see load_catalog(). Cold starts load
+        the compiled snapshot when it is current; see compile_catalog().
     """
-    global _cached_data
-    
-    # Use cache if data already loaded
-    if _cached_data is not None:
-        return _cached_data
-    
-    # Define data types for faster loading (2-3x improvement)
-    # Specifying dtypes prevents pandas from inferring types, which is slow
-    commands_dtypes = {
-        'Command': 'string',
-        'HexCode': 'string', 
-        'Description': 'string',
-        'Params': 'string'
-    }
-    
-    params_dtypes = {
-        'ParamID': 'string',
-        'Type': 'string',
-        'EnumSet': 'string',
-        'Range': 'string'
-    }
-    
-    enums_dtypes = {
-        'EnumSet': 'string',
-        'Value': 'int32',
-        'Label': 'string'
-    }
-    
-    # Load with specified dtypes (much faster than letting pandas guess)
-    commands_df = pd.read_csv("master_commands.csv", dtype=commands_dtypes)
-    params_df = pd.read_csv("parameter_metadata.csv", dtype=params_dtypes)
-    enums_df = pd.read_csv("enum_definitions.csv", dtype=enums_dtypes)
-    
-    # Cache the loaded data
-    _cached_data = (commands_df, params_df, enums_df)
-    return _cached_data
+    return _load_cached(data_dir)[1]
+
+class CommandCatalog:
+    """
+    Indexed, read-only view over the command dictionary.
+
+    Built once from the three DataFrames returned by load_data(). Hash
+    indexes keyed by Command, ParamID and EnumSet replace the per-lookup
+    boolean masks, so a details lookup costs O(number of params) instead of
+    scanning every DataFrame.
+
+    Duplicate keys resolve to their first occurrence, matching the
+    ``.iloc[0]`` behaviour of the original DataFrame lookups.
+
+    Attributes:
+        commands_df (DataFrame): Commands data
+        params_df (DataFrame): Parameter metadata
+        enums_df (DataFrame): Enum definitions
+        search_index (SearchIndex): Trigram index over Command and
+            Description, built on first use
+        fuzzy_searcher (FuzzySearcher): Ranked, typo-tolerant search, built
+            on first use
+        changes (dict): File name -> FrameDiff against the catalog this one
+            was patched from by updated(), or None when built from scratch
+        command_names (ndarray): Command of each row, by row id
+        hex_codes: HexCode of each row, by row id (pd.NA if missing)
+        descriptions: Description of each row, by row id (pd.NA if missing)
+    """
+
+    def __init__(self, commands_df, params_df, enums_df, search_index=None):
+        self.commands_df = commands_df
+        self.params_df = params_df
+        self.enums_df = enums_df
+
+        # Command -> first row position. Inserting in reverse lets earlier
+        # rows overwrite later duplicates.
+        self._command_names = commands_df['Command'].to_numpy()
+        # Read in place, without one Python object per row
+        self._hex_codes = text_column(commands_df['HexCode'])
+        self._descriptions = text_column(commands_df['Description'])
+        n_rows = len(self._command_names)
+        self._command_rows = dict(zip(
+            self._command_names[::-1], range(n_rows - 1, -1, -1)
+        ))
+
+        # Parameter lists as code ranges over interned definitions, and
+        # enum values grouped per set; see catalog_tables
+        self._param_table = ParamTable(params_df, commands_df['Params'])
+        self._enum_table = EnumTable(enums_df)
+        range_errors = self._param_table.range_errors
+        if range_errors:
+            examples = "; ".join(f"{name}: {message}"
+                                 for name, message in list(range_errors.items())[:5])
+            warnings.warn(f"{len(range_errors)} parameters have malformed ranges ({examples})",
+                          MalformedRangeWarning, stacklevel=2)
+
+        # Search structures are built on first use, so a catalog only asked
+        # for details (e.g. get_command_details() over ad-hoc DataFrames)
+        # never pays for them
+        self._search_index = search_index
+        self._fuzzy_searcher = None
+        self.changes = None
+        self._row_hashes = None
+        self._display_strings = None
+        self._memory_bytes = None
+        self._opcode_index = None
+
+    def __getstate__(self):
+        # Only pickle what is expensive to rebuild; the hash indexes are
+        # recreated in __setstate__ faster than they unpickle
+        return {
+            'commands_df': self.commands_df,
+            'params_df': self.params_df,
+            'enums_df': self.enums_df,
+            'search_index': self.search_index,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __len__(self):
+        return len(self._command_rows)
+
+    def updated(self, commands_df, params_df, enums_df):
+        """
+        Build the catalog for edited DataFrames, patching this one's indexes.
+
+        Rows are diffed with per-row hashes (diff_rows()); the search index
+        is patched for the added, changed and removed commands instead of
+        being rebuilt, and the hash indexes are rebuilt from the new frames.
+        This catalog is not modified.
+
+        Args:
+            commands_df, params_df, enums_df (DataFrame): New versions
+
+        Returns:
+            CommandCatalog: Equivalent to CommandCatalog(commands_df, ...),
+                with ``changes`` describing the row diff per file
+        """
+        frames = {COMMANDS_FILE: commands_df, PARAMS_FILE: params_df, ENUMS_FILE: enums_df}
+        old_frames = {COMMANDS_FILE: self.commands_df, PARAMS_FILE: self.params_df,
+                      ENUMS_FILE: self.enums_df}
+        old_hashes = self._row_hashes or {}
+        hashes = {name: row_hashes(df) for name, df in frames.items()}
+        changes = {
+            name: diff_rows(old_frames[name], df, ROW_KEYS[name],
+                            old_hashes.get(name), hashes[name])
+            for name, df in frames.items()
+        }
+        row_map = changes[COMMANDS_FILE].row_map
+        search_index = None
+        if row_map is not None and self._search_index is not None:
+            search_index = self._search_index.patched(
+                row_map, commands_df['Command'].to_numpy(),
+                commands_df['Description'].to_numpy(),
+            )
+        catalog = CommandCatalog(commands_df, params_df, enums_df, search_index)
+        catalog.changes = changes
+        # Kept for the next update, so each version is hashed only once
+        catalog._row_hashes = hashes
+        return catalog
+
+    def __contains__(self, command_name):
+        return command_name in self._command_rows
+
+    def find_command(self, command_name):
+        """Return the row id of a command, or -1 if unknown."""
+        return self._command_rows.get(command_name, -1)
+
+    def param_specs(self, row):
+        """
+        ParamSpec of each parameter of a command row, in Params order.
+
+        Args:
+            row (int): Row id, e.g. from find_command()
+
+        Returns:
+            list: ParamSpec records; parameters the metadata doesn't
+                define have type "unknown"
+        """
+        return self._param_table.command_specs(row)
+
+    def memory_bytes(self):
+        """
+        Approximate memory held by the DataFrames, the search index and
+        the parameter and enum tables.
+
+        Computed once per catalog (deep DataFrame sizes take a while on
+        large dictionaries); the hash indexes are not counted.
+
+        Returns:
+            int: Size in bytes
+        """
+        if self._memory_bytes is None:
+            total = sum(
+                int(df.memory_usage(deep=True).sum())
+                for df in (self.commands_df, self.params_df, self.enums_df)
+            )
+            index = self.search_index
+            total += sum(
+                memoryview(array).nbytes for array in (
+                    index.heap, index.row_starts, index.byte_counts,
+                    index.keys, index.offsets, index.postings,
+                )
+            )
+            total += self._param_table.nbytes + self._enum_table.nbytes
+            self._memory_bytes = total
+        return self._memory_bytes
+
+    def enum_codec(self, enum_set):
+        """
+        Vectorized value <-> label tables of an EnumSet, for bulk decoding
+        (e.g. a telemetry column) without a dict lookup per value.
+
+        Args:
+            enum_set (str): EnumSet name
+
+        Returns:
+            EnumCodec: Codec with decode() / encode() / contains()
+
+        Raises:
+            KeyError: If the EnumSet has no values in the dictionary
+        """
+        try:
+            return self._enum_table.codec(enum_set)
+        except KeyError:
+            raise KeyError(f"Unknown enum set: {enum_set}") from None
+
+    def _opcodes(self):
+        """
+        Reverse HexCode index, built on first use.
+
+        Returns:
+            tuple: (index, rows, counts) - pd.Index of distinct opcodes
+                (unique, so lookups are hash probes), the first command row
+                of each and how many commands share it
+        """
+        if self._opcode_index is None:
+            opcodes = parse_opcodes(self.commands_df['HexCode'])
+            valid = np.flatnonzero(opcodes >= 0)
+            codes, distinct = pd.factorize(opcodes[valid])
+            _, first = np.unique(codes, return_index=True)
+            self._opcode_index = (
+                pd.Index(distinct),
+                valid[first],
+                np.bincount(codes, minlength=len(distinct)),
+            )
+        return self._opcode_index
+
+    def command_for_opcode(self, opcode):
+        """
+        Find the command of an opcode, in O(1).
+
+        Args:
+            opcode (int or str): Opcode, or HexCode text in any case and
+                with or without its 0x prefix
+
+        Returns:
+            str: Command name; the first in file order when several
+                commands share the opcode (see duplicate_opcodes())
+
+        Raises:
+            KeyError: If no command has the opcode
+        """
+        index, rows, _ = self._opcodes()
+        try:
+            position = index.get_loc(opcode_value(opcode))
+        except KeyError:
+            raise KeyError(f"Unknown opcode: {opcode}") from None
+        return self._command_names[rows[position]]
+
+    def decode_opcodes(self, opcodes):
+        """
+        Map a column of opcodes (e.g. from an uplink log) back to commands.
+
+        Args:
+            opcodes (array-like): Integer opcodes or HexCode strings;
+                order and repeats are preserved
+
+        Returns:
+            DataFrame: One row per opcode with columns Opcode (Int64, <NA>
+                where the input isn't valid hex), Command, Description,
+                Found (False for unknown or invalid opcodes) and Duplicate
+                (True where several commands share the opcode; Command is
+                then the first of them)
+        """
+        values = parse_opcodes(opcodes)
+        command_rows, shared = self.opcode_rows(values)
+        found = command_rows >= 0
+        # Misses point at row 0 and are masked below
+        command_rows = np.maximum(command_rows, 0)
+        found_series = pd.Series(found)
+
+        return pd.DataFrame({
+            'Opcode': pd.Series(values, dtype='Int64').where(values >= 0),
+            'Command': pd.Series(self._command_names[command_rows], dtype='string')
+                         .where(found_series),
+            'Description': self.commands_df['Description'].iloc[command_rows]
+                             .reset_index(drop=True).where(found_series),
+            'Found': found,
+            'Duplicate': shared,
+        })
+
+    def opcode_rows(self, opcodes):
+        """
+        Command row of each opcode, for callers that gather more than
+        decode_opcodes() returns.
+
+        Args:
+            opcodes (array-like): Integer opcodes or HexCode strings
+
+        Returns:
+            tuple: (rows, shared) - int64 first command row of each
+                opcode (-1 if unknown or not valid hex), and a bool mask
+                of opcodes that several commands share
+        """
+        index, rows, counts = self._opcodes()
+        values = parse_opcodes(opcodes)
+        positions = np.where(values >= 0, index.get_indexer(values), -1)
+        return np.append(rows, -1)[positions], np.append(counts, 0)[positions] > 1
+
+    def duplicate_opcodes(self):
+        """
+        Opcodes shared by more than one command, after normalizing case
+        and the 0x prefix.
+
+        Returns:
+            DataFrame: Columns Opcode and Commands (tuple, file order)
+        """
+        opcodes = parse_opcodes(self.commands_df['HexCode'])
+        shared = pd.Series(opcodes)
+        shared = shared[(shared >= 0) & shared.duplicated(keep=False)]
+        rows = [
+            (opcode, tuple(self._command_names[group.index]))
+            for opcode, group in shared.groupby(shared, sort=True)
+        ]
+        return pd.DataFrame(rows, columns=['Opcode', 'Commands'])
+
+    @property
+    def command_names(self):
+        return self._command_names
+
+    @property
+    def hex_codes(self):
+        return self._hex_codes
+
+    @property
+    def descriptions(self):
+        return self._descriptions
+
+    @property
+    def search_index(self):
+        """SearchIndex over Command and Description, built on first use."""
+        if self._search_index is None:
+            self._search_index = SearchIndex(
+                self.commands_df['Command'], self.commands_df['Description']
+            )
+        return self._search_index
+
+    @property
+    def fuzzy_searcher(self):
+        """FuzzySearcher over search_index, built on first use."""
+        if self._fuzzy_searcher is None:
+            self._fuzzy_searcher = FuzzySearcher(self._command_names, self.search_index)
+        return self._fuzzy_searcher
+
+    @property
+    def display_strings(self):
+        """
+        "Command - Description" label of every row, built once per catalog.
+
+        Returns:
+            ndarray: Object array of str, by row id
+        """
+        if self._display_strings is None:
+            self._display_strings = np.array([
+                f"{command} - {description}"
+                for command, description in zip(self._command_names, self._descriptions)
+            ], dtype=object)
+        return self._display_strings
+
+    def search_rows(self, query):
+        """
+        Row ids of commands whose name or description contains the query.
+
+        Args:
+            query (str): Search text, case-insensitive; empty returns all rows
+
+        Returns:
+            ndarray: Ascending row ids
+        """
+        return self.search_index.search(query)
+
+    def search(self, query):
+        """
+        Filter commands whose name or description contains the query.
+
+        Args:
+            query (str): Search text, case-insensitive; empty returns all rows
+
+        Returns:
+            DataFrame: Matching rows of commands_df, in original order
+        """
+        if not query:
+            return self.commands_df
+        return self.commands_df.iloc[self.search_rows(query)]
+
+    def fuzzy_search(self, query, limit=10, **kwargs):
+        """
+        Rank commands by similarity to a query that may contain typos.
+
+        Args:
+            query (str): Search text
+            limit (int): Maximum number of results
+            **kwargs: time_budget / min_score, see FuzzySearcher.search()
+
+        Returns:
+            DataFrame: Best matching rows of commands_df, best first, with
+                an added Score column (0.0 - 1.0)
+        """
+        matches = self.fuzzy_searcher.search(query, limit=limit, **kwargs)
+        result = self.commands_df.iloc[[m.row for m in matches]].copy()
+        result['Score'] = [m.score for m in matches]
+        return result
+
+    def get_command_details(self, command_name):
+        """
+        Get detailed information for a specific command.
+
+        Args:
+            command_name (str): Name of the command to look up
+
+        Returns:
+            tuple: (hex_code, description, param_details), see
+                get_command_details() for the layout
+
+        Raises:
+            KeyError: If the command is not in the catalog
+        """
+        row = self._command_rows[command_name]
+        hex_code = self._hex_codes[row]
+        description = self._descriptions[row]
+
+        param_details = []
+        for spec in self._param_table.command_specs(row):
+            enum_values = None
+            # Handle enum types - lookup enum values and labels
+            if spec.type == "enum" and spec.enum_set is not None:
+                # A new dict per call, so callers can't mutate the shared table
+                enum_values = self._enum_table.mapping(spec.enum_set)
+
+            param_details.append({
+                "name": spec.name,
+                "type": spec.type,
+                "range": spec.range,
+                "enum_values": enum_values
+            })
+
+        return hex_code, description, param_details
+
+    def get_command_details_many(self, command_names):
+        """
+        Get details for many commands as one flat, columnar table.
+
+        Every command's parameters are split and matched to their metadata
+        once per catalog (see catalog_tables.ParamTable); a call then
+        gathers all requested rows with array indexing instead of one
+        lookup per command.
+
+        Args:
+            command_names (iterable): Commands to look up; order and
+                repeats are preserved
+
+        Returns:
+            DataFrame: One row per command-parameter, in request order, with
+                columns Command, Found, HexCode, Description, ParamIndex
+                (position in the command, from 0), Param, Type, Range,
+                EnumSet and EnumValues ({str(value): label} or None).
+                A command without parameters gets one row with Param <NA>;
+                an unknown command gets one row with Found False. Values
+                follow get_command_details(), including Type "unknown"
+                for undefined parameters.
+        """
+        offsets, codes = self._param_table.offsets, self._param_table.codes
+        requested = np.array(list(command_names), dtype=object)
+        rows = np.fromiter((self._command_rows.get(name, -1) for name in requested),
+                           dtype=np.int64, count=len(requested))
+        found = rows >= 0
+        safe_rows = np.where(found, rows, 0)
+        counts = np.where(found, offsets[safe_rows + 1] - offsets[safe_rows], 0)
+
+        # One output row per parameter, or one placeholder row per command
+        out_counts = np.maximum(counts, 1)
+        request = np.repeat(np.arange(len(requested)), out_counts)
+        first_out = np.concatenate(([0], np.cumsum(out_counts)[:-1])).astype(np.int64)
+        position = np.arange(len(request)) - first_out[request]
+        has_param = counts[request] > 0
+        flat = offsets[safe_rows][request] + position
+
+        flat = np.where(has_param, flat, 0)
+        # Placeholder rows point at a trailing all-missing spec
+        specs = self._param_table.specs + [ParamSpec(None, None, None, None)]
+        param_code = np.full(len(request), len(specs) - 1)
+        param_code[has_param] = codes[flat[has_param]]
+        names, types, ranges, enum_sets = (
+            np.array(column, dtype=object)[param_code] for column in zip(*specs)
+        )
+        command_rows = self.commands_df.iloc[safe_rows[request]].reset_index(drop=True)
+        command_found = found[request]
+
+        details = pd.DataFrame({
+            'Command': pd.array(requested[request], dtype='string'),
+            'Found': command_found,
+            'HexCode': command_rows['HexCode'].where(command_found),
+            'Description': command_rows['Description'].where(command_found),
+            'ParamIndex': pd.array(np.where(has_param, position, 0), dtype='Int64'),
+            'Param': pd.array(names, dtype='string'),
+            'Type': pd.array(types, dtype='string'),
+            'Range': pd.array(ranges, dtype='string'),
+            'EnumSet': pd.array(enum_sets, dtype='string'),
+        })
+        details.loc[~has_param, 'ParamIndex'] = pd.NA
+
+        # Attach one fresh copy of each enum mapping per call
+        is_enum = (details['Type'] == "enum").fillna(False) & details['EnumSet'].notna()
+        enum_values = {
+            name: self._enum_table.mapping(name)
+            for name in details.loc[is_enum, 'EnumSet'].unique()
+        }
+        details['EnumValues'] = [
+            enum_values[name] if enum else None
+            for name, enum in zip(details['EnumSet'], is_enum)
+        ]
+        return details
+
+    def validate_params(self, commands, params, values):
+        """
+        Check proposed parameter values against Type, Range and EnumSet.
+
+        One row per (command, parameter, value), e.g. a command plan in
+        long format; the whole batch is checked with array operations.
+        Values are accepted by the same converters as encoder.CommandEncoder
+        (catalog_tables.VALUE_CONVERTERS and enum_converter()): int takes
+        integral numbers, float finite numbers, bool True/False or 0/1, and
+        enum an integer raw value or a label of its set. Range bounds are
+        inclusive and apply to int and float parameters.
+
+        Args:
+            commands (array-like): Command name of each row
+            params (array-like): Parameter name of each row
+            values (array-like): Proposed value of each row
+
+        Returns:
+            Series: Violation reason of each row (the first that applies),
+                None where the value is valid; indexed like ``commands``
+                when it is a Series
+
+        Raises:
+            ValueError: If the inputs differ in length
+        """
+        table = self._param_table
+        command_names = np.array(list(commands), dtype=object)
+        param_names = np.array(list(params), dtype=object)
+        if isinstance(values, (pd.Series, pd.Index)):
+            values = values.to_numpy()
+        elif not isinstance(values, np.ndarray):
+            values = np.array(list(values), dtype=object)
+        if not len(command_names) == len(param_names) == len(values):
+            raise ValueError(f"Got {len(command_names)} commands, {len(param_names)} "
+                             f"parameters and {len(values)} values")
+        n = len(values)
+
+        # Command row and parameter code of each row; a batch repeats each
+        # command once per parameter, so only distinct names are looked up
+        name_codes, distinct = pd.factorize(command_names)
+        distinct_rows = np.fromiter((self._command_rows.get(name, -1) for name in distinct),
+                                    dtype=np.int64, count=len(distinct))
+        rows = np.append(distinct_rows, -1)[name_codes]
+        codes = table.lookup(param_names)
+        found = rows >= 0
+        # (row, code) pairs of the requested commands' parameter lists
+        command_rows = np.unique(rows[found])
+        starts = table.offsets[command_rows]
+        counts = table.offsets[command_rows + 1] - starts
+        flat = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        width = len(table.names) + 1
+        listed = pd.Index(np.repeat(command_rows, counts) * width + table.codes[flat])
+        is_param = found & (codes >= 0)
+        is_param[is_param] = pd.Index(rows[is_param] * width + codes[is_param]).isin(listed)
+
+        safe_codes = np.where(is_param, codes, 0)
+        type_codes = np.where(is_param, table.type_codes[safe_codes], -1)
+        type_names = np.array(table.type_names + [None], dtype=object)[type_codes]
+
+        # Values go through the encoder's converters, once per distinct
+        # value of each parameter type or enum set
+        missing = np.asarray(pd.isna(values), dtype=bool)
+        valid = np.zeros(n, dtype=bool)
+        number = np.full(n, np.nan)
+        is_int, is_float = type_names == "int", type_names == "float"
+        is_bool_type = type_names == "bool"
+        groups = [(type_names == name, convert) for name, convert in VALUE_CONVERTERS.items()]
+
+        enum_set_codes = np.where(type_names == "enum", table.enum_set_codes[safe_codes], -1)
+        no_values = np.zeros(n, dtype=bool)
+        for set_code in np.unique(enum_set_codes[enum_set_codes >= 0]).tolist():
+            in_set = enum_set_codes == set_code
+            try:
+                codec = self._enum_table.codec(table.enum_set_names[set_code])
+            except KeyError:
+                no_values |= in_set
+                continue
+            groups.append((in_set, enum_converter(codec)))
+
+        for mask, convert in groups:
+            at = np.flatnonzero(mask & ~missing)
+            if len(at):
+                valid[at], number[at] = convert_values(convert, values[at])
+
+        # Ranges, parsed at load
+        low = np.where(is_param, table.range_min[safe_codes], np.nan)
+        high = np.where(is_param, table.range_max[safe_codes], np.nan)
+        numeric_type = is_int | is_float
+        below = numeric_type & valid & (number < low)
+        above = numeric_type & valid & (number > high)
+        bad_range = np.zeros(n, dtype=bool)
+        if table.range_errors:
+            bad_range = numeric_type & np.isin(param_names, list(table.range_errors))
+
+        # First violation of each row wins
+        reasons = np.full(n, None, dtype=object)
+        pending = np.ones(n, dtype=bool)
+
+        def flag(mask, reason):
+            mask = mask & pending
+            if mask.any():
+                reasons[mask] = reason(np.flatnonzero(mask)) if callable(reason) else reason
+                pending[mask] = False
+
+        flag(~found, "unknown command")
+        flag(~is_param, lambda at: [f"not a parameter of {command_names[i]}" for i in at])
+        flag(type_names == UNKNOWN_TYPE, "parameter has no metadata")
+        flag(missing, "missing value")
+        flag(is_int & ~valid, "expected an integer")
+        flag(is_float & ~valid, "expected a finite number")
+        flag(is_bool_type & ~valid, "expected a boolean")
+        set_names = np.array(table.enum_set_names, dtype=object)
+        flag(no_values, lambda at: "enum set " + set_names[enum_set_codes[at]] + " has no values")
+        flag((enum_set_codes >= 0) & ~valid,
+             lambda at: "not a value or label of enum set " + set_names[enum_set_codes[at]])
+        flag((type_names == "enum") & (enum_set_codes < 0), "enum parameter has no EnumSet")
+        flag(~valid & ~(type_names == "enum"), lambda at: [
+            f"unsupported type {type_names[i]!r}" for i in at])
+        flag(bad_range, lambda at: [table.range_errors[param_names[i]] for i in at])
+        flag(below | above, lambda at: [
+            f"{number[i]:g} outside range {table.specs[codes[i]].range}" for i in at])
+
+        index = commands.index if isinstance(commands, pd.Series) else None
+        return pd.Series(reasons, index=index, name="Violation")
+
+def load_catalog(data_dir="."):
+    """
+    Load the data files and return the indexed CommandCatalog.
+
+    Args:
+        data_dir (str): Directory containing the CSV files
+
+    Returns:
+        CommandCatalog: Catalog built by load_data() over the cached DataFrames
+    """
+    return _load_cached(data_dir)[2]
+
+def load_versioned_catalog(data_dir="."):
+    """
+    Like load_catalog(), but also return the data version it was built from.
+
+    Args:
+        data_dir (str): Directory containing the CSV files
+
+    Returns:
+        tuple: (fingerprint, catalog), the data_fingerprint() of the files
+            and the CommandCatalog built from them
+    """
+    key, _, catalog = _load_cached(data_dir)
+    return key[1], catalog
+
+
+def load_mapped_catalog(data_dir="."):
+    """
+    Return a memory-mapped, read-only catalog for a data directory.
+
+    The mapped file is rebuilt by streaming the CSVs (build_mapped_catalog())
+    when it is missing or its stored fingerprint no longer matches. Every
+    process that maps the same file shares its pages via the OS page cache,
+    so replicas on one host don't each hold a private copy.
+
+    Args:
+        data_dir (str): Directory containing the CSV files
+
+    Returns:
+        MappedCatalog: Catalog served directly from the mapped buffers
+    """
+    fingerprint = data_fingerprint(data_dir)
+    path = os.path.join(data_dir, MAPPED_FILE)
+    if read_mapped_fingerprint(path) != fingerprint:
+        build_mapped_catalog(data_dir, fingerprint)
+    return MappedCatalog(path)
+
+def open_catalog(data_dir="."):
+    """
+    Return the mapped catalog of a data directory, or the in-memory one
+    where the mapped file can't be written (e.g. a read-only directory).
+
+    Args:
+        data_dir (str): Directory containing the CSV files
+
+    Returns:
+        MappedCatalog or CommandCatalog: Catalog with the details and
+            search accessors both share
+
+    Raises:
+        FileNotFoundError: If a data file is missing
+    """
+    try:
+        return load_mapped_catalog(data_dir)
+    except OSError:
+        return load_catalog(data_dir)
 
 def get_command_details(command_name, commands_df, params_df, enums_df):
     """
@@ -85,92 +1151,190 @@ def get_command_details(command_name, commands_df, params_df, enums_df):
             - description (str): Command description
             - param_details (list): List of parameter dictionaries with
               name, type, range, and enum_values keys
+
+    Note:
+        Uses the catalog built by load_data() when given the cached
+        DataFrames. Other DataFrames get a CommandCatalog without search
+        structures, reused while the same DataFrame objects are passed
+        again; edit them in place and the details can be stale.
     """
-    # Find the command
-    cmd = commands_df[commands_df['Command'] == command_name].iloc[0]
-    hex_code = cmd['HexCode']
-    description = cmd['Description']
-    
-    # Get parameters
-    params_str = cmd['Params']
-    if pd.isna(params_str) or params_str.strip() == "":
-        param_ids = []
-    else:
-        param_ids = [p.strip() for p in params_str.split(",")]
-    
-    param_details = []
-    for pid in param_ids:
-        # Find parameter info
-        param_matches = params_df[params_df['ParamID'] == pid]
-        if param_matches.empty:
-            param_info = {
-                "name": pid,
-                "type": "unknown",
-                "range": None,
-                "enum_values": None
-            }
-        else:
-            param_row = param_matches.iloc[0]
-            param_info = {
-                "name": pid,
-                "type": param_row["Type"],
-                "range": param_row["Range"] if pd.notna(param_row["Range"]) else None,
-                "enum_values": None
-            }
-            
-            # Handle enum types - lookup enum values and labels
-            if param_row["Type"] == "enum" and pd.notna(param_row["EnumSet"]):
-                enum_set = param_row["EnumSet"]
-                enum_vals = enums_df[enums_df["EnumSet"] == enum_set]
-                if not enum_vals.empty:
-                    # Create value:label mapping for display
-                    param_info["enum_values"] = dict(
-                        zip(enum_vals["Value"].astype(str), enum_vals["Label"])
-                    )
-        
-        param_details.append(param_info)
-    
-    return hex_code, description, param_details
+    catalog = _catalog_for(commands_df, params_df, enums_df)
+    return catalog.get_command_details(command_name)
+
+def get_command_details_many(command_names, commands_df, params_df, enums_df):
+    """
+    Get details for many commands at once as a flat, columnar table.
+
+    Args:
+        command_names (iterable): Names of the commands to look up
+        commands_df (DataFrame): Commands data
+        params_df (DataFrame): Parameter metadata
+        enums_df (DataFrame): Enum definitions
+
+    Returns:
+        DataFrame: One row per command-parameter with enum mappings
+            attached; see CommandCatalog.get_command_details_many()
+    """
+    catalog = _catalog_for(commands_df, params_df, enums_df)
+    return catalog.get_command_details_many(command_names)
+
+def _catalog_for(commands_df, params_df, enums_df):
+    """
+    Return the catalog over these DataFrames (compared by identity): the
+    cached one, the last ad-hoc one, or a new ad-hoc one.
+
+    Only one ad-hoc catalog is kept. It holds its DataFrames, so a cache
+    keyed weakly on them would keep them alive anyway; one slot bounds
+    what a caller's frames can pin to a single version.
+    """
+    global _adhoc_catalog
+    frames = (commands_df, params_df, enums_df)
+    entry = _cache_entry
+    for catalog in (entry[2] if entry is not None else None, _adhoc_catalog):
+        if catalog is not None and all(
+                a is b for a, b in zip(frames, (catalog.commands_df, catalog.params_df,
+                                                catalog.enums_df))):
+            return catalog
+    catalog = CommandCatalog(*frames)
+    _adhoc_catalog = catalog
+    return catalog
+
+# Records written between flushes in batch mode (1 when reading a terminal)
+BATCH_FLUSH_EVERY = 1000
+
+def _current_catalog_bytes():
+    entry = _cache_entry
+    return entry[2].memory_bytes() if entry is not None else None
+
+metrics.CATALOG_BYTES.set_function(_current_catalog_bytes)
+
+def json_value(value):
+    """
+    Map pandas missing values to None so they serialize as null.
+
+    Args:
+        value: A catalog field (str, number, pd.NA, NaN or None)
+
+    Returns:
+        The value itself, or None if it is missing
+    """
+    return None if value is pd.NA or value is None or value != value else value
+
+def _json_enum_values(enum_values):
+    """Map missing labels of an enum_values dict (None for none) to None."""
+    if enum_values is None:
+        return None
+    return {value: json_value(label) for value, label in enum_values.items()}
+
+def details_record(catalog, command_name):
+    """
+    Build the JSON-ready batch record of one command.
+
+    Args:
+        catalog (CommandCatalog): Catalog to look the command up in
+        command_name (str): Name of the command
+
+    Returns:
+        dict: {"command", "found"} plus, when found, "hex_code",
+            "description" and "params" (name, type, range, enum_values)
+    """
+    if command_name not in catalog:
+        return {"command": command_name, "found": False}
+    hex_code, description, param_details = catalog.get_command_details(command_name)
+    return {
+        "command": command_name,
+        "found": True,
+        "hex_code": json_value(hex_code),
+        "description": json_value(description),
+        "params": [
+            {key: json_value(value) if key != "enum_values" else _json_enum_values(value)
+             for key, value in param.items()}
+            for param in param_details
+        ],
+    }
+
+def run_batch(catalog, lines, out, flush_every=BATCH_FLUSH_EVERY):
+    """
+    Stream details for a sequence of command names as JSON Lines.
 
-def main():
+    Blank lines are skipped; every other line produces exactly one record,
+    in input order, with "found": false for unknown commands.
+
+    Args:
+        catalog (CommandCatalog): Catalog loaded once for the whole batch
+        lines (iterable): Command names, one per item (surrounding
+            whitespace is ignored)
+        out (file): Text stream to write to
+        flush_every (int): Records written between flushes
+
+    Returns:
+        tuple: (records written, records not found)
+    """
+    written = missing = 0
+    for line in lines:
+        command_name = line.strip()
+        if not command_name:
+            continue
+        record = details_record(catalog, command_name)
+        out.write(json.dumps(record, ensure_ascii=False))
+        out.write("\n")
+        written += 1
+        missing += not record["found"]
+        if written % flush_every == 0:
+            out.flush()
+    out.flush()
+    return written, missing
+
+def main(argv=None):
     """
     Main entry point for the command search tool.
     
     Handles command-line arguments and user input to search for and display
     command details. If no command is provided as an argument, prompts the
-    user for input.
+    user for input. With --batch, reads command names (one per line) from a
+    file or stdin and writes one JSON record per name to stdout.
     """
+    import argparse
+
     parser = argparse.ArgumentParser(description='Get command details')
     parser.add_argument('command', nargs='?', help='Command name to search for')
-    args = parser.parse_args()
+    parser.add_argument('--batch', nargs='?', const='-', metavar='FILE',
+                        help='Read command names from FILE (default: stdin) and '
+                             'write JSON Lines to stdout')
+    parser.add_argument('--data-dir', default='.',
+                        help='Directory containing the CSV files (default: .)')
+    parser.add_argument('--flush-every', type=int, default=None,
+                        help='Batch records between output flushes '
+                             f'(default: 1 for a terminal, else {BATCH_FLUSH_EVERY})')
+    args = parser.parse_args(argv)
     
-    # Load data
-    commands_df, params_df, enums_df = load_data()
+    if args.batch is not None:
+        catalog = load_catalog(args.data_dir)
+        source = sys.stdin if args.batch == '-' else open(args.batch, encoding='utf-8')
+        flush_every = args.flush_every
+        if flush_every is None:
+            flush_every = 1 if source.isatty() else BATCH_FLUSH_EVERY
+        try:
+            written, missing = run_batch(catalog, source, sys.stdout, max(1, flush_every))
+        except BrokenPipeError:
+            # Downstream closed early (e.g. `| head`): stop quietly, and
+            # point stdout at devnull so the exit-time flush can't fail
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        print(f"{written} records, {missing} not found", file=sys.stderr)
+        return
     
     # Get command name
     command_name = args.command
     if not command_name:
         command_name = input("Enter command name: ").strip()
     
-    # Find and display command details
-    if command_name in commands_df['Command'].values:
-        hex_code, description, param_details = get_command_details(
-            command_name, commands_df, params_df, enums_df
-        )
-        
-        print(f"\nCommand: {command_name}")
-        print(f"Hex Code: {hex_code}")
-        print(f"Description: {description}")
-        
-        if param_details:
-            print("\nParameters:")
-            for param in param_details:
-                print(f"  - {param['name']} ({param['type']})")
-                if param['enum_values']:
-                    for value, label in param['enum_values'].items():
-                        print(f"    {value}: {label}")
-    else:
-        print(f"Command '{command_name}' not found")
+    # Single lookups use the mapped catalog, (re)built here if needed, so
+    # the next call can take the fast path in quick_lookup.py
+    print_command_details(open_catalog(args.data_dir), command_name)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,218 @@
+"""
+Binary Command Encoder
+
+Turns a command name and its parameter values into the uplink packet:
+the command's HexCode as the opcode, followed by one fixed-size field per
+parameter in the order of its Params list, all big-endian:
+
+    opcode  uint16 (see CommandEncoder's opcode_format)
+    int     int32
+    float   float32
+    bool    1 byte, 0 or 1
+    enum    uint16 raw value; a label is translated through its EnumSet
+
+Each command's layout (opcode, struct.Struct and per-field converters) is
+compiled on first use and reused, so encode_many() packs tens of
+thousands of commands per call without walking the metadata again.
+
+Values are accepted by the converters in catalog_tables, the same ones
+CommandCatalog.validate_params() applies. Ranges are only checked there;
+a value that doesn't fit its field raises EncodeError.
+"""
+
+import struct
+from collections.abc import Mapping
+
+from catalog_tables import VALUE_CONVERTERS, enum_converter, parse_opcode
+
+# struct format of each parameter type
+FIELD_FORMATS = {
+    "int": "i",
+    "float": "f",
+    "bool": "?",
+    "enum": "H",
+}
+
+DEFAULT_OPCODE_FORMAT = "H"
+
+
+class EncodeError(ValueError):
+    """A command can't be encoded: unknown, bad metadata or bad values."""
+
+
+class CommandLayout:
+    """
+    Precompiled packet layout of one command.
+
+    Attributes:
+        command (str): Command name
+        opcode (int): Parsed HexCode
+        params (tuple): Parameter names, in field order
+        struct (Struct): Packs (opcode, *fields)
+        size (int): Packet size in bytes
+    """
+
+    __slots__ = ("command", "opcode", "params", "struct", "size", "_converters")
+
+    def __init__(self, command, opcode, params, formats, converters, opcode_format):
+        self.command = command
+        self.opcode = opcode
+        self.params = tuple(params)
+        self.struct = struct.Struct(">" + opcode_format + "".join(formats))
+        self.size = self.struct.size
+        self._converters = tuple(converters)
+
+    def pack(self, values):
+        """
+        Encode one packet.
+
+        Args:
+            values: Sequence of parameter values in field order, or a
+                mapping of parameter name -> value
+
+        Returns:
+            bytes: Packet
+
+        Raises:
+            EncodeError: If values are missing, extra or invalid
+        """
+        if type(values) is tuple or type(values) is list:
+            if len(values) != len(self.params):
+                raise EncodeError(f"{self.command}: expected {len(self.params)} "
+                                  f"parameter values, got {len(values)}")
+        elif isinstance(values, Mapping):
+            if len(values) != len(self.params) or not all(name in values for name in self.params):
+                expected, given = set(self.params), set(values)
+                raise EncodeError(
+                    f"{self.command}: missing parameters {sorted(expected - given)}, "
+                    f"unexpected {sorted(map(str, given - expected))}"
+                )
+            values = [values[name] for name in self.params]
+        else:
+            return self.pack(list(values))
+
+        try:
+            fields = [convert(value) for convert, value in zip(self._converters, values)]
+        except ValueError as e:
+            # Name the failing parameter; off the fast path
+            for name, convert, value in zip(self.params, self._converters, values):
+                try:
+                    convert(value)
+                except ValueError:
+                    break
+            raise EncodeError(f"{self.command}.{name}: {e}") from None
+        try:
+            return self.struct.pack(self.opcode, *fields)
+        except (struct.error, OverflowError) as e:
+            raise EncodeError(f"{self.command}: value out of field range ({e})") from None
+
+
+class CommandEncoder:
+    """
+    Encodes commands of one catalog into binary packets.
+
+    Args:
+        catalog (CommandCatalog or MappedCatalog): Command dictionary
+        opcode_format (str): struct format of the opcode, "H" (uint16) by
+            default; "I" for dictionaries with wider HexCodes
+    """
+
+    def __init__(self, catalog, opcode_format=DEFAULT_OPCODE_FORMAT):
+        self.catalog = catalog
+        self.opcode_format = opcode_format
+        self._layouts = {}
+
+    def layout(self, command):
+        """
+        Compiled layout of a command, built on first use.
+
+        Raises:
+            EncodeError: If the command is unknown, its HexCode isn't
+                valid hex or doesn't fit the opcode, or a parameter has
+                no usable type
+        """
+        layout = self._layouts.get(command)
+        if layout is None:
+            layout = self._compile(command)
+            self._layouts[command] = layout
+        return layout
+
+    def _compile(self, command):
+        catalog = self.catalog
+        row = catalog.find_command(command)
+        if row < 0:
+            raise EncodeError(f"Unknown command: {command}")
+
+        hex_code = catalog.hex_codes[row]
+        opcode = parse_opcode(hex_code)
+        if opcode is None:
+            raise EncodeError(f"{command}: invalid HexCode {hex_code!r}")
+        try:
+            struct.pack(">" + self.opcode_format, opcode)
+        except (struct.error, OverflowError):
+            raise EncodeError(f"{command}: HexCode {hex_code} doesn't fit opcode "
+                              f"format {self.opcode_format!r}") from None
+
+        names, formats, converters = [], [], []
+        for spec in catalog.param_specs(row):
+            if spec.type not in FIELD_FORMATS:
+                raise EncodeError(f"{command}.{spec.name}: can't encode type {spec.type!r}")
+            if spec.type == "enum":
+                try:
+                    converter = enum_converter(catalog.enum_codec(spec.enum_set))
+                except KeyError:
+                    raise EncodeError(f"{command}.{spec.name}: enum set "
+                                      f"{spec.enum_set!r} has no values") from None
+            else:
+                converter = VALUE_CONVERTERS[spec.type]
+            names.append(spec.name)
+            formats.append(FIELD_FORMATS[spec.type])
+            converters.append(converter)
+        return CommandLayout(command, opcode, names, formats, converters, self.opcode_format)
+
+    def encode(self, command, values=()):
+        """
+        Encode one command.
+
+        Args:
+            command (str): Command name
+            values: Parameter values in Params order, or a mapping of
+                parameter name -> value; enum parameters take a raw value
+                or a label
+
+        Returns:
+            bytes: Packet
+
+        Raises:
+            EncodeError: If the command or its values can't be encoded
+        """
+        return self.layout(command).pack(values)
+
+    def encode_many(self, commands, values):
+        """
+        Encode a batch of commands.
+
+        Args:
+            commands (iterable): Command names
+            values (iterable): Parameter values of each command, as for
+                encode()
+
+        Returns:
+            list: One packet (bytes) per command
+
+        Raises:
+            EncodeError: For the first command that can't be encoded,
+                with its position in the batch
+        """
+        commands, values = list(commands), list(values)
+        if len(commands) != len(values):
+            raise EncodeError(f"Got {len(commands)} commands but {len(values)} value lists")
+        layouts = self._layouts
+        packets = []
+        for i, (command, command_values) in enumerate(zip(commands, values)):
+            try:
+                layout = layouts.get(command) or self.layout(command)
+                packets.append(layout.pack(command_values))
+            except EncodeError as e:
+                raise EncodeError(f"Batch row {i}: {e}") from None
+        return packets
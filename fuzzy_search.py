@@ -0,0 +1,151 @@
+"""
+Typo-Tolerant Command Search
+
+Ranks commands by similarity to a sloppy query such as "CMD_DEPLY_ANTENA"
+or "calibrate sensr", where the exact substring filter finds nothing.
+
+Search runs in two stages over the trigram postings already held by
+SearchIndex, so no second index is built:
+1. Candidate generation: count how many of the query's trigrams each row
+   contains (rarest trigrams first) and keep the best-covered rows.
+2. Reranking: score candidates with difflib similarity against the command
+   name and against the individual description words.
+
+Every query runs against a hard time budget. When the budget runs out,
+remaining posting lists are skipped and unranked candidates keep their
+trigram-coverage score, ranked after every reranked candidate, so a
+pathological query degrades in quality instead of stalling the UI.
+"""
+
+import re
+import time
+from collections import namedtuple
+from difflib import SequenceMatcher
+
+import numpy as np
+
+from search_index import query_gram_keys
+
+# Default per-query time budget in seconds
+DEFAULT_TIME_BUDGET = 0.05
+
+# Share of the budget spent collecting candidates; the rest goes to reranking
+_CANDIDATE_SHARE = 0.5
+
+FuzzyMatch = namedtuple("FuzzyMatch", ["row", "command", "score"])
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _word_score(query_words, text_words):
+    """Average, over query words, of the best match among text words."""
+    if not query_words or not text_words:
+        return 0.0
+    total = 0.0
+    for word in query_words:
+        matcher = SequenceMatcher()
+        matcher.set_seq2(word)
+        best = 0.0
+        for candidate in text_words:
+            matcher.set_seq1(candidate)
+            if matcher.real_quick_ratio() > best and matcher.quick_ratio() > best:
+                best = max(best, matcher.ratio())
+        total += best
+    return total / len(query_words)
+
+
+class FuzzySearcher:
+    """
+    Ranked, typo-tolerant search over a SearchIndex.
+
+    Args:
+        commands (sequence): Command names by row, as indexed
+        search_index (SearchIndex): Trigram index over Command and Description
+    """
+
+    def __init__(self, commands, search_index):
+        self.commands = commands
+        self.index = search_index
+
+    def _row_text(self, row):
+        """Return the lowercase (command, description) of a row."""
+        start, end = self.index.row_starts[row], self.index.row_starts[row + 1]
+        text = bytes(self.index.heap[start:end]).decode("utf-8")
+        command, description, _ = text.split("\0")
+        return command, description
+
+    def search(self, query, limit=10, time_budget=DEFAULT_TIME_BUDGET, min_score=0.6):
+        """
+        Find the commands most similar to a query.
+
+        Args:
+            query (str): Search text; case and word order are ignored
+            limit (int): Maximum number of results
+            time_budget (float): Hard per-query budget in seconds
+            min_score (float): Drop results scoring below this (0.0 - 1.0)
+
+        Returns:
+            list: FuzzyMatch(row, command, score) tuples, best first
+        """
+        deadline = time.perf_counter() + time_budget
+        query = query.lower().strip()
+        words = _WORD_RE.findall(query)
+        if not query or not words:
+            return []
+
+        # Trigrams of the whole query and of each word, so word order and
+        # separators don't matter
+        keys = np.unique(np.concatenate(
+            [query_gram_keys(query)] + [query_gram_keys(w) for w in words]
+        ))
+        if len(keys) == 0:
+            return []
+
+        # Stage 1: trigram coverage per row, rarest trigrams first
+        candidate_deadline = time.perf_counter() + time_budget * _CANDIDATE_SHARE
+        lists = sorted((self.index.posting_list(k) for k in keys), key=len)
+        lists = [plist for plist in lists if len(plist)]
+        if not lists:
+            return []
+        used = []
+        for plist in lists:
+            if used and time.perf_counter() > candidate_deadline:
+                break
+            used.append(plist)
+        hits = np.bincount(np.concatenate(used), minlength=len(self.index))
+
+        # Rows sharing under half the best coverage can't rank near the top
+        max_hits = hits.max()
+        n_candidates = min(max(limit * 10, 100),
+                           np.count_nonzero(hits >= max(1, max_hits // 2)))
+        if n_candidates == 0:
+            return []
+        candidates = np.argpartition(hits, -n_candidates)[-n_candidates:]
+        candidates = candidates[np.argsort(-hits[candidates], kind="stable")]
+
+        # Stage 2: rerank by edit similarity while the budget lasts
+        query_compact = " ".join(words)
+        scores = {}
+        for row in candidates.tolist():
+            if time.perf_counter() > deadline:
+                break
+            command, description = self._row_text(row)
+            command_score = SequenceMatcher(
+                None, query_compact, " ".join(_WORD_RE.findall(command))
+            ).ratio()
+            description_score = _word_score(words, _WORD_RE.findall(description))
+            scores[row] = max(command_score, description_score)
+
+        # Rows the budget didn't reach keep their trigram coverage, which
+        # isn't comparable with a similarity: they rank after every
+        # reranked row, in their own tier
+        leftovers = {
+            row: float(hits[row] / len(keys)) for row in candidates.tolist()
+            if row not in scores
+        }
+        ranked = [
+            item for tier in (scores, leftovers)
+            for item in sorted(tier.items(), key=lambda item: (-item[1], item[0]))
+            if item[1] >= min_score
+        ]
+        return [FuzzyMatch(row, self.commands[row], score) for row, score in ranked[:limit]]
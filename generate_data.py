@@ -1,162 +1,359 @@
+"""
+Sample and Synthetic Data Generator
 
-import pandas as pd
+Writes the three CSV files the app reads (master_commands.csv,
+parameter_metadata.csv, enum_definitions.csv).
+
+With no size options it writes the small hand-written sample dictionary
+(14 commands, 23 parameters). With --commands it instead streams a
+synthetic, internally consistent dictionary of any size, for scaling tests
+of the loader, search and details paths. The same seed and options always
+produce byte-identical files, and rows are written in chunks so memory
+stays bounded even at millions of commands.
+
+Usage:
+    python generate_data.py
+    python generate_data.py --commands 1000000 --seed 7 --output-dir data/1m
+"""
+
+import argparse
+import csv
 import os
+import random
+
+# Word lists for synthetic command names and descriptions
+VERBS = [
+    "SET", "GET", "ARM", "DISARM", "DEPLOY", "STOW", "POWER_ON", "POWER_OFF",
+    "START", "STOP", "RESET", "ENABLE", "DISABLE", "CALIBRATE", "UPDATE",
+    "LOAD", "DUMP", "CLEAR", "TEST", "SELECT",
+]
+NOUNS = [
+    "ANTENNA", "MODE", "SUBSYSTEM", "ATTITUDE", "RECORDER", "TRANSMITTER",
+    "SENSOR", "ORBIT", "PAYLOAD", "HEATER", "BATTERY", "WHEEL", "THRUSTER",
+    "VALVE", "CAMERA", "GYRO", "STAR_TRACKER", "MAGNETORQUER", "CLOCK", "BUS",
+]
+DESCRIPTION_WORDS = [
+    "sets", "the", "primary", "backup", "subsystem", "operational", "mode",
+    "with", "safety", "checks", "deploys", "communication", "antenna", "powers",
+    "specified", "gracefully", "attitude", "using", "reaction", "wheels",
+    "starts", "stops", "data", "recording", "sensors", "transmission", "ground",
+    "station", "forces", "safe", "immediately", "calibrates", "reference",
+    "values", "updates", "orbital", "parameters", "activates", "payload",
+    "instruments", "conserve", "power", "thermal", "control", "loop", "heater",
+    "battery", "charge", "telemetry", "rate", "configuration", "table",
+]
+SCALAR_TYPES = ["int", "float", "bool"]
+
+# Rows buffered before each write
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def write_sample_data(output_dir="."):
+    """
+    Write the small hand-written sample dictionary.
+
+    Args:
+        output_dir (str): Directory to write the CSV files into
+    """
+    import pandas as pd
+
+    # Create CSV files in the output directory
+    print("Generating satellite command data...")
+
+    # 1. Master Command CSV - Expanded with more realistic satellite commands
+    master_command_data = pd.DataFrame({
+        "Command": [
+            "CMD_ARM_SYSTEM", "CMD_SET_MODE", "CMD_DEPLOY_ANTENNA", 
+            "CMD_POWER_ON_SUBSYSTEM", "CMD_POWER_OFF_SUBSYSTEM", 
+            "CMD_SET_ATTITUDE", "CMD_START_RECORDING", "CMD_STOP_RECORDING",
+            "CMD_TRANSMIT_DATA", "CMD_ENTER_SAFE_MODE", "CMD_CALIBRATE_SENSOR",
+            "CMD_UPDATE_ORBIT", "CMD_ACTIVATE_PAYLOAD", "CMD_SHUTDOWN_PAYLOAD"
+        ],
+        "HexCode": [
+            "0xAF23", "0xB104", "0xC302", "0xD405", "0xD406", 
+            "0xE507", "0xF608", "0xF609", "0xG710", "0xH811",
+            "0xI912", "0xJ013", "0xK114", "0xK115"
+        ],
+        "Description": [
+            "Arms the safety-critical subsystems for operation",
+            "Sets the system operational mode (SAFE/LIVE/TEST)",
+            "Deploys the primary communication antenna",
+            "Powers on specified subsystem with safety checks",
+            "Powers off specified subsystem gracefully",
+            "Sets satellite attitude using reaction wheels",
+            "Starts data recording from all active sensors",
+            "Stops data recording and closes files",
+            "Initiates data transmission to ground station",
+            "Forces satellite into safe mode immediately",
+            "Calibrates specified sensor with reference values",
+            "Updates orbital parameters and trajectory",
+            "Activates scientific payload instruments",
+            "Shuts down payload to conserve power"
+        ],
+        "Params": [
+            "Mode,Delay", "Mode", "DeployType,Confirm", 
+            "SubsystemID,PowerLevel", "SubsystemID,Confirm",
+            "Roll,Pitch,Yaw,Duration", "DataType,Compression", "Confirm",
+            "GroundStation,Frequency,PowerLevel", "Reason", "SensorID,CalType",
+            "Altitude,Inclination,RAAN", "PayloadID,Config", "PayloadID,SaveState"
+        ]
+    })
+
+    # 2. Parameter Metadata CSV - Expanded with more parameter types
+    parameter_metadata = pd.DataFrame({
+        "ParamID": [
+            "Mode", "Delay", "DeployType", "Confirm", "SubsystemID", "PowerLevel",
+            "Roll", "Pitch", "Yaw", "Duration", "DataType", "Compression",
+            "GroundStation", "Frequency", "Reason", "SensorID", "CalType",
+            "Altitude", "Inclination", "RAAN", "PayloadID", "Config", "SaveState"
+        ],
+        "Type": [
+            "enum", "int", "enum", "bool", "enum", "float",
+            "float", "float", "float", "int", "enum", "enum",
+            "enum", "float", "enum", "enum", "enum",
+            "float", "float", "float", "enum", "enum", "bool"
+        ],
+        "EnumSet": [
+            "ARM_MODE", None, "DEPLOY_TYPE", None, "SUBSYSTEM_ID", None,
+            None, None, None, None, "DATA_TYPE", "COMPRESSION_TYPE",
+            "GROUND_STATION", None, "SAFE_REASON", "SENSOR_ID", "CAL_TYPE",
+            None, None, None, "PAYLOAD_ID", "PAYLOAD_CONFIG", None
+        ],
+        "Range": [
+            None, "0-300", None, None, None, "0.0-1.0",
+            "-180.0-180.0", "-90.0-90.0", "-180.0-180.0", "1-3600", None, None,
+            None, "2000.0-2500.0", None, None, None,
+            "200.0-2000.0", "0.0-180.0", "0.0-360.0", None, None, None
+        ]
+    })
+
+    # 3. Enum Definitions CSV - Comprehensive enum values
+    enum_definitions = pd.DataFrame({
+        "EnumSet": [
+            # ARM_MODE enum
+            "ARM_MODE", "ARM_MODE", "ARM_MODE",
+            # DEPLOY_TYPE enum  
+            "DEPLOY_TYPE", "DEPLOY_TYPE",
+            # SUBSYSTEM_ID enum
+            "SUBSYSTEM_ID", "SUBSYSTEM_ID", "SUBSYSTEM_ID", "SUBSYSTEM_ID", "SUBSYSTEM_ID",
+            # DATA_TYPE enum
+            "DATA_TYPE", "DATA_TYPE", "DATA_TYPE", "DATA_TYPE",
+            # COMPRESSION_TYPE enum
+            "COMPRESSION_TYPE", "COMPRESSION_TYPE", "COMPRESSION_TYPE",
+            # GROUND_STATION enum
+            "GROUND_STATION", "GROUND_STATION", "GROUND_STATION",
+            # SAFE_REASON enum
+            "SAFE_REASON", "SAFE_REASON", "SAFE_REASON", "SAFE_REASON",
+            # SENSOR_ID enum
+            "SENSOR_ID", "SENSOR_ID", "SENSOR_ID", "SENSOR_ID",
+            # CAL_TYPE enum
+            "CAL_TYPE", "CAL_TYPE", "CAL_TYPE",
+            # PAYLOAD_ID enum
+            "PAYLOAD_ID", "PAYLOAD_ID", "PAYLOAD_ID",
+            # PAYLOAD_CONFIG enum
+            "PAYLOAD_CONFIG", "PAYLOAD_CONFIG", "PAYLOAD_CONFIG"
+        ],
+        "Value": [
+            # ARM_MODE values
+            0, 1, 2,
+            # DEPLOY_TYPE values
+            0, 1,
+            # SUBSYSTEM_ID values
+            1, 2, 3, 4, 5,
+            # DATA_TYPE values
+            0, 1, 2, 3,
+            # COMPRESSION_TYPE values
+            0, 1, 2,
+            # GROUND_STATION values
+            1, 2, 3,
+            # SAFE_REASON values
+            0, 1, 2, 3,
+            # SENSOR_ID values
+            1, 2, 3, 4,
+            # CAL_TYPE values
+            0, 1, 2,
+            # PAYLOAD_ID values
+            1, 2, 3,
+            # PAYLOAD_CONFIG values
+            0, 1, 2
+        ],
+        "Label": [
+            # ARM_MODE labels
+            "SAFE", "LIVE", "TEST",
+            # DEPLOY_TYPE labels
+            "MAIN", "BACKUP",
+            # SUBSYSTEM_ID labels
+            "COMMS", "POWER", "ATTITUDE", "THERMAL", "PAYLOAD",
+            # DATA_TYPE labels
+            "TELEMETRY", "SCIENCE", "HOUSEKEEPING", "LOGS",
+            # COMPRESSION_TYPE labels
+            "NONE", "LOSSLESS", "LOSSY",
+            # GROUND_STATION labels
+            "HOUSTON", "MADRID", "CANBERRA",
+            # SAFE_REASON labels
+            "POWER_LOW", "TEMP_HIGH", "COMM_LOSS", "MANUAL",
+            # SENSOR_ID labels
+            "GYRO", "MAGNETOMETER", "SUN_SENSOR", "STAR_TRACKER",
+            # CAL_TYPE labels
+            "FACTORY", "FIELD", "DRIFT",
+            # PAYLOAD_ID labels
+            "CAMERA", "SPECTROMETER", "RADAR",
+            # PAYLOAD_CONFIG labels
+            "LOW_POWER", "NORMAL", "HIGH_RESOLUTION"
+        ]
+    })
+
+    # Save all CSV files to the output directory
+    master_command_data.to_csv(os.path.join(output_dir, "master_commands.csv"), index=False)
+    parameter_metadata.to_csv(os.path.join(output_dir, "parameter_metadata.csv"), index=False)
+    enum_definitions.to_csv(os.path.join(output_dir, "enum_definitions.csv"), index=False)
+
+    print("✅ Generated 3 CSV files:")
+    print("  - master_commands.csv (14 satellite commands)")
+    print("  - parameter_metadata.csv (23 parameter definitions)")
+    print("  - enum_definitions.csv (comprehensive enum mappings)")
+    print("\nRun 'streamlit run app.py' to start the application!")
+
+
+def _write_chunked(path, header, rows, chunk_size):
+    """Stream rows to a CSV file, buffering at most chunk_size rows."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(header)
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                writer.writerows(chunk)
+                chunk.clear()
+        writer.writerows(chunk)
+
+
+def write_synthetic_data(output_dir=".", commands=1000, params_per_command=4,
+                         param_pool=None, enum_sets=50, values_per_set=8,
+                         description_words=8, seed=0,
+                         chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Stream a synthetic, internally consistent dictionary to CSV.
+
+    Every parameter referenced by a command exists in parameter_metadata.csv,
+    every enum parameter references an existing enum set, and command names
+    and hex codes are unique. Memory use depends on chunk_size and the
+    parameter/enum tables, not on the number of commands.
+
+    Args:
+        output_dir (str): Directory to write the CSV files into
+        commands (int): Number of commands
+        params_per_command (int): Maximum parameters per command; each
+            command gets between 0 and this many
+        param_pool (int): Number of distinct parameter definitions
+            (default: 10 x params_per_command, at least 1)
+        enum_sets (int): Number of enum sets
+        values_per_set (int): Values in each enum set
+        description_words (int): Words per command description
+        seed (int): Random seed; equal seeds give identical files
+        chunk_size (int): Rows buffered per write
+    """
+    rng = random.Random(seed)
+    if param_pool is None:
+        param_pool = max(1, params_per_command * 10)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Enum sets: values 0..values_per_set-1 with generated labels
+    enum_names = [f"ENUM_SET_{i}" for i in range(enum_sets)]
+
+    def enum_rows():
+        for name in enum_names:
+            for value in range(values_per_set):
+                yield name, value, f"{name[9:]}_{rng.choice(NOUNS)}_{value}"
+
+    _write_chunked(os.path.join(output_dir, "enum_definitions.csv"),
+                   ["EnumSet", "Value", "Label"], enum_rows(), chunk_size)
+
+    # Parameters: roughly one in three is an enum when enum sets exist
+    param_ids = [f"Param{i}" for i in range(param_pool)]
+
+    def param_rows():
+        for pid in param_ids:
+            if enum_names and rng.random() < 1 / 3:
+                yield pid, "enum", rng.choice(enum_names), ""
+                continue
+            param_type = rng.choice(SCALAR_TYPES)
+            if param_type == "int":
+                low = rng.randint(-1000, 0)
+                yield pid, "int", "", f"{low}-{low + rng.randint(1, 5000)}"
+            elif param_type == "float":
+                low = round(rng.uniform(-360.0, 0.0), 1)
+                yield pid, "float", "", f"{low}-{round(low + rng.uniform(1.0, 720.0), 1)}"
+            else:
+                yield pid, "bool", "", ""
+
+    _write_chunked(os.path.join(output_dir, "parameter_metadata.csv"),
+                   ["ParamID", "Type", "EnumSet", "Range"], param_rows(), chunk_size)
+
+    # Commands: unique names and hex codes, consistent parameter references
+    hex_width = max(4, len(f"{max(commands - 1, 0):X}"))
+
+    def command_rows():
+        for i in range(commands):
+            name = f"CMD_{rng.choice(VERBS)}_{rng.choice(NOUNS)}_{i}"
+            description = " ".join(
+                rng.choice(DESCRIPTION_WORDS) for _ in range(description_words)
+            ).capitalize()
+            count = rng.randint(0, min(params_per_command, param_pool))
+            params = ",".join(rng.sample(param_ids, count))
+            yield name, f"0x{i:0{hex_width}X}", description, params
+
+    _write_chunked(os.path.join(output_dir, "master_commands.csv"),
+                   ["Command", "HexCode", "Description", "Params"],
+                   command_rows(), chunk_size)
+
+    print(f"✅ Generated {commands} commands, {param_pool} parameters and "
+          f"{enum_sets} enum sets in {output_dir}")
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Args:
+        argv (list): Arguments to parse instead of sys.argv[1:]
+    """
+    parser = argparse.ArgumentParser(description="Generate command dictionary CSV files")
+    parser.add_argument("--commands", type=int,
+                        help="Generate a synthetic dictionary with this many commands")
+    parser.add_argument("--params-per-command", type=int, default=4,
+                        help="Maximum parameters per command (default: 4)")
+    parser.add_argument("--param-pool", type=int,
+                        help="Distinct parameter definitions (default: 10 x params-per-command)")
+    parser.add_argument("--enum-sets", type=int, default=50,
+                        help="Number of enum sets (default: 50)")
+    parser.add_argument("--values-per-set", type=int, default=8,
+                        help="Values per enum set (default: 8)")
+    parser.add_argument("--description-words", type=int, default=8,
+                        help="Words per description (default: 8)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Rows buffered per write (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--output-dir", default=".", help="Output directory (default: .)")
+    args = parser.parse_args(argv)
+
+    if args.commands is None:
+        write_sample_data(args.output_dir)
+        return
 
-# Create CSV files in current directory
-print("Generating satellite command data...")
-
-# 1. Master Command CSV - Expanded with more realistic satellite commands
-master_command_data = pd.DataFrame({
-    "Command": [
-        "CMD_ARM_SYSTEM", "CMD_SET_MODE", "CMD_DEPLOY_ANTENNA", 
-        "CMD_POWER_ON_SUBSYSTEM", "CMD_POWER_OFF_SUBSYSTEM", 
-        "CMD_SET_ATTITUDE", "CMD_START_RECORDING", "CMD_STOP_RECORDING",
-        "CMD_TRANSMIT_DATA", "CMD_ENTER_SAFE_MODE", "CMD_CALIBRATE_SENSOR",
-        "CMD_UPDATE_ORBIT", "CMD_ACTIVATE_PAYLOAD", "CMD_SHUTDOWN_PAYLOAD"
-    ],
-    "HexCode": [
-        "0xAF23", "0xB104", "0xC302", "0xD405", "0xD406", 
-        "0xE507", "0xF608", "0xF609", "0xG710", "0xH811",
-        "0xI912", "0xJ013", "0xK114", "0xK115"
-    ],
-    "Description": [
-        "Arms the safety-critical subsystems for operation",
-        "Sets the system operational mode (SAFE/LIVE/TEST)",
-        "Deploys the primary communication antenna",
-        "Powers on specified subsystem with safety checks",
-        "Powers off specified subsystem gracefully",
-        "Sets satellite attitude using reaction wheels",
-        "Starts data recording from all active sensors",
-        "Stops data recording and closes files",
-        "Initiates data transmission to ground station",
-        "Forces satellite into safe mode immediately",
-        "Calibrates specified sensor with reference values",
-        "Updates orbital parameters and trajectory",
-        "Activates scientific payload instruments",
-        "Shuts down payload to conserve power"
-    ],
-    "Params": [
-        "Mode,Delay", "Mode", "DeployType,Confirm", 
-        "SubsystemID,PowerLevel", "SubsystemID,Confirm",
-        "Roll,Pitch,Yaw,Duration", "DataType,Compression", "Confirm",
-        "GroundStation,Frequency,PowerLevel", "Reason", "SensorID,CalType",
-        "Altitude,Inclination,RAAN", "PayloadID,Config", "PayloadID,SaveState"
-    ]
-})
-
-# 2. Parameter Metadata CSV - Expanded with more parameter types
-parameter_metadata = pd.DataFrame({
-    "ParamID": [
-        "Mode", "Delay", "DeployType", "Confirm", "SubsystemID", "PowerLevel",
-        "Roll", "Pitch", "Yaw", "Duration", "DataType", "Compression",
-        "GroundStation", "Frequency", "Reason", "SensorID", "CalType",
-        "Altitude", "Inclination", "RAAN", "PayloadID", "Config", "SaveState"
-    ],
-    "Type": [
-        "enum", "int", "enum", "bool", "enum", "float",
-        "float", "float", "float", "int", "enum", "enum",
-        "enum", "float", "enum", "enum", "enum",
-        "float", "float", "float", "enum", "enum", "bool"
-    ],
-    "EnumSet": [
-        "ARM_MODE", None, "DEPLOY_TYPE", None, "SUBSYSTEM_ID", None,
-        None, None, None, None, "DATA_TYPE", "COMPRESSION_TYPE",
-        "GROUND_STATION", None, "SAFE_REASON", "SENSOR_ID", "CAL_TYPE",
-        None, None, None, "PAYLOAD_ID", "PAYLOAD_CONFIG", None
-    ],
-    "Range": [
-        None, "0-300", None, None, None, "0.0-1.0",
-        "-180.0-180.0", "-90.0-90.0", "-180.0-180.0", "1-3600", None, None,
-        None, "2000.0-2500.0", None, None, None,
-        "200.0-2000.0", "0.0-180.0", "0.0-360.0", None, None, None
-    ]
-})
-
-# 3. Enum Definitions CSV - Comprehensive enum values
-enum_definitions = pd.DataFrame({
-    "EnumSet": [
-        # ARM_MODE enum
-        "ARM_MODE", "ARM_MODE", "ARM_MODE",
-        # DEPLOY_TYPE enum  
-        "DEPLOY_TYPE", "DEPLOY_TYPE",
-        # SUBSYSTEM_ID enum
-        "SUBSYSTEM_ID", "SUBSYSTEM_ID", "SUBSYSTEM_ID", "SUBSYSTEM_ID", "SUBSYSTEM_ID",
-        # DATA_TYPE enum
-        "DATA_TYPE", "DATA_TYPE", "DATA_TYPE", "DATA_TYPE",
-        # COMPRESSION_TYPE enum
-        "COMPRESSION_TYPE", "COMPRESSION_TYPE", "COMPRESSION_TYPE",
-        # GROUND_STATION enum
-        "GROUND_STATION", "GROUND_STATION", "GROUND_STATION",
-        # SAFE_REASON enum
-        "SAFE_REASON", "SAFE_REASON", "SAFE_REASON", "SAFE_REASON",
-        # SENSOR_ID enum
-        "SENSOR_ID", "SENSOR_ID", "SENSOR_ID", "SENSOR_ID",
-        # CAL_TYPE enum
-        "CAL_TYPE", "CAL_TYPE", "CAL_TYPE",
-        # PAYLOAD_ID enum
-        "PAYLOAD_ID", "PAYLOAD_ID", "PAYLOAD_ID",
-        # PAYLOAD_CONFIG enum
-        "PAYLOAD_CONFIG", "PAYLOAD_CONFIG", "PAYLOAD_CONFIG"
-    ],
-    "Value": [
-        # ARM_MODE values
-        0, 1, 2,
-        # DEPLOY_TYPE values
-        0, 1,
-        # SUBSYSTEM_ID values
-        1, 2, 3, 4, 5,
-        # DATA_TYPE values
-        0, 1, 2, 3,
-        # COMPRESSION_TYPE values
-        0, 1, 2,
-        # GROUND_STATION values
-        1, 2, 3,
-        # SAFE_REASON values
-        0, 1, 2, 3,
-        # SENSOR_ID values
-        1, 2, 3, 4,
-        # CAL_TYPE values
-        0, 1, 2,
-        # PAYLOAD_ID values
-        1, 2, 3,
-        # PAYLOAD_CONFIG values
-        0, 1, 2
-    ],
-    "Label": [
-        # ARM_MODE labels
-        "SAFE", "LIVE", "TEST",
-        # DEPLOY_TYPE labels
-        "MAIN", "BACKUP",
-        # SUBSYSTEM_ID labels
-        "COMMS", "POWER", "ATTITUDE", "THERMAL", "PAYLOAD",
-        # DATA_TYPE labels
-        "TELEMETRY", "SCIENCE", "HOUSEKEEPING", "LOGS",
-        # COMPRESSION_TYPE labels
-        "NONE", "LOSSLESS", "LOSSY",
-        # GROUND_STATION labels
-        "HOUSTON", "MADRID", "CANBERRA",
-        # SAFE_REASON labels
-        "POWER_LOW", "TEMP_HIGH", "COMM_LOSS", "MANUAL",
-        # SENSOR_ID labels
-        "GYRO", "MAGNETOMETER", "SUN_SENSOR", "STAR_TRACKER",
-        # CAL_TYPE labels
-        "FACTORY", "FIELD", "DRIFT",
-        # PAYLOAD_ID labels
-        "CAMERA", "SPECTROMETER", "RADAR",
-        # PAYLOAD_CONFIG labels
-        "LOW_POWER", "NORMAL", "HIGH_RESOLUTION"
-    ]
-})
-
-# Save all CSV files to current directory
-master_command_data.to_csv("master_commands.csv", index=False)
-parameter_metadata.to_csv("parameter_metadata.csv", index=False)
-enum_definitions.to_csv("enum_definitions.csv", index=False)
-
-print("✅ Generated 3 CSV files:")
-print("  - master_commands.csv (14 satellite commands)")
-print("  - parameter_metadata.csv (23 parameter definitions)")
-print("  - enum_definitions.csv (comprehensive enum mappings)")
-print("\nRun 'streamlit run app.py' to start the application!")
+    write_synthetic_data(
+        output_dir=args.output_dir,
+        commands=args.commands,
+        params_per_command=args.params_per_command,
+        param_pool=args.param_pool,
+        enum_sets=args.enum_sets,
+        values_per_set=args.values_per_set,
+        description_words=args.description_words,
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+    )
 
 
+if __name__ == "__main__":
+    main()
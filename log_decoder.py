@@ -0,0 +1,303 @@
+"""
+Parallel Command Log Decoder
+
+Annotates uplink history against the command dictionary: each record's
+opcode is mapped back to its command, and its raw parameter values get
+their parameter names and enum labels.
+
+Input is text, one record per line:
+
+    <time>,<opcode>[,<value>...]
+
+e.g. ``2024-05-01T12:00:00Z,0xAF23,1,30``. The opcode is a HexCode in any
+case, with or without its 0x prefix; values follow the command's Params
+order. Blank lines and lines starting with # are skipped.
+
+Output is JSON Lines, one record per input record, in input order:
+
+    {"offset": 0, "time": "2024-05-01T12:00:00Z", "opcode": "0xAF23",
+     "command": "CMD_ARM_SYSTEM",
+     "params": [{"name": "Mode", "value": "1", "label": "LIVE"},
+                {"name": "Delay", "value": "30"}]}
+
+"offset" is the byte offset of the record in the log. A record whose
+opcode no command has gets "command": null and an "error"; so does one
+whose value count doesn't match the command's Params (its values are
+still annotated). Opcodes shared by several commands are decoded as the
+first of them and marked "duplicate": true.
+
+The log is cut into chunks of about CHUNK_BYTES at line boundaries; the
+parent only seeks to find the boundaries, and each worker process reads,
+decodes and serializes its own byte range. Workers are forked after the
+catalog is loaded, so they share it read-only (copy-on-write) instead of
+loading their own; where fork isn't available each worker loads it from
+the snapshot. At most IN_FLIGHT_PER_WORKER chunks per worker are queued,
+so memory stays bounded however large the log is.
+
+Usage:
+    python log_decoder.py uplink.log [-o annotated.jsonl] [--workers 8] [--data-dir .]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from json.encoder import encode_basestring as _json_string
+
+import data_loader
+from catalog_tables import parse_opcodes
+
+# Bytes of log per chunk (a chunk ends at the first line end after this)
+CHUNK_BYTES = 8 * 1024 * 1024
+
+# Chunks queued per worker ahead of the one being written
+IN_FLIGHT_PER_WORKER = 2
+
+# One decoded chunk: byte range, JSON Lines text, records and how many
+# of them carry an "error"
+DecodedChunk = namedtuple("DecodedChunk", ["start", "end", "text", "records", "errors"])
+
+# Catalog of a worker process: inherited over fork, or loaded by
+# _init_worker(); plus its per-command annotation templates
+_worker_catalog = None
+_worker_templates = {}
+
+
+def iter_chunks(path, chunk_bytes=CHUNK_BYTES):
+    """
+    Split a file into byte ranges of whole lines.
+
+    Only one line per chunk is read, to find its end.
+
+    Args:
+        path (str): File to split
+        chunk_bytes (int): Approximate chunk size
+
+    Yields:
+        tuple: (start, end) byte offsets, covering the file in order
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        start = 0
+        while start < size:
+            end = start + chunk_bytes
+            if end < size:
+                # Finish the line the cut falls into
+                f.seek(end - 1)
+                f.readline()
+                end = f.tell()
+            end = min(end, size)
+            yield start, end
+            start = end
+
+
+def _template(catalog, templates, row):
+    """
+    Serialized pieces of a command row's records, built once per command:
+    (command JSON, [(param "name" JSON, {value: label} or None)]).
+    """
+    template = templates.get(row)
+    if template is None:
+        command = catalog.command_names[row]
+        _, _, param_details = catalog.get_command_details(command)
+        # Missing labels (pd.NA) become None, written as null
+        template = (_json_string(command), [
+            ('{"name": ' + _json_string(param['name']),
+             None if param['enum_values'] is None else {
+                 value: data_loader.json_value(label)
+                 for value, label in param['enum_values'].items()
+             })
+            for param in param_details
+        ])
+        templates[row] = template
+    return template
+
+
+def _label(labels, value):
+    label = labels.get(value)
+    if label is None and value.lstrip("+-").isdigit():
+        # "01" or "+1" for the value 1
+        label = labels.get(str(int(value)))
+    return label
+
+
+def _json_value(value):
+    return "null" if value is None else _json_string(value)
+
+
+def decode_lines(catalog, data, base_offset=0, templates=None):
+    """
+    Decode a block of whole log lines.
+
+    Records are serialized from per-command templates rather than through
+    json.dumps() of a dict per record; the output is the same JSON.
+
+    Args:
+        catalog (CommandCatalog): Command dictionary
+        data (bytes): Log lines (UTF-8)
+        base_offset (int): Byte offset of ``data`` in the log
+        templates (dict): Per-command template cache to reuse across
+            blocks of the same catalog
+
+    Returns:
+        tuple: (JSON Lines text, records, records with an error)
+    """
+    if templates is None:
+        templates = {}
+    offsets, fields = [], []
+    offset = base_offset
+    for line in data.split(b"\n"):
+        text = line.decode("utf-8", errors="replace").strip()
+        if text and not text.startswith("#"):
+            offsets.append(offset)
+            fields.append([field.strip() for field in text.split(",")])
+        offset += len(line) + 1
+    if not fields:
+        return "", 0, 0
+
+    opcodes = parse_opcodes([parts[1] if len(parts) > 1 else "" for parts in fields])
+    rows, shared = catalog.opcode_rows(opcodes)
+
+    lines, errors = [], 0
+    for offset, parts, opcode, row, duplicate in zip(
+            offsets, fields, opcodes.tolist(), rows.tolist(), shared.tolist()):
+        head = (f'{{"offset": {offset}, "time": {_json_string(parts[0])}, '
+                f'"opcode": {_json_value(parts[1] if len(parts) > 1 else None)}, ')
+        if row < 0:
+            error = "unknown opcode" if opcode >= 0 else "invalid opcode"
+            lines.append(f'{head}"command": null, "error": "{error}"}}')
+            errors += 1
+            continue
+
+        command, params = _template(catalog, templates, row)
+        values = parts[2:]
+        annotated = []
+        for (name, labels), value in zip(params, values):
+            if labels is None:
+                annotated.append(f'{name}, "value": {_json_string(value)}}}')
+            else:
+                label = _json_value(_label(labels, value))
+                annotated.append(f'{name}, "value": {_json_string(value)}, "label": {label}}}')
+        for value in values[len(params):]:
+            annotated.append(f'{{"name": null, "value": {_json_string(value)}}}')
+        line = f'{head}"command": {command}, '
+        if duplicate:
+            line += '"duplicate": true, '
+        line += f'"params": [{", ".join(annotated)}]'
+        if len(values) != len(params):
+            line += (f', "error": "expected {len(params)} parameter values, '
+                     f'got {len(values)}"')
+            errors += 1
+        lines.append(line + "}")
+    lines.append("")
+    return "\n".join(lines), len(fields), errors
+
+
+def _decode_range(catalog, templates, path, start, end):
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return DecodedChunk(start, end, *decode_lines(catalog, data, start, templates))
+
+
+def _init_worker(data_dir):
+    global _worker_catalog
+    if _worker_catalog is None:
+        # Not forked from the parent (e.g. spawn): load from the snapshot
+        _worker_catalog = data_loader.load_catalog(data_dir)
+
+
+def _worker_decode(path, start, end):
+    return _decode_range(_worker_catalog, _worker_templates, path, start, end)
+
+
+def decode_log(path, data_dir=".", workers=None, chunk_bytes=CHUNK_BYTES):
+    """
+    Decode a log file chunk by chunk, in parallel.
+
+    Args:
+        path (str): Log file
+        data_dir (str): Directory containing the CSV files
+        workers (int): Worker processes; defaults to the CPU count, and 1
+            decodes in this process
+        chunk_bytes (int): Approximate bytes of log per chunk
+
+    Yields:
+        DecodedChunk: Decoded chunks, in file order
+    """
+    catalog = data_loader.load_catalog(data_dir)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        templates = {}
+        for start, end in iter_chunks(path, chunk_bytes):
+            yield _decode_range(catalog, templates, path, start, end)
+        return
+
+    global _worker_catalog
+    # Build the lazy opcode index before forking, so workers share it too
+    catalog.opcode_rows([])
+    context = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+        _worker_catalog = catalog
+    try:
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(data_dir,)) as pool:
+            pending = deque()
+            for start, end in iter_chunks(path, chunk_bytes):
+                if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                    yield pending.popleft().result()
+                pending.append(pool.submit(_worker_decode, path, start, end))
+            while pending:
+                yield pending.popleft().result()
+    finally:
+        _worker_catalog = None
+
+
+def decode_log_file(path, out, data_dir=".", workers=None, chunk_bytes=CHUNK_BYTES):
+    """
+    Decode a log file and write the annotated JSON Lines to a stream.
+
+    Args:
+        path (str): Log file
+        out (file): Text stream to write to
+        data_dir, workers, chunk_bytes: See decode_log()
+
+    Returns:
+        tuple: (records written, records with an error)
+    """
+    records = errors = 0
+    for chunk in decode_log(path, data_dir, workers, chunk_bytes):
+        out.write(chunk.text)
+        records += chunk.records
+        errors += chunk.errors
+    out.flush()
+    return records, errors
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Annotate an uplink command log")
+    parser.add_argument("log", help="Log file, one <time>,<opcode>[,<value>...] record per line")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    parser.add_argument("--data-dir", default=".", help="Directory containing the CSV files")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-mb", type=float, default=CHUNK_BYTES / 2**20,
+                        help=f"Log megabytes per chunk (default: {CHUNK_BYTES // 2**20})")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        records, errors = decode_log_file(args.log, out, args.data_dir, args.workers,
+                                          max(1, int(args.chunk_mb * 2**20)))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"{records} records, {errors} with errors", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,797 @@
+"""
+Memory-Mapped Command Catalog
+
+A read-only, zero-copy layout of the compiled command dictionary. Several
+Streamlit replicas (or any other processes) on one host can map the same
+file and share its pages through the OS page cache, instead of each
+holding a private pandas copy.
+
+File layout (native little-endian):
+    8 bytes   magic b"CMDMAP\\x00\\x00"
+    4 bytes   uint32 format version
+    4 bytes   uint32 length of the JSON header
+    JSON      {"fingerprint": ..., "sections": {name: [offset, typecode, count]}}
+    sections  fixed-width arrays, each aligned to 64 bytes
+
+Strings are stored as columns of three sections: ``<col>.offsets`` (int64,
+n + 1 entries), ``<col>.heap`` (UTF-8 bytes) and ``<col>.valid`` (uint8,
+0 for missing values). Commands, parameters and enum rows each carry a
+permutation sorted by name (``*.order``), so lookups are binary searches
+directly over the mapped buffers; enum_set.offsets groups enum.order by
+set. The trigram search index is stored as-is and wrapped by
+SearchIndex.from_arrays().
+
+Files are produced by MappedCatalogBuilder, which consumes the CSV data in
+chunks and spills every section to temporary files as it goes, so peak
+memory follows the chunk size rather than the dictionary size.
+
+Only the standard library is needed to open the file and look commands
+up; NumPy is imported on first search.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+
+MAPPED_MAGIC = b"CMDMAP\x00\x00"
+
+# Bump whenever the section layout changes
+MAPPED_VERSION = 2
+
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGN = 64
+
+# Postings merged per write while building (bounds builder memory)
+_POSTINGS_WINDOW = 1 << 22
+
+# Section typecodes, shared by memoryview.cast() and NumPy
+_NUMPY_DTYPES = {"q": "<i8", "I": "<u4", "B": "u1"}
+
+
+class _Strings:
+    """Read-only string column over offsets / heap / valid buffers."""
+
+    def __init__(self, offsets, heap, valid):
+        self.offsets = offsets
+        self.heap = heap
+        self.valid = valid
+
+    def __len__(self):
+        return len(self.valid)
+
+    def raw(self, i):
+        """Return the UTF-8 bytes of entry i."""
+        return bytes(self.heap[self.offsets[i]:self.offsets[i + 1]])
+
+    def __getitem__(self, i):
+        if not self.valid[i]:
+            return None
+        return self.raw(i).decode("utf-8")
+
+
+class _DisplayStrings:
+    """"Command - Description" of each row, formatted when indexed."""
+
+    def __init__(self, commands, descriptions):
+        self.commands = commands
+        self.descriptions = descriptions
+
+    def __len__(self):
+        return len(self.commands)
+
+    def __getitem__(self, i):
+        return f"{self.commands[i]} - {self.descriptions[i]}"
+
+
+def _find_sorted(strings, order, key):
+    """
+    Binary-search a string column through its sorted permutation.
+
+    Args:
+        strings (_Strings): Column to search
+        order (memoryview): Row ids sorted by the column's UTF-8 bytes
+        key (str): Value to find
+
+    Returns:
+        int: Row id of the first row equal to key, or -1
+    """
+    target = key.encode("utf-8")
+    lo, hi = 0, len(order)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if strings.raw(order[mid]) < target:
+            lo = mid + 1
+        else:
+            hi = mid
+    if lo < len(order) and strings.raw(order[lo]) == target:
+        return order[lo]
+    return -1
+
+
+class MappedCatalog:
+    """
+    Command catalog served straight from a memory-mapped file.
+
+    Offers the same lookups as CommandCatalog without building DataFrames.
+    Missing values come back as None.
+
+    Args:
+        path (str): File written by MappedCatalogBuilder
+
+    Raises:
+        ValueError: If the file is not a mapped catalog of this version
+    """
+
+    def __init__(self, path):
+        if sys.byteorder != "little":
+            raise ValueError("Mapped catalogs are only supported on little-endian hosts")
+
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+
+        magic, version, header_len = _PREAMBLE.unpack_from(self._buffer)
+        if magic != MAPPED_MAGIC or version != MAPPED_VERSION:
+            raise ValueError(f"{path} is not a version {MAPPED_VERSION} mapped catalog")
+        header = json.loads(bytes(
+            self._buffer[_PREAMBLE.size:_PREAMBLE.size + header_len]
+        ))
+        self.fingerprint = json_to_fingerprint(header["fingerprint"])
+        self._sections = header["sections"]
+
+        self.commands = self._strings("cmd.name")
+        self.hex_codes = self._strings("cmd.hex")
+        self.descriptions = self._strings("cmd.desc")
+        self._params_strs = self._strings("cmd.params")
+        self._command_order = self.section("cmd.order")
+
+        self._param_ids = self._strings("param.id")
+        self._param_types = self._strings("param.type")
+        self._param_ranges = self._strings("param.range")
+        self._param_enum_sets = self._strings("param.enum_set")
+        self._param_order = self.section("param.order")
+
+        self._enum_sets = self._strings("enum_set.name")
+        self._enum_set_offsets = self.section("enum_set.offsets")
+        self._enum_order = self.section("enum.order")
+        self._enum_values = self.section("enum.value")
+        self._enum_labels = self._strings("enum.label")
+
+        self._search_index = None
+        self._fuzzy_searcher = None
+
+    def section(self, name):
+        """
+        Return a zero-copy memoryview of one section.
+
+        Args:
+            name (str): Section name from the header
+
+        Returns:
+            memoryview: View cast to the section's typecode
+        """
+        offset, typecode, count = self._sections[name]
+        nbytes = count * struct.calcsize(typecode)
+        return self._buffer[offset:offset + nbytes].cast(typecode)
+
+    def array(self, name):
+        """Return one section as a zero-copy, read-only NumPy array."""
+        import numpy as np
+
+        offset, typecode, count = self._sections[name]
+        return np.frombuffer(self._mmap, dtype=_NUMPY_DTYPES[typecode],
+                             count=count, offset=offset)
+
+    def _strings(self, prefix):
+        return _Strings(
+            self.section(prefix + ".offsets"),
+            self.section(prefix + ".heap"),
+            self.section(prefix + ".valid"),
+        )
+
+    def __len__(self):
+        return len(self.commands)
+
+    def __contains__(self, command_name):
+        return _find_sorted(self.commands, self._command_order, command_name) >= 0
+
+    def find_command(self, command_name):
+        """Return the row id of a command, or -1 if unknown."""
+        return _find_sorted(self.commands, self._command_order, command_name)
+
+    def get_command_details(self, command_name):
+        """
+        Get detailed information for a specific command.
+
+        Args:
+            command_name (str): Name of the command to look up
+
+        Returns:
+            tuple: (hex_code, description, param_details), with the same
+                layout as CommandCatalog.get_command_details()
+
+        Raises:
+            KeyError: If the command is not in the catalog
+        """
+        row = self.find_command(command_name)
+        if row < 0:
+            raise KeyError(command_name)
+
+        param_details = []
+        for pid, param_row in self._param_rows(row):
+            if param_row < 0:
+                param_details.append({
+                    "name": pid,
+                    "type": "unknown",
+                    "range": None,
+                    "enum_values": None
+                })
+                continue
+
+            param_type = self._param_types[param_row]
+            enum_set = self._param_enum_sets[param_row]
+            enum_values = None
+            if param_type == "enum" and enum_set is not None:
+                enum_values = self.enum_values(enum_set)
+
+            param_details.append({
+                "name": pid,
+                "type": param_type,
+                "range": self._param_ranges[param_row],
+                "enum_values": enum_values
+            })
+
+        return self.hex_codes[row], self.descriptions[row], param_details
+
+    def _param_rows(self, row):
+        """(name, parameter row or -1) of each parameter of a command row."""
+        params_str = self._params_strs[row]
+        if params_str is None or params_str.strip() == "":
+            return []
+        return [
+            (pid, _find_sorted(self._param_ids, self._param_order, pid))
+            for pid in (p.strip() for p in params_str.split(","))
+        ]
+
+    def param_specs(self, row):
+        """
+        ParamSpec of each parameter of a command row, in Params order, as
+        CommandCatalog.param_specs() returns them. Imports catalog_tables
+        (and with it pandas) on first use.
+
+        Args:
+            row (int): Row id, e.g. from find_command()
+
+        Returns:
+            list: catalog_tables.ParamSpec records
+        """
+        from catalog_tables import UNKNOWN_TYPE, ParamSpec
+
+        return [
+            ParamSpec(pid, UNKNOWN_TYPE, None, None) if param_row < 0 else
+            ParamSpec(pid, self._param_types[param_row], self._param_ranges[param_row],
+                      self._param_enum_sets[param_row])
+            for pid, param_row in self._param_rows(row)
+        ]
+
+    def _enum_rows(self, enum_set):
+        """Rows of an enum set's values in file order, empty if unknown."""
+        order = range(len(self._enum_sets))
+        i = _find_sorted(self._enum_sets, order, enum_set)
+        if i < 0:
+            return []
+        start, stop = self._enum_set_offsets[i], self._enum_set_offsets[i + 1]
+        return self._enum_order[start:stop]
+
+    def enum_values(self, enum_set):
+        """
+        Return the {str(value): label} mapping of an enum set.
+
+        Args:
+            enum_set (str): EnumSet name
+
+        Returns:
+            dict: Values in file order, or None for an unknown set
+        """
+        return {
+            str(self._enum_values[r]): self._enum_labels[r] for r in self._enum_rows(enum_set)
+        } or None
+
+    def enum_codec(self, enum_set):
+        """
+        Vectorized value <-> label tables of an enum set, as
+        CommandCatalog.enum_codec() returns them. Imports catalog_tables
+        (and with it pandas) on first use.
+
+        Args:
+            enum_set (str): EnumSet name
+
+        Returns:
+            EnumCodec: Codec of the set
+
+        Raises:
+            KeyError: If the EnumSet has no values
+        """
+        from catalog_tables import EnumCodec
+
+        rows = self._enum_rows(enum_set)
+        if not len(rows):
+            raise KeyError(f"Unknown enum set: {enum_set}")
+        return EnumCodec(enum_set, [self._enum_values[r] for r in rows],
+                         [self._enum_labels[r] for r in rows])
+
+    @property
+    def search_index(self):
+        """SearchIndex over the mapped trigram arrays (imports NumPy)."""
+        if self._search_index is None:
+            from search_index import SearchIndex
+
+            self._search_index = SearchIndex.from_arrays(
+                self.section("search.heap"),
+                self.array("search.row_starts"),
+                self.array("search.byte_counts"),
+                self.array("search.keys"),
+                self.array("search.offsets"),
+                self.array("search.postings"),
+            )
+        return self._search_index
+
+    @property
+    def fuzzy_searcher(self):
+        """FuzzySearcher over search_index, built on first use."""
+        if self._fuzzy_searcher is None:
+            from fuzzy_search import FuzzySearcher
+
+            self._fuzzy_searcher = FuzzySearcher(self.commands, self.search_index)
+        return self._fuzzy_searcher
+
+    @property
+    def command_names(self):
+        """Command of each row, by row id (same as commands)."""
+        return self.commands
+
+    @property
+    def display_strings(self):
+        """"Command - Description" label of each row, by row id."""
+        return _DisplayStrings(self.commands, self.descriptions)
+
+    def search_rows(self, query):
+        """
+        Find rows whose Command or Description contains the query.
+
+        Args:
+            query (str): Search text, case-insensitive; empty returns all rows
+
+        Returns:
+            ndarray: Ascending row ids; resolve them with commands[row] etc.
+        """
+        return self.search_index.search(query)
+
+    def search(self, query):
+        """Same as search_rows()."""
+        return self.search_rows(query)
+
+    def fuzzy_search(self, query, limit=10, **kwargs):
+        """
+        Rank commands by similarity to a query that may contain typos.
+
+        Args:
+            query (str): Search text
+            limit (int): Maximum number of results
+            **kwargs: time_budget / min_score, see FuzzySearcher.search()
+
+        Returns:
+            list: FuzzyMatch(row, command, score) tuples, best first
+        """
+        return self.fuzzy_searcher.search(query, limit=limit, **kwargs)
+
+
+def fingerprint_to_json(fingerprint):
+    """Convert a data_fingerprint() tuple to JSON-friendly lists."""
+    return [list(entry) for entry in fingerprint]
+
+
+def json_to_fingerprint(value):
+    """Inverse of fingerprint_to_json()."""
+    return tuple(tuple(entry) for entry in value)
+
+
+def read_mapped_fingerprint(path):
+    """
+    Read the CSV fingerprint stored in a mapped catalog file.
+
+    Args:
+        path (str): Mapped catalog file
+
+    Returns:
+        tuple: The stored fingerprint, or None if the file is missing or
+            not a mapped catalog of this version
+    """
+    try:
+        with open(path, "rb") as f:
+            preamble = f.read(_PREAMBLE.size)
+            if len(preamble) != _PREAMBLE.size:
+                return None
+            magic, version, header_len = _PREAMBLE.unpack(preamble)
+            if magic != MAPPED_MAGIC or version != MAPPED_VERSION:
+                return None
+            header = json.loads(f.read(header_len))
+    except (OSError, ValueError):
+        return None
+    return json_to_fingerprint(header["fingerprint"])
+
+
+def _encode_strings(values):
+    """Encode a sequence of str / missing values as lengths, heap and valid."""
+    import numpy as np
+
+    encoded = [v.encode("utf-8") if isinstance(v, str) else b"" for v in values]
+    valid = np.fromiter((isinstance(v, str) for v in values), dtype=np.uint8,
+                        count=len(encoded))
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    return lengths, b"".join(encoded), valid
+
+
+def _group_starts(sorted_values):
+    """Index of the first element of each run of equal values."""
+    import numpy as np
+
+    if len(sorted_values) == 0:
+        return np.empty(0, dtype=np.int64)
+    return np.flatnonzero(np.concatenate(
+        ([True], sorted_values[1:] != sorted_values[:-1])
+    ))
+
+
+class _Spill:
+    """Append-only temporary file holding one fixed-width section."""
+
+    def __init__(self, path, dtype):
+        import numpy as np
+
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.count = 0
+        self._file = open(path, "wb")
+
+    def append(self, values):
+        """Append an array, or raw bytes for uint8 sections."""
+        if not isinstance(values, bytes):
+            values = memoryview(values.astype(self.dtype, copy=False)).cast("B")
+        self._file.write(values)
+        self.count += len(values) // self.dtype.itemsize
+
+    def close(self):
+        self._file.close()
+
+    def read(self, start=0, stop=None):
+        """Read elements [start, stop) back from the closed file."""
+        import numpy as np
+
+        stop = self.count if stop is None else stop
+        return np.fromfile(self.path, dtype=self.dtype, count=stop - start,
+                           offset=start * self.dtype.itemsize)
+
+
+class _StringSpill:
+    """A string column spilled as offsets / heap / valid sections."""
+
+    def __init__(self, directory, prefix):
+        import numpy as np
+
+        self.offsets = _Spill(os.path.join(directory, prefix + ".offsets"), np.int64)
+        self.heap = _Spill(os.path.join(directory, prefix + ".heap"), np.uint8)
+        self.valid = _Spill(os.path.join(directory, prefix + ".valid"), np.uint8)
+        self.offsets.append(np.zeros(1, dtype=np.int64))
+        self.max_len = 0
+
+    def __len__(self):
+        return self.valid.count
+
+    def append(self, values):
+        import numpy as np
+
+        lengths, heap, valid = _encode_strings(values)
+        if len(lengths):
+            self.max_len = max(self.max_len, int(lengths.max()))
+        self.offsets.append(self.heap.count + np.cumsum(lengths))
+        self.heap.append(heap)
+        self.valid.append(valid)
+
+    def sorted_keys(self, block_rows):
+        """
+        Sort the column by UTF-8 value.
+
+        Values are compared as fixed-width byte strings, so this holds
+        len(column) x longest-value bytes rather than one object per row.
+
+        Returns:
+            tuple: (order, keys) - stable row permutation and sorted values
+        """
+        import numpy as np
+
+        for spill in (self.offsets, self.heap, self.valid):
+            spill.close()
+        offsets = self.offsets.read()
+        keys = np.empty(len(self), dtype=f"S{max(1, self.max_len)}")
+        for start in range(0, len(self), block_rows):
+            stop = min(start + block_rows, len(self))
+            bounds = (offsets[start:stop + 1] - offsets[start]).tolist()
+            block = self.heap.read(offsets[start], offsets[stop]).tobytes()
+            keys[start:stop] = [block[a:b] for a, b in zip(bounds, bounds[1:])]
+        order = np.argsort(keys, kind="stable")
+        return order.astype(np.uint32), keys[order]
+
+    def sections(self, prefix):
+        return {
+            prefix + ".offsets": self.offsets,
+            prefix + ".heap": self.heap,
+            prefix + ".valid": self.valid,
+        }
+
+
+class MappedCatalogBuilder:
+    """
+    Streaming writer for the memory-mapped catalog layout.
+
+    Feed chunks of each CSV in file order to add_commands(), add_params()
+    and add_enums(), then call finish(). Every chunk is encoded straight
+    into temporary section files next to the output and can be dropped by
+    the caller; trigram postings are spilled as one sorted run per chunk
+    and merged window by window at the end.
+
+    finish() holds the sorted name keys of one column at a time, the
+    distinct trigram keys and one postings window in memory; everything
+    else stays on disk.
+
+    Args:
+        path (str): Output file path
+        block_rows (int): Rows decoded per block while sorting names
+    """
+
+    def __init__(self, path, block_rows=100_000):
+        import tempfile
+
+        import numpy as np
+
+        if sys.byteorder != "little":
+            raise ValueError("Mapped catalogs are only supported on little-endian hosts")
+
+        self.path = path
+        self.block_rows = block_rows
+        self._tmp = tempfile.TemporaryDirectory(
+            prefix=".cmap-", dir=os.path.dirname(os.path.abspath(path))
+        )
+        tmp = self._tmp.name
+
+        self._cmd = {col: _StringSpill(tmp, "cmd." + col)
+                     for col in ("name", "hex", "desc", "params")}
+        self._param = {col: _StringSpill(tmp, "param." + col)
+                       for col in ("id", "type", "range", "enum_set")}
+        self._enum_sets = _StringSpill(tmp, "enum.set")
+        self._enum_values = _Spill(os.path.join(tmp, "enum.value"), np.int64)
+        self._enum_labels = _StringSpill(tmp, "enum.label")
+
+        self._search_heap = _Spill(os.path.join(tmp, "search.heap"), np.uint8)
+        self._row_starts = _Spill(os.path.join(tmp, "search.row_starts"), np.int64)
+        self._row_starts.append(np.zeros(1, dtype=np.int64))
+        self._byte_counts = np.zeros(256, dtype=np.int64)
+        self._runs = []
+
+    def add_commands(self, chunk):
+        """Append a DataFrame chunk of master_commands rows."""
+        import numpy as np
+
+        from search_index import _block_pairs, _lower_texts
+
+        commands = chunk['Command'].to_numpy()
+        descriptions = chunk['Description'].to_numpy()
+        row_offset = len(self._cmd["name"])
+        self._cmd["name"].append(commands)
+        self._cmd["hex"].append(chunk['HexCode'].to_numpy())
+        self._cmd["desc"].append(descriptions)
+        self._cmd["params"].append(chunk['Params'].to_numpy())
+
+        # Same row text and trigram pairs as SearchIndex
+        heap = "".join(
+            f"{cmd}\0{desc}\0" for cmd, desc in
+            zip(_lower_texts(commands), _lower_texts(descriptions))
+        ).encode("utf-8")
+        data = np.frombuffer(heap, dtype=np.uint8)
+        row_ends = np.flatnonzero(data == 0)[1::2] + 1
+        self._row_starts.append(self._search_heap.count + row_ends)
+        self._search_heap.append(heap)
+        self._byte_counts += np.bincount(data, minlength=256)
+
+        run = _Spill(os.path.join(self._tmp.name, f"run.{len(self._runs)}"), np.uint64)
+        run.append(_block_pairs(data, row_offset))
+        self._runs.append(run)
+
+    def add_params(self, chunk):
+        """Append a DataFrame chunk of parameter_metadata rows."""
+        self._param["id"].append(chunk['ParamID'].to_numpy())
+        self._param["type"].append(chunk['Type'].to_numpy())
+        self._param["range"].append(chunk['Range'].to_numpy())
+        self._param["enum_set"].append(chunk['EnumSet'].to_numpy())
+
+    def add_enums(self, chunk):
+        """Append a DataFrame chunk of enum_definitions rows."""
+        self._enum_sets.append(chunk['EnumSet'].to_numpy())
+        self._enum_values.append(chunk['Value'].to_numpy())
+        self._enum_labels.append(chunk['Label'].to_numpy())
+
+    def _posting_layout(self):
+        """
+        Merge per-run trigram counts into the final keys / offsets.
+
+        Also records, per run, its distinct keys and where each starts, so
+        _write_postings() can read just the slice of a run it needs.
+
+        Returns:
+            tuple: (keys, offsets) with the layout of SearchIndex
+        """
+        import numpy as np
+
+        self._run_groups = []
+        for run in self._runs:
+            run.close()
+            keys = (run.read() >> np.uint64(32)).astype(np.uint32)
+            starts = _group_starts(keys)
+            self._run_groups.append((keys[starts], np.append(starts, len(keys))))
+
+        all_keys = np.concatenate([np.empty(0, dtype=np.uint32)]
+                                  + [keys for keys, _ in self._run_groups])
+        all_counts = np.concatenate([np.empty(0, dtype=np.int64)]
+                                    + [np.diff(bounds) for _, bounds in self._run_groups])
+        order = np.argsort(all_keys, kind="stable")
+        all_keys, all_counts = all_keys[order], all_counts[order]
+        starts = _group_starts(all_keys)
+        counts = np.add.reduceat(all_counts, starts) if len(starts) else all_counts
+        offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        return all_keys[starts], offsets
+
+    def _write_postings(self, f, keys, offsets):
+        """
+        Write the merged postings, one bounded window of keys at a time.
+
+        Each window gathers its keys' slices from every run in row order;
+        runs are sorted by (key, row), so posting lists come out ascending.
+        """
+        import numpy as np
+
+        window_start = 0
+        while window_start < len(keys):
+            window_stop = max(window_start + 1, int(np.searchsorted(
+                offsets, offsets[window_start] + _POSTINGS_WINDOW, side="right"
+            )) - 1)
+            window_keys = keys[window_start:window_stop]
+            base = offsets[window_start]
+            out = np.empty(offsets[window_stop] - base, dtype=np.uint32)
+            cursor = offsets[window_start:window_stop] - base
+
+            for run, (run_keys, bounds) in zip(self._runs, self._run_groups):
+                a = np.searchsorted(run_keys, window_keys[0])
+                b = np.searchsorted(run_keys, window_keys[-1], side="right")
+                if a == b:
+                    continue
+                pairs = run.read(bounds[a], bounds[b])
+                counts = np.diff(bounds[a:b + 1])
+                slots = np.searchsorted(window_keys, run_keys[a:b])
+                positions = np.repeat(cursor[slots] - (bounds[a:b] - bounds[a]), counts)
+                out[positions + np.arange(len(pairs))] = pairs & np.uint64(0xFFFFFFFF)
+                cursor[slots] += counts
+
+            f.write(memoryview(out).cast("B"))
+            window_start = window_stop
+
+    def _enum_sections(self):
+        """Sorted enum set names and the by-set permutation of enum rows."""
+        import numpy as np
+
+        order, keys = self._enum_sets.sorted_keys(self.block_rows)
+        starts = _group_starts(keys)
+        names = [k.decode("utf-8") for k in keys[starts]]
+        lengths, heap, valid = _encode_strings(names)
+        return {
+            "enum_set.name.offsets": np.concatenate(([0], np.cumsum(lengths))).astype(np.int64),
+            "enum_set.name.heap": np.frombuffer(heap, dtype=np.uint8),
+            "enum_set.name.valid": valid,
+            "enum_set.offsets": np.append(starts, len(keys)).astype(np.int64),
+            "enum.order": order,
+        }
+
+    def finish(self, fingerprint):
+        """
+        Assemble the final file and rename it into place.
+
+        Processes that already mapped an older file keep a consistent view.
+
+        Args:
+            fingerprint (tuple): Fingerprint of the CSV files behind the data
+        """
+        import shutil
+
+        import numpy as np
+
+        try:
+            sections = {}
+            for col, spill in self._cmd.items():
+                sections.update(spill.sections("cmd." + col))
+            sections["cmd.order"] = self._cmd["name"].sorted_keys(self.block_rows)[0]
+            for col, spill in self._param.items():
+                sections.update(spill.sections("param." + col))
+            sections["param.order"] = self._param["id"].sorted_keys(self.block_rows)[0]
+            sections.update(self._enum_sections())
+            sections["enum.value"] = self._enum_values
+            sections.update(self._enum_labels.sections("enum.label"))
+
+            keys, offsets = self._posting_layout()
+            sections["search.heap"] = self._search_heap
+            sections["search.row_starts"] = self._row_starts
+            sections["search.byte_counts"] = self._byte_counts
+            sections["search.keys"] = keys
+            sections["search.offsets"] = offsets
+            # Merged from the runs while writing
+            sections["search.postings"] = None
+
+            typecodes = {np.dtype(np.int64): "q", np.dtype(np.uint32): "I",
+                         np.dtype(np.uint8): "B"}
+            layout = {}
+            for name, value in sections.items():
+                if value is None:
+                    layout[name] = [0, "I", int(offsets[-1])]
+                elif isinstance(value, _Spill):
+                    value.close()
+                    layout[name] = [0, typecodes[value.dtype], value.count]
+                else:
+                    layout[name] = [0, typecodes[value.dtype], len(value)]
+
+            # Lay out sections after a header sized for the final offsets
+            header = {"fingerprint": fingerprint_to_json(fingerprint), "sections": layout}
+            while True:
+                header_bytes = json.dumps(header).encode("utf-8")
+                position = _PREAMBLE.size + len(header_bytes)
+                changed = False
+                for name, (offset, typecode, count) in layout.items():
+                    position = -(-position // _ALIGN) * _ALIGN
+                    if offset != position:
+                        layout[name][0] = position
+                        changed = True
+                    position += count * struct.calcsize(typecode)
+                if not changed:
+                    break
+
+            tmp_path = os.path.join(self._tmp.name, "catalog.cmap")
+            with open(tmp_path, "wb") as f:
+                f.write(_PREAMBLE.pack(MAPPED_MAGIC, MAPPED_VERSION, len(header_bytes)))
+                f.write(header_bytes)
+                for name, value in sections.items():
+                    f.write(b"\0" * (layout[name][0] - f.tell()))
+                    if value is None:
+                        self._write_postings(f, keys, offsets)
+                    elif isinstance(value, _Spill):
+                        with open(value.path, "rb") as src:
+                            shutil.copyfileobj(src, f)
+                    else:
+                        f.write(memoryview(np.ascontiguousarray(value)).cast("B"))
+            os.replace(tmp_path, self.path)
+        finally:
+            self._tmp.cleanup()
+
+
+def write_mapped_catalog(path, catalog, fingerprint):
+    """
+    Write an in-memory CommandCatalog in the memory-mapped layout.
+
+    Args:
+        path (str): Output file path
+        catalog (CommandCatalog): Catalog to serialize
+        fingerprint (tuple): Fingerprint of the CSV files behind the catalog
+    """
+    builder = MappedCatalogBuilder(path)
+    builder.add_commands(catalog.commands_df)
+    builder.add_params(catalog.params_df)
+    builder.add_enums(catalog.enums_df)
+    builder.finish(fingerprint)
@@ -0,0 +1,298 @@
+"""
+Latency and Cache Metrics
+
+Process-wide counters, gauges and histograms for the load, search and
+details paths, exported in the Prometheus text format (version 0.0.4).
+Standard library only, and cheap enough to stay on in production: an
+observation is one lock and a bisect.
+
+Exporters:
+- server.py serves the registry at GET /metrics
+- app.py writes it to the file named by the COMMAND_SEARCH_METRICS_FILE
+  environment variable after every rerun (e.g. for the node_exporter
+  textfile collector, or a sidecar that scrapes a shared volume)
+
+Metrics:
+    command_search_stage_seconds{stage}        histogram, per-stage latency
+    command_search_cache_lookups_total{result} counter, catalog cache hit / miss
+    command_search_catalog_builds_total{source} counter, snapshot / csv / reload
+    command_search_response_cache_lookups_total{result} counter, server.py responses
+    command_search_search_results              histogram, result-set sizes
+    command_search_catalog_bytes               gauge, memory held by the catalog
+    command_search_process_resident_bytes      gauge, resident set size
+"""
+
+import bisect
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+# Environment variable naming the file app.py exports to
+METRICS_FILE_ENV = "COMMAND_SEARCH_METRICS_FILE"
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+SIZE_BUCKETS = (0, 1, 10, 50, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+logger = logging.getLogger(__name__)
+
+_registry = []
+_registry_lock = threading.Lock()
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", r"\\").replace('"', r'\"'))
+        for name, value in pairs
+    )
+    return "{" + body + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+        with _registry_lock:
+            _registry.append(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(labels[name] for name in self.labelnames)
+
+    def _samples(self):
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, key, extra, value in self._samples():
+            labels = _format_labels(self.labelnames, key, extra)
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [("", key, (), value) for key, value in items]
+
+
+class Gauge(_Metric):
+    """Current value; either set explicitly or read from a function at export."""
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._function = None
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, function):
+        """Compute the (unlabelled) value at export time; None omits the sample."""
+        self._function = function
+
+    def _samples(self):
+        if self._function is not None:
+            value = self._function()
+            return [] if value is None else [("", (), (), value)]
+        with self._lock:
+            items = sorted(self._values.items())
+        return [("", key, (), value) for key, value in items]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram with sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, the last one for +Inf
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][i] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a with-block, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels):
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def _samples(self):
+        with self._lock:
+            items = sorted((key, (list(s[0]), s[1], s[2])) for key, s in self._values.items())
+        samples = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                samples.append(("_bucket", key, (("le", _format_value(bound)),), cumulative))
+            samples.append(("_sum", key, (), total))
+            samples.append(("_count", key, (), count))
+        return samples
+
+
+def render():
+    """
+    Export every registered metric.
+
+    Returns:
+        str: Prometheus text exposition format
+    """
+    with _registry_lock:
+        metrics = list(_registry)
+    return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+def write_textfile(path):
+    """
+    Write the exposition to a file atomically (write, then rename).
+
+    Each call writes its own temporary file, so concurrent writers (e.g.
+    Streamlit sessions, which are threads of one process) never share
+    one; the last rename wins.
+
+    Args:
+        path (str): Destination, e.g. a node_exporter textfile directory
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".",
+                                    prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        # mkstemp creates the file owner-only; the collector may run as
+        # another user
+        os.fchmod(fd, 0o644)
+        with open(fd, "w") as f:
+            f.write(render())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def export_from_env():
+    """
+    Write the metrics file if COMMAND_SEARCH_METRICS_FILE is set.
+
+    Called after every rerun, so a failed export is logged rather than
+    raised into the page.
+    """
+    path = os.environ.get(METRICS_FILE_ENV)
+    if path:
+        try:
+            write_textfile(path)
+        except OSError:
+            logger.exception("Could not write metrics file %s", path)
+
+
+def resident_bytes():
+    """Current resident set size of this process, or None if unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current, in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+STAGE_SECONDS = Histogram(
+    "command_search_stage_seconds",
+    "Time spent per stage (build, load, search, options, details, render).",
+    ["stage"],
+)
+
+CACHE_LOOKUPS = Counter(
+    "command_search_cache_lookups_total",
+    "Catalog cache lookups by result (hit, miss).",
+    ["result"],
+)
+
+RESPONSE_CACHE_LOOKUPS = Counter(
+    "command_search_response_cache_lookups_total",
+    "HTTP response cache lookups by result (hit, miss, not_modified).",
+    ["result"],
+)
+
+CATALOG_BUILDS = Counter(
+    "command_search_catalog_builds_total",
+    "Catalogs built, by source (snapshot, csv, reload).",
+    ["source"],
+)
+
+SEARCH_RESULTS = Histogram(
+    "command_search_search_results",
+    "Number of commands matched per search.",
+    buckets=SIZE_BUCKETS,
+)
+
+CATALOG_BYTES = Gauge(
+    "command_search_catalog_bytes",
+    "Approximate memory held by the current catalog (DataFrames and indexes).",
+)
+
+RESIDENT_BYTES = Gauge(
+    "command_search_process_resident_bytes",
+    "Resident set size of the process.",
+)
+RESIDENT_BYTES.set_function(resident_bytes)
@@ -0,0 +1,191 @@
+"""
+Opt-in Profiling of Streamlit Reruns
+
+Wraps sampled app.py script runs in cProfile and tracemalloc and writes one
+profile per profiled rerun to a rotating directory, so a "the page is slow"
+report can be matched with what that rerun actually did.
+
+Off unless COMMAND_SEARCH_PROFILE_DIR is set. Then:
+- a random COMMAND_SEARCH_PROFILE_SAMPLE share of reruns is profiled
+  (default 0.01, so one replica can keep it on)
+- adding ?profile=1 to the page URL profiles every rerun of that session
+- only the newest COMMAND_SEARCH_PROFILE_KEEP profiles are kept (default 200)
+
+Each profiled rerun writes two files named <UTC time>-<pid>-<seq>:
+- .prof: cProfile stats, for pstats / snakeviz
+- .txt:  wall time, peak traced memory, the slowest functions by
+         cumulative time and the top allocation sites
+
+Only one rerun is profiled at a time; others that are sampled meanwhile
+run unprofiled. tracemalloc is process-wide, so allocation sites may
+include work done by concurrent sessions.
+"""
+
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+import warnings
+
+PROFILE_DIR_ENV = "COMMAND_SEARCH_PROFILE_DIR"
+PROFILE_SAMPLE_ENV = "COMMAND_SEARCH_PROFILE_SAMPLE"
+PROFILE_KEEP_ENV = "COMMAND_SEARCH_PROFILE_KEEP"
+
+# Query parameter that forces profiling of a session's reruns
+PROFILE_QUERY_PARAM = "profile"
+
+DEFAULT_SAMPLE = 0.01
+DEFAULT_KEEP = 200
+
+# Rows of the text report
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 25
+
+_active = threading.Lock()
+_sequence = itertools.count()
+
+
+def _settings():
+    """Return (directory, sample, keep) from the environment, or None if off."""
+    directory = os.environ.get(PROFILE_DIR_ENV)
+    if not directory:
+        return None
+    try:
+        sample = float(os.environ.get(PROFILE_SAMPLE_ENV, DEFAULT_SAMPLE))
+        keep = int(os.environ.get(PROFILE_KEEP_ENV, DEFAULT_KEEP))
+    except ValueError:
+        sample, keep = DEFAULT_SAMPLE, DEFAULT_KEEP
+    return directory, sample, max(1, keep)
+
+
+class RerunProfile:
+    """
+    One profiled script run.
+
+    Args:
+        directory (str): Output directory
+        keep (int): Number of profiles to keep in it
+    """
+
+    def __init__(self, directory, keep):
+        self.directory = directory
+        self.keep = keep
+        self.path = None
+        self._profiler = cProfile.Profile()
+        self._started_tracing = False
+        self._start = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(1)
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        self._profiler.enable()
+
+    def stop(self):
+        """Stop profiling and write the report; returns the .txt path."""
+        self._profiler.disable()
+        elapsed = time.perf_counter() - self._start
+        _, peak = tracemalloc.get_traced_memory()
+        allocations = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        )).statistics("lineno")
+        if self._started_tracing:
+            tracemalloc.stop()
+
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+        base = os.path.join(self.directory, f"{stamp}-{os.getpid()}-{next(_sequence):06d}")
+        self._profiler.dump_stats(base + ".prof")
+
+        report = io.StringIO()
+        report.write(f"rerun: {elapsed * 1000:.1f} ms, peak traced memory "
+                     f"{peak / 2**20:.1f} MiB\n")
+        report.write(f"\nTop {TOP_FUNCTIONS} functions by cumulative time:\n")
+        stats = pstats.Stats(self._profiler, stream=report)
+        stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        report.write(f"Top {TOP_ALLOCATIONS} allocation sites:\n")
+        for stat in allocations[:TOP_ALLOCATIONS]:
+            report.write(f"{stat}\n")
+        with open(base + ".txt", "w") as f:
+            f.write(report.getvalue())
+
+        self.path = base + ".txt"
+        rotate(self.directory, self.keep)
+        return self.path
+
+
+def rotate(directory, keep):
+    """
+    Delete all but the newest ``keep`` profiles (.prof and .txt pairs).
+
+    Args:
+        directory (str): Profile directory
+        keep (int): Number of profiles to keep
+    """
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return
+    bases = sorted({name.rsplit(".", 1)[0] for name in names
+                    if name.endswith((".prof", ".txt"))})
+    for base in bases[:-keep]:
+        for suffix in (".prof", ".txt"):
+            try:
+                os.remove(os.path.join(directory, base + suffix))
+            except FileNotFoundError:
+                pass
+
+
+def start_rerun(force=False):
+    """
+    Start profiling this rerun if it is enabled and sampled.
+
+    Args:
+        force (bool): Profile regardless of the sample rate (?profile=1)
+
+    Returns:
+        RerunProfile: Running profile to pass to finish_rerun(), or None
+    """
+    settings = _settings()
+    if settings is None:
+        return None
+    directory, sample, keep = settings
+    if not force and random.random() >= sample:
+        return None
+    if not _active.acquire(blocking=False):
+        return None
+    profile = RerunProfile(directory, keep)
+    try:
+        profile.start()
+    except BaseException:
+        _active.release()
+        raise
+    return profile
+
+
+def finish_rerun(profile):
+    """
+    Stop a profile from start_rerun() and write it; None is ignored.
+
+    An unwritable profile directory only costs a warning, never the page.
+
+    Returns:
+        str: Path of the text report, or None
+    """
+    if profile is None:
+        return None
+    try:
+        return profile.stop()
+    except OSError as e:
+        warnings.warn(f"Could not write rerun profile to {profile.directory}: {e}")
+        return None
+    finally:
+        _active.release()
@@ -0,0 +1,130 @@
+"""
+Fast-Start Command Lookup
+
+``python data_loader.py CMD_SET_MODE`` is often run once per command from
+shell scripts, so its start-up time is the lookup time. Importing pandas
+and NumPy costs far more than finding one command, so single lookups are
+answered here first: the command line is parsed by hand (no argparse),
+and the command is read straight from the memory-mapped catalog
+(command_catalog.cmap) when its fingerprint matches the CSVs. Only the
+standard library is imported.
+
+When the mapped catalog is missing or stale, or the command line asks
+for anything else (--batch, --help, the interactive prompt), main()
+returns False and data_loader.py carries on with its full CLI, which
+rebuilds the mapped catalog for the next call.
+"""
+
+import os
+import sys
+
+from catalog_files import MAPPED_FILE, data_fingerprint
+from mapped_catalog import MappedCatalog, read_mapped_fingerprint
+
+
+def parse_lookup_args(argv):
+    """
+    Parse a single-lookup command line without argparse.
+
+    Accepts ``COMMAND``, optionally with ``--data-dir DIR`` (or
+    ``--data-dir=DIR``) before or after it.
+
+    Args:
+        argv (list): Arguments, without the program name
+
+    Returns:
+        tuple: (command_name, data_dir), or None if the command line is
+            anything else
+    """
+    command_name, data_dir = None, "."
+    args = iter(argv)
+    for arg in args:
+        if arg == "--data-dir":
+            data_dir = next(args, None)
+            if data_dir is None:
+                return None
+        elif arg.startswith("--data-dir="):
+            data_dir = arg[len("--data-dir="):]
+        elif arg.startswith("-") or command_name is not None:
+            return None
+        else:
+            command_name = arg
+    if command_name is None:
+        return None
+    return command_name, data_dir
+
+
+def open_mapped_catalog(data_dir="."):
+    """
+    Open the mapped catalog of a data directory if it is up to date.
+
+    Unlike data_loader.load_mapped_catalog(), never builds it.
+
+    Args:
+        data_dir (str): Directory containing the CSV files
+
+    Returns:
+        MappedCatalog: The catalog, or None if it is missing, stale or
+            unreadable
+    """
+    try:
+        fingerprint = data_fingerprint(data_dir)
+    except FileNotFoundError:
+        return None
+    path = os.path.join(data_dir, MAPPED_FILE)
+    if read_mapped_fingerprint(path) != fingerprint:
+        return None
+    try:
+        return MappedCatalog(path)
+    except (OSError, ValueError):
+        return None
+
+
+def print_command_details(catalog, command_name):
+    """
+    Print one command's details as text, or that it wasn't found.
+
+    Args:
+        catalog: CommandCatalog or MappedCatalog
+        command_name (str): Name of the command to look up
+    """
+    if command_name not in catalog:
+        print(f"Command '{command_name}' not found")
+        return
+
+    hex_code, description, param_details = catalog.get_command_details(command_name)
+
+    print(f"\nCommand: {command_name}")
+    print(f"Hex Code: {hex_code}")
+    print(f"Description: {description}")
+
+    if param_details:
+        print("\nParameters:")
+        for param in param_details:
+            print(f"  - {param['name']} ({param['type']})")
+            if param['enum_values']:
+                for value, label in param['enum_values'].items():
+                    print(f"    {value}: {label}")
+
+
+def main(argv=None):
+    """
+    Answer a single lookup from the mapped catalog, if possible.
+
+    Args:
+        argv (list): Arguments, without the program name (default:
+            sys.argv[1:])
+
+    Returns:
+        bool: True if the lookup was answered, False if the full CLI
+            must handle this command line
+    """
+    parsed = parse_lookup_args(sys.argv[1:] if argv is None else argv)
+    if parsed is None:
+        return False
+    command_name, data_dir = parsed
+    catalog = open_mapped_catalog(data_dir)
+    if catalog is None:
+        return False
+    print_command_details(catalog, command_name)
+    return True
@@ -0,0 +1,382 @@
+"""
+Inverted Trigram Index for Command Search
+
+Replaces the per-keystroke ``str.contains`` scan in app.py with a prebuilt
+inverted index. Every lowercase byte trigram of the Command and Description
+columns points to a sorted posting list of row ids; a query resolves by
+intersecting the posting lists of its own trigrams and then verifying the
+(usually tiny) candidate set with a plain substring check.
+
+Matching semantics are those of the original filter:
+    commands_df['Command'].str.contains(query, case=False) |
+    commands_df['Description'].str.contains(query, case=False)
+with the query taken literally (no regex), so multi-word queries such as
+"data recording" still match as one phrase.
+
+Storage is CSR-style NumPy arrays (sorted trigram keys, offsets, postings)
+so the index is compact and cheap to persist or share.
+"""
+
+import numpy as np
+
+# Trigrams are taken over UTF-8 bytes, packed into one integer key
+GRAM_SIZE = 3
+
+# Rows processed per block while building; bounds temporary memory
+_BUILD_BLOCK_ROWS = 100_000
+
+# Above 1/_SCAN_FRACTION of all rows, candidates are verified with one
+# pass over the heap instead of row by row
+_SCAN_FRACTION = 16
+
+# Above 1/_PATCH_FRACTION of all rows added or changed, patched() rebuilds
+_PATCH_FRACTION = 8
+
+
+def _lower_texts(values):
+    """Lowercase a column of strings, mapping missing values to ''."""
+    return [
+        value.lower().replace("\0", "") if isinstance(value, str) else ""
+        for value in values
+    ]
+
+
+def _sorted_unique(values):
+    """np.unique for large integer arrays, via an in-place sort."""
+    values = np.sort(values)
+    if len(values) == 0:
+        return values
+    keep = np.empty(len(values), dtype=bool)
+    keep[0] = True
+    np.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+
+def _gram_keys(data):
+    """
+    Pack every trigram of a uint8 array into a uint32 key.
+
+    Args:
+        data (ndarray): uint8 byte array
+
+    Returns:
+        ndarray: uint32 keys, one per trigram start position
+    """
+    data = data.astype(np.uint32)
+    return (data[:-2] << 16) | (data[1:-1] << 8) | data[2:]
+
+
+def query_gram_keys(query):
+    """
+    Return the unique trigram keys of an already-lowercased query.
+
+    Args:
+        query (str): Lowercase query text
+
+    Returns:
+        ndarray: Sorted unique uint32 keys (empty when query is too short)
+    """
+    data = np.frombuffer(query.encode("utf-8"), dtype=np.uint8)
+    if len(data) < GRAM_SIZE:
+        return np.empty(0, dtype=np.uint32)
+    return np.unique(_gram_keys(data))
+
+
+def _intersect(candidates, plist, size):
+    """
+    Intersect two ascending row id arrays.
+
+    Binary-searches the longer list when the candidate set is small, and
+    falls back to a dense bitmap when both lists are large.
+    """
+    if len(candidates) * 32 < len(plist):
+        pos = np.searchsorted(plist, candidates)
+        pos[pos == len(plist)] = 0
+        return candidates[plist[pos] == candidates]
+    bitmap = np.zeros(size, dtype=bool)
+    bitmap[plist] = True
+    return candidates[bitmap[candidates]]
+
+
+def _block_pairs(data, row_offset):
+    """
+    Build sorted unique (key << 32 | row) pairs for one block of the heap.
+
+    Trigrams that would span two fields (or two rows) contain a zero byte
+    and are dropped.
+    """
+    if len(data) < GRAM_SIZE:
+        return np.empty(0, dtype=np.uint64)
+
+    is_sep = data == 0
+    # Number of separators before each byte, two separators per row
+    rows = (np.cumsum(is_sep) - is_sep) // 2 + row_offset
+    valid = ~(is_sep[:-2] | is_sep[1:-1] | is_sep[2:])
+
+    keys = _gram_keys(data)[valid].astype(np.uint64)
+    pairs = (keys << np.uint64(32)) | rows[:-2][valid].astype(np.uint64)
+    return _sorted_unique(pairs)
+
+
+class SearchIndex:
+    """
+    Inverted trigram index over the Command and Description columns.
+
+    Args:
+        commands (iterable): Command names, in DataFrame row order
+        descriptions (iterable): Descriptions, in DataFrame row order
+
+    Attributes:
+        heap (bytes): Lowercase UTF-8 text, ``command\\0description\\0`` per row
+        row_starts (ndarray): Byte offset of each row in heap, plus the end
+        byte_counts (ndarray): Occurrences of each byte value in heap
+        keys (ndarray): Sorted unique uint32 trigram keys
+        offsets (ndarray): Posting list boundaries, len(keys) + 1 entries
+        postings (ndarray): uint32 row ids, ascending within each key
+
+    Every attribute may also be a read-only buffer view (e.g. over a
+    memory-mapped file); see from_arrays().
+    """
+
+    def __init__(self, commands, descriptions):
+        self.heap = "".join(
+            f"{cmd}\0{desc}\0" for cmd, desc in
+            zip(_lower_texts(commands), _lower_texts(descriptions))
+        ).encode("utf-8")
+        data = np.frombuffer(self.heap, dtype=np.uint8)
+        row_ends = np.flatnonzero(data == 0)[1::2] + 1
+        self.row_starts = np.concatenate(([0], row_ends)).astype(np.int64)
+        self.byte_counts = np.bincount(data, minlength=256)
+        self.keys, self.offsets, self.postings = self._build(data)
+
+    @classmethod
+    def from_arrays(cls, heap, row_starts, byte_counts, keys, offsets, postings):
+        """
+        Wrap prebuilt index arrays without rebuilding anything.
+
+        Args:
+            heap (buffer): Lowercase row text, as in the heap attribute
+            row_starts, byte_counts, keys, offsets, postings (ndarray):
+                Arrays with the layout of the matching attributes
+
+        Returns:
+            SearchIndex: Index backed by the given buffers
+        """
+        index = cls.__new__(cls)
+        index.heap = heap
+        index.row_starts = row_starts
+        index.byte_counts = byte_counts
+        index.keys = keys
+        index.offsets = offsets
+        index.postings = postings
+        return index
+
+    def __len__(self):
+        return len(self.row_starts) - 1
+
+    def _build(self, data):
+        blocks = []
+        for start in range(0, len(self), _BUILD_BLOCK_ROWS):
+            stop = min(start + _BUILD_BLOCK_ROWS, len(self))
+            block = data[self.row_starts[start]:self.row_starts[stop]]
+            blocks.append(_block_pairs(block, start))
+        pairs = np.concatenate(blocks) if blocks else np.empty(0, dtype=np.uint64)
+
+        # Blocks are already row-ordered, so a stable sort on the key keeps
+        # every posting list ascending by row id
+        all_keys = (pairs >> np.uint64(32)).astype(np.uint32)
+        del blocks
+        order = np.argsort(all_keys, kind="stable")
+        all_keys = all_keys[order]
+        postings = (pairs[order] & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+        if len(all_keys):
+            starts = np.flatnonzero(np.concatenate(([True], all_keys[1:] != all_keys[:-1])))
+        else:
+            starts = np.empty(0, dtype=np.int64)
+        keys = all_keys[starts]
+        offsets = np.append(starts, len(postings)).astype(np.int64)
+        return keys, offsets, postings
+
+    def patched(self, row_map, commands, descriptions):
+        """
+        Return a new index for an edited table, reusing this one's work.
+
+        Kept rows are renumbered and copied over, removed rows are dropped,
+        and only the remaining (added or changed) rows are tokenized. The
+        result is identical to building from scratch; this index is left
+        untouched, so readers of it are unaffected.
+
+        Args:
+            row_map (ndarray): New row id of each old row, or -1 if it was
+                removed or changed; kept rows must stay in the same order
+            commands (sequence): Command names of the new table, by row
+            descriptions (sequence): Descriptions of the new table, by row
+
+        Returns:
+            SearchIndex: Index over the new table
+        """
+        row_map = np.asarray(row_map, dtype=np.int64)
+        n_rows = len(commands)
+        kept = np.flatnonzero(row_map >= 0)
+        if np.any(np.diff(row_map[kept]) <= 0):
+            raise ValueError("row_map must keep rows in order")
+
+        source = np.full(n_rows, -1, dtype=np.int64)
+        source[row_map[kept]] = kept
+        new_rows = np.flatnonzero(source < 0)
+        if len(new_rows) * _PATCH_FRACTION > n_rows:
+            # Mostly new rows: tokenizing them all is the whole build anyway
+            return SearchIndex(commands, descriptions)
+
+        # Heap: copy runs of consecutive kept rows, lowercase the new ones
+        added_heap = "".join(
+            f"{cmd}\0{desc}\0" for cmd, desc in zip(
+                _lower_texts(commands[i] for i in new_rows.tolist()),
+                _lower_texts(descriptions[i] for i in new_rows.tolist()),
+            )
+        ).encode("utf-8")
+        added_data = np.frombuffer(added_heap, dtype=np.uint8)
+        added_ends = np.flatnonzero(added_data == 0)[1::2] + 1
+        added_starts = np.concatenate(([0], added_ends)).astype(np.int64)
+
+        breaks = np.flatnonzero(np.concatenate((
+            [True], (source[1:] < 0) | (source[1:] != source[:-1] + 1)
+        )))
+        parts = []
+        for start, stop in zip(breaks.tolist(), np.append(breaks[1:], n_rows).tolist()):
+            if source[start] >= 0:
+                old = source[start]
+                parts.append(self.heap[self.row_starts[old]:self.row_starts[old + stop - start]])
+            else:
+                first = np.searchsorted(new_rows, start)
+                parts.append(added_heap[added_starts[first]:added_starts[first + stop - start]])
+        heap = b"".join(bytes(part) for part in parts)
+        data = np.frombuffer(heap, dtype=np.uint8)
+        row_ends = np.flatnonzero(data == 0)[1::2] + 1
+
+        # Postings of kept rows, renumbered; order within each key survives
+        mapped = row_map.astype(np.int32)[self.postings]
+        dropped = np.flatnonzero(mapped < 0)
+        kept_postings = np.delete(mapped, dropped).view(np.uint32)
+        del mapped
+        # Dropped postings are few: shift each list's offsets by those before it
+        dropped_lists = np.searchsorted(self.offsets, dropped, side="right") - 1
+        dropped_before = np.concatenate(([0], np.cumsum(
+            np.bincount(dropped_lists, minlength=len(self.keys))
+        )))
+        kept_offsets = np.asarray(self.offsets, dtype=np.int64) - dropped_before
+        kept_counts = np.diff(kept_offsets)
+
+        # Postings of new rows, merged into their lists
+        pairs = _block_pairs(added_data, 0)
+        added_keys = (pairs >> np.uint64(32)).astype(np.uint32)
+        added_rows = new_rows[(pairs & np.uint64(0xFFFFFFFF)).astype(np.int64)].astype(np.uint32)
+        slots = np.searchsorted(self.keys, added_keys)
+        positions = kept_offsets[slots]
+        known = slots < len(self.keys)
+        known[known] = self.keys[slots[known]] == added_keys[known]
+        # Pairs are sorted by key, so each known key is one contiguous group
+        group_starts = np.flatnonzero(np.concatenate(
+            ([True], added_keys[1:] != added_keys[:-1])
+        )) if len(added_keys) else np.empty(0, dtype=np.int64)
+        for start, stop in zip(group_starts.tolist(),
+                               np.append(group_starts[1:], len(added_keys)).tolist()):
+            if known[start]:
+                slot = slots[start]
+                plist = kept_postings[kept_offsets[slot]:kept_offsets[slot + 1]]
+                positions[start:stop] += np.searchsorted(plist, added_rows[start:stop])
+        postings = np.insert(kept_postings, positions, added_rows)
+
+        all_keys = np.union1d(self.keys, added_keys).astype(np.uint32)
+        counts = np.zeros(len(all_keys), dtype=np.int64)
+        counts[np.searchsorted(all_keys, self.keys)] += kept_counts
+        np.add.at(counts, np.searchsorted(all_keys, added_keys), 1)
+        present = counts > 0
+
+        return SearchIndex.from_arrays(
+            heap,
+            np.concatenate(([0], row_ends)).astype(np.int64),
+            np.bincount(data, minlength=256),
+            all_keys[present],
+            np.concatenate(([0], np.cumsum(counts[present]))).astype(np.int64),
+            postings,
+        )
+
+    def posting_list(self, key):
+        """
+        Return the row ids containing a trigram key.
+
+        Args:
+            key (int): Packed trigram key
+
+        Returns:
+            ndarray: Ascending uint32 row ids (empty if the key is unknown)
+        """
+        i = np.searchsorted(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            return self.postings[:0]
+        return self.postings[self.offsets[i]:self.offsets[i + 1]]
+
+    def search(self, query):
+        """
+        Find rows whose Command or Description contains the query.
+
+        Args:
+            query (str): Search text, matched case-insensitively and literally
+
+        Returns:
+            ndarray: Ascending row ids of matching commands
+        """
+        query = query.lower()
+        if not query:
+            return np.arange(len(self), dtype=np.uint32)
+        if "\0" in query:
+            return np.empty(0, dtype=np.uint32)
+
+        keys = query_gram_keys(query)
+        if len(keys) == 0:
+            # Queries shorter than a trigram can't use the index
+            return self._scan(query)
+
+        # Intersect the posting lists, rarest first
+        lists = sorted((self.posting_list(k) for k in keys), key=len)
+        candidates = lists[0]
+        for plist in lists[1:]:
+            if len(candidates) == 0:
+                break
+            candidates = _intersect(candidates, plist, len(self))
+
+        if len(query.encode("utf-8")) == GRAM_SIZE:
+            # A single trigram never spans fields, so every hit is a match
+            return candidates
+        if len(candidates) > len(self) // _SCAN_FRACTION:
+            # Re-checking most of the table row by row is slower than one pass
+            return self._scan(query)
+        return self._verify(candidates, query)
+
+    def _verify(self, rows, query):
+        """Keep candidate rows that really contain the query."""
+        needle = query.encode("utf-8")
+        heap = self.heap
+        starts = self.row_starts
+        return np.array(
+            [r for r in rows.tolist() if needle in bytes(heap[starts[r]:starts[r + 1]])],
+            dtype=np.uint32,
+        )
+
+    def _scan(self, query):
+        """Find matching rows with one vectorized pass over the whole heap."""
+        needle = np.frombuffer(query.encode("utf-8"), dtype=np.uint8)
+        data = np.frombuffer(self.heap, dtype=np.uint8)
+        # Start from the rarest needle byte, then confirm the others
+        counts = self.byte_counts[needle]
+        first = int(np.argmin(counts))
+        positions = np.flatnonzero(data == needle[first]) - first
+        positions = positions[(positions >= 0) & (positions <= len(data) - len(needle))]
+        for k, byte in enumerate(needle):
+            if k != first:
+                positions = positions[data[positions + k] == byte]
+
+        rows = np.searchsorted(self.row_starts, positions, side="right") - 1
+        return _sorted_unique(rows).astype(np.uint32)
@@ -0,0 +1,469 @@
+"""
+JSON HTTP Lookup Service
+
+An optional asyncio HTTP/1.1 server beside app.py for ground tools that
+need command lookups without driving the Streamlit UI. It serves the same
+process-wide catalog load_catalog() builds, so there is no second copy of
+the CSVs.
+
+Endpoints (all responses are JSON):
+    GET  /search?q=antenna&offset=0&limit=50   substring search, fuzzy fallback
+    GET  /details?command=CMD_ARM_SYSTEM       one command (404 if unknown)
+    POST /details  {"commands": [...]}         batch details, one record per name
+    GET  /autocomplete?prefix=cmd_se&limit=10  command names by prefix
+    GET  /version                              dictionary version and size
+    GET  /metrics                              Prometheus text metrics (see metrics.py)
+
+Connections are kept alive (HTTP/1.1). Every response carries an ETag tied
+to the dictionary version, so clients can revalidate with If-None-Match and
+get 304 until the CSVs change; GET responses are also cached in memory per
+version. The data files are checked at most once per RELOAD_CHECK_INTERVAL
+seconds; a reload runs in a worker thread while requests keep being
+answered from the previous version.
+
+Usage:
+    python server.py --port 8765 [--host 127.0.0.1] [--data-dir .]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+import data_loader
+import metrics
+
+# Seconds between checks of the data files for changes
+RELOAD_CHECK_INTERVAL = 1.0
+
+# Cached GET responses, across all versions (LRU)
+RESPONSE_CACHE_SIZE = 1024
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+
+# Largest accepted request body (batch details)
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPError(Exception):
+    """Abort a request with an HTTP status and a JSON error message."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def dictionary_version(fingerprint):
+    """
+    Short, stable version id for a data fingerprint.
+
+    Args:
+        fingerprint (tuple): data_fingerprint() of the CSV files
+
+    Returns:
+        str: 16 hex digits
+    """
+    return hashlib.sha1(repr(fingerprint).encode("utf-8")).hexdigest()[:16]
+
+
+class _Version:
+    """One immutable dictionary version: catalog plus lazily built extras."""
+
+    def __init__(self, fingerprint, catalog):
+        self.fingerprint = fingerprint
+        self.id = dictionary_version(fingerprint)
+        self.etag = f'"{self.id}"'
+        self.catalog = catalog
+        self._prefix_index = None
+
+    def prefix_index(self):
+        """Lowercase command names in sorted order, with their row ids."""
+        if self._prefix_index is None:
+            names = np.array([name.lower() for name in self.catalog.command_names],
+                             dtype=object)
+            order = np.argsort(names, kind="stable")
+            self._prefix_index = (names[order], order)
+        return self._prefix_index
+
+
+class LookupService:
+    """
+    Request handling over the shared catalog, independent of the transport.
+
+    Args:
+        data_dir (str): Directory containing the CSV files
+    """
+
+    def __init__(self, data_dir="."):
+        self.data_dir = data_dir
+        self.version = self._load()
+        self._next_check = time.monotonic() + RELOAD_CHECK_INTERVAL
+        self._reload_task = None
+        self._cache = OrderedDict()
+
+    def _load(self):
+        return _Version(*data_loader.load_versioned_catalog(self.data_dir))
+
+    def maybe_reload(self):
+        """
+        Start a background reload if the data files changed.
+
+        Must be called on the event loop. Requests keep using the current
+        version until the reload has finished and swapped it.
+        """
+        now = time.monotonic()
+        if now < self._next_check or self._reload_task is not None:
+            return
+        self._next_check = now + RELOAD_CHECK_INTERVAL
+        try:
+            fingerprint = data_loader.data_fingerprint(self.data_dir)
+        except FileNotFoundError:
+            return
+        if fingerprint == self.version.fingerprint:
+            return
+
+        loop = asyncio.get_running_loop()
+        self._reload_task = loop.run_in_executor(None, self._load)
+        self._reload_task.add_done_callback(self._reload_done)
+
+    def _reload_done(self, task):
+        self._reload_task = None
+        if task.cancelled() or task.exception() is not None:
+            # Keep serving the old version; the next check retries
+            return
+        self.version = task.result()
+
+    def cached(self, version, key):
+        """Return a cached GET response body, if any."""
+        body = self._cache.get((version.id, key))
+        if body is not None:
+            self._cache.move_to_end((version.id, key))
+        return body
+
+    def store(self, version, key, body):
+        self._cache[(version.id, key)] = body
+        while len(self._cache) > RESPONSE_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def handle(self, version, method, path, query, body):
+        """
+        Produce the JSON payload of one request.
+
+        Args:
+            version (_Version): Dictionary version to answer from
+            method (str): HTTP method
+            path (str): URL path
+            query (dict): Parsed query string (lists of values)
+            body (bytes): Request body
+
+        Returns:
+            dict: Payload to serialize
+
+        Raises:
+            HTTPError: For bad requests and unknown routes or commands
+        """
+        routes = {
+            ("GET", "/search"): self.search,
+            ("GET", "/details"): self.details,
+            ("POST", "/details"): self.batch_details,
+            ("GET", "/autocomplete"): self.autocomplete,
+            ("GET", "/version"): self.version_info,
+        }
+        handler = routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in routes):
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on {path}")
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No such endpoint: {path}")
+        with metrics.STAGE_SECONDS.time(stage=f"http_{path.strip('/')}"):
+            payload = handler(version, query, body)
+        payload["version"] = version.id
+        return payload
+
+    @staticmethod
+    def _param(query, name, default=None):
+        values = query.get(name)
+        return values[0] if values else default
+
+    def _int_param(self, query, name, default, maximum=None):
+        value = self._param(query, name)
+        if value is None:
+            return default
+        try:
+            number = int(value)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must be an integer") from None
+        if number < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must not be negative")
+        return min(number, maximum) if maximum is not None else number
+
+    def search(self, version, query, body):
+        catalog = version.catalog
+        text = self._param(query, "q", "")
+        offset = self._int_param(query, "offset", 0)
+        limit = self._int_param(query, "limit", DEFAULT_LIMIT, MAX_LIMIT)
+
+        rows = catalog.search_rows(text)
+        fuzzy = False
+        if text and len(rows) == 0:
+            rows = [m.row for m in catalog.fuzzy_searcher.search(text)]
+            fuzzy = True
+
+        page = rows[offset:offset + limit]
+        return {
+            "query": text,
+            "total": len(rows),
+            "fuzzy": fuzzy,
+            "offset": offset,
+            "results": [
+                {
+                    "command": catalog.command_names[row],
+                    "hex_code": data_loader.json_value(catalog.hex_codes[row]),
+                    "description": data_loader.json_value(catalog.descriptions[row]),
+                }
+                for row in page
+            ],
+        }
+
+    def details(self, version, query, body):
+        command = self._param(query, "command")
+        if not command:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "command is required")
+        record = data_loader.details_record(version.catalog, command)
+        if not record["found"]:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Command '{command}' not found")
+        return record
+
+    def batch_details(self, version, query, body):
+        try:
+            commands = json.loads(body or b"{}").get("commands")
+        except (ValueError, AttributeError):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object") from None
+        if not isinstance(commands, list) or not all(isinstance(c, str) for c in commands):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, '"commands" must be a list of strings')
+        records = [data_loader.details_record(version.catalog, c) for c in commands]
+        return {
+            "results": records,
+            "not_found": sum(not r["found"] for r in records),
+        }
+
+    def autocomplete(self, version, query, body):
+        prefix = self._param(query, "prefix", "").lower()
+        limit = self._int_param(query, "limit", 10, MAX_LIMIT)
+        names, order = version.prefix_index()
+        if prefix:
+            # Everything sorting between prefix and its successor string
+            upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            lo, hi = np.searchsorted(names, [prefix, upper])
+        else:
+            lo, hi = 0, len(names)
+
+        suggestions = []
+        for row in order[lo:hi]:
+            name = version.catalog.command_names[row]
+            if not suggestions or suggestions[-1] != name:
+                suggestions.append(name)
+            if len(suggestions) == limit:
+                break
+        return {"prefix": prefix, "suggestions": suggestions}
+
+    def version_info(self, version, query, body):
+        return {"commands": len(version.catalog)}
+
+
+class LookupServer:
+    """
+    Minimal keep-alive HTTP/1.1 server for a LookupService.
+
+    Args:
+        service (LookupService): Request handler
+        host (str): Interface to bind
+        port (int): Port to bind (0 picks a free one; see ``port`` after start())
+    """
+
+    def __init__(self, service, host="127.0.0.1", port=8765):
+        self.service = service
+        self.host = host
+        self.port = port
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as e:
+                    # The body is unread (or can't be delimited), so the
+                    # connection can't be reused: answer and close
+                    payload = json.dumps({"error": e.message}).encode("utf-8")
+                    await self._write_response(writer, e.status, {
+                        "Content-Type": "application/json",
+                    }, payload, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                status, response_headers, payload = await self._respond(
+                    method, target, headers, body
+                )
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._write_response(writer, status, response_headers, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _write_response(writer, status, headers, payload, keep_alive):
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        headers["Content-Length"] = str(len(payload))
+        head = [f"HTTP/1.1 {status.value} {status.phrase}"]
+        head += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+        await writer.drain()
+
+    @staticmethod
+    async def _read_request(reader):
+        """
+        Read one request; returns None when the client closed the connection.
+
+        Raises:
+            HTTPError: 400 if the Content-Length header is malformed, 413
+                if it exceeds MAX_BODY_BYTES; the body is left unread
+        """
+        try:
+            request_line = await reader.readline()
+        except ValueError:
+            return None
+        if not request_line.strip():
+            return None
+        try:
+            method, target, _ = request_line.decode("latin-1").split()
+        except ValueError:
+            return None
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed Content-Length header")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                            f"Body exceeds {MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    async def _respond(self, method, target, headers, body):
+        service = self.service
+        loop = asyncio.get_running_loop()
+        url = urlsplit(target)
+        if url.path == "/metrics" and method == "GET":
+            # Never cached; the first export sizes the catalog, off the loop
+            text = await loop.run_in_executor(None, metrics.render)
+            return HTTPStatus.OK, {
+                "Content-Type": "text/plain; version=0.0.4; charset=utf-8",
+                "Cache-Control": "no-store",
+            }, text.encode("utf-8")
+
+        service.maybe_reload()
+        # Pin one version for the whole request
+        version = service.version
+        base_headers = {
+            "Content-Type": "application/json",
+            "ETag": version.etag,
+            "Cache-Control": "no-cache",
+        }
+
+        if method == "GET" and headers.get("if-none-match") == version.etag:
+            metrics.RESPONSE_CACHE_LOOKUPS.inc(result="not_modified")
+            return HTTPStatus.NOT_MODIFIED, base_headers, b""
+
+        if method == "GET":
+            payload = service.cached(version, target)
+            if payload is not None:
+                metrics.RESPONSE_CACHE_LOOKUPS.inc(result="hit")
+                return HTTPStatus.OK, base_headers, payload
+            metrics.RESPONSE_CACHE_LOOKUPS.inc(result="miss")
+
+        try:
+            result = await loop.run_in_executor(
+                None, service.handle, version, method, url.path,
+                parse_qs(url.query), body,
+            )
+            status = HTTPStatus.OK
+            payload = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        except HTTPError as e:
+            status = e.status
+            payload = json.dumps({"error": e.message, "version": version.id}).encode("utf-8")
+        except Exception:
+            # Answer rather than drop the connection without a response
+            logger.exception("Error handling %s %s", method, target)
+            status = HTTPStatus.INTERNAL_SERVER_ERROR
+            payload = json.dumps({"error": "Internal server error",
+                                  "version": version.id}).encode("utf-8")
+
+        if method == "GET" and status == HTTPStatus.OK:
+            service.store(version, target, payload)
+        return status, base_headers, payload
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Serve command lookups over HTTP/JSON")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to bind (default: 8765)")
+    parser.add_argument("--data-dir", default=".", help="Directory containing the CSV files")
+    args = parser.parse_args(argv)
+
+    service = LookupService(args.data_dir)
+    server = LookupServer(service, args.host, args.port)
+
+    async def run():
+        await server.start()
+        print(f"Serving {len(service.version.catalog)} commands on "
+              f"http://{server.host}:{server.port}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Binary Snapshot of the Compiled Command Catalog
+
+Parsing three CSVs and rebuilding every lookup and search index is the
+bulk of a cold start. This module stores the fully built CommandCatalog
+(DataFrames plus all prebuilt indexes) in a single binary file next to the
+CSVs, so later processes load it in one read.
+
+File layout:
+    8 bytes   magic b"CMDSNAP\\n"
+    4 bytes   little-endian uint32 format version
+    rest      pickle (protocol 5) of {"fingerprint": ..., "catalog": ...}
+
+The snapshot is only used when its version matches SNAPSHOT_VERSION and its
+stored fingerprint matches the current CSV fingerprint; otherwise callers
+rebuild from CSV and write a fresh one. Snapshots are a local cache written
+by this tool; never load one from an untrusted source (pickle).
+"""
+
+import os
+import pickle
+import struct
+
+SNAPSHOT_MAGIC = b"CMDSNAP\n"
+
+# Bump whenever the pickled catalog layout changes
+SNAPSHOT_VERSION = 3
+
+_HEADER = struct.Struct("<8sI")
+
+
+def write_snapshot(path, fingerprint, catalog):
+    """
+    Write a catalog snapshot atomically.
+
+    The file is written under a temporary name and renamed into place, so
+    concurrent readers see either the old snapshot or the complete new one.
+
+    Args:
+        path (str): Snapshot file path
+        fingerprint (tuple): Fingerprint of the CSV files the catalog came from
+        catalog (CommandCatalog): Catalog to store
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION))
+            pickle.dump(
+                {"fingerprint": fingerprint, "catalog": catalog},
+                f, protocol=5,
+            )
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_snapshot(path, fingerprint):
+    """
+    Load a catalog snapshot if it is current.
+
+    Args:
+        path (str): Snapshot file path
+        fingerprint (tuple): Fingerprint of the current CSV files
+
+    Returns:
+        CommandCatalog: The stored catalog, or None if the snapshot is
+            missing, from another format version, stale, or unreadable
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                return None
+            magic, version = _HEADER.unpack(header)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                return None
+            payload = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError,
+            ImportError, TypeError, ValueError):
+        # Truncated or incompatible snapshot: treat as stale
+        return None
+
+    if payload.get("fingerprint") != fingerprint:
+        return None
+    return payload["catalog"]
@@ -0,0 +1,82 @@
+"""
+Tests for app.py
+
+Runs the Streamlit script headlessly with streamlit.testing against the
+real CSV files, and against a larger synthetic dictionary for paging.
+
+How to run:
+- pytest test_app.py -v
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+import data_loader
+import generate_data
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+
+@pytest.fixture
+def app_in(monkeypatch):
+    """Run app.py from a given data directory"""
+    def run(data_dir):
+        monkeypatch.chdir(data_dir)
+        data_loader._cache_entry = None
+        app = AppTest.from_file(APP_PATH, default_timeout=60)
+        app.run()
+        assert not app.exception
+        return app
+    return run
+
+
+def test_selection_keyed_by_command(app_in):
+    """Test that options are Command names shown with their descriptions"""
+    app = app_in(os.path.dirname(APP_PATH))
+    commands_df = data_loader.load_catalog().commands_df
+
+    picker = app.selectbox[0]
+    assert picker.options == [
+        f"{c} - {d}" for c, d in zip(commands_df['Command'], commands_df['Description'])
+    ]
+    assert picker.value == commands_df['Command'].iloc[0]
+
+    picker.select(commands_df['Command'].iloc[3]).run()
+    assert app.code[0].value == commands_df['Command'].iloc[3]
+    assert app.code[1].value == commands_df['HexCode'].iloc[3]
+
+
+def test_results_are_paginated(app_in, tmp_path):
+    """Test that only one page of a large result list is rendered"""
+    generate_data.write_synthetic_data(tmp_path, commands=260, seed=2)
+    app = app_in(tmp_path)
+    page_size = 50
+
+    assert len(app.selectbox[0].options) == page_size
+    app.number_input[0].set_value(6).run()
+    options = app.selectbox[0].options
+    assert len(options) == 260 - 5 * page_size
+
+    commands_df = data_loader.load_catalog(tmp_path).commands_df
+    assert app.selectbox[0].value == commands_df['Command'].iloc[5 * page_size]
+    # Served from the mapped catalog, built on the first run
+    assert (tmp_path / data_loader.MAPPED_FILE).exists()
+
+
+def test_details_panel(app_in):
+    """Test the rendered details, with each enum set as one markdown block"""
+    app = app_in(os.path.dirname(APP_PATH))
+    markdown = [m.value for m in app.markdown]
+    assert "### Parameter 1: `Mode`" in markdown
+    assert "• `0` → SAFE  \n• `1` → LIVE  \n• `2` → TEST" in markdown
+    assert "• `Mode` (enum)  \n• `Delay` (int) - Range: 0-300" in markdown
+
+    # Back to a command viewed before: same details from the memoized view
+    app.selectbox[0].select("CMD_SET_ATTITUDE").run()
+    assert app.code[0].value == "CMD_SET_ATTITUDE"
+    app.selectbox[0].select("CMD_ARM_SYSTEM").run()
+    assert [m.value for m in app.markdown] == markdown
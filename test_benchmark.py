@@ -0,0 +1,41 @@
+"""
+Smoke tests for benchmark.py
+
+Runs the suite at a tiny size so it can't silently rot.
+
+How to run:
+- pytest test_benchmark.py -v
+"""
+
+import json
+
+import benchmark
+
+
+def test_summarize_percentiles():
+    """Test nearest-rank percentiles on a known distribution"""
+    summary = benchmark.summarize([i / 1000 for i in range(1, 101)])
+
+    assert summary["count"] == 100
+    assert summary["p50_ms"] == 50
+    assert summary["p95_ms"] == 95
+    assert summary["p99_ms"] == 99
+    assert summary["max_ms"] == 100
+
+
+def test_run_benchmarks_writes_results(tmp_path):
+    """Test a tiny end-to-end run and its JSON output"""
+    output = tmp_path / "results.json"
+    benchmark.main([
+        "--sizes", "200", "--repeats", "1", "--queries", "8", "--details", "5",
+        "--data-dir", str(tmp_path / "data"), "--no-app", "--output", str(output),
+    ])
+
+    report = json.loads(output.read_text())
+    names = {row["benchmark"] for row in report["results"]}
+    assert {"load_cold_csv", "load_cold_snapshot", "load_warm",
+            "search", "fuzzy_search", "details"} <= names
+    assert all(row["size"] == 200 for row in report["results"])
+    assert [row["size"] for row in report["memory"]] == [200]
+    assert report["memory"][0]["catalog_mb"] > 0
+    assert "commit" in report["meta"]
@@ -0,0 +1,185 @@
+"""
+Tests for catalog_tables.py
+
+How to run:
+- pytest test_catalog_tables.py -v
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import catalog_tables
+import data_loader
+from catalog_tables import EnumCodec, EnumTable, ParamSpec, ParamTable
+
+
+@pytest.fixture(params=["pyarrow", "pandas"])
+def splitter(request, monkeypatch):
+    """Run a test with and without the pyarrow fast path"""
+    if request.param == "pandas":
+        monkeypatch.setattr(catalog_tables, "pa", None)
+    elif catalog_tables.pa is None:
+        pytest.skip("pyarrow not installed")
+    return request.param
+
+
+@pytest.mark.parametrize("dtype, missing", [("string", pd.NA), (object, np.nan)])
+def test_encode_param_lists(splitter, dtype, missing):
+    """Test stripping, empty names, blank and missing lists, undefined names"""
+    params = pd.Series(["A, X", missing, " ", "C,,A ", " Y,X,"], dtype=dtype)
+    offsets, codes, undefined = catalog_tables.encode_param_lists(params, ["A", "B", "C"])
+    assert offsets.tolist() == [0, 2, 2, 2, 5, 8]
+    assert codes.tolist() == [0, 3, 2, 4, 0, 5, 3, 4]
+    assert codes.dtype == np.int32
+    assert list(undefined) == ["X", "", "Y"]
+
+    params = pd.Series([missing, missing], dtype=dtype)
+    offsets, codes, undefined = catalog_tables.encode_param_lists(params, ["A"])
+    assert offsets.tolist() == [0, 0, 0] and len(codes) == 0 and undefined == []
+
+
+def test_catalog_from_plain_frames(splitter):
+    """Test a catalog built from read_csv frames without compact dtypes"""
+    commands_df, params_df, enums_df = (
+        pd.read_csv(name) for name in data_loader.DATA_FILES
+    )
+    commands_df.loc[len(commands_df)] = ["CMD_NO_PARAMS", "0xFFF0", "No parameters", np.nan]
+    assert commands_df['Params'].dtype == object
+
+    details = data_loader.get_command_details("CMD_NO_PARAMS", commands_df, params_df, enums_df)
+    assert details == ("0xFFF0", "No parameters", [])
+    _, _, params = data_loader.get_command_details("CMD_ARM_SYSTEM", commands_df,
+                                                   params_df, enums_df)
+    assert [p["name"] for p in params] == ["Mode", "Delay"]
+
+
+def test_parse_opcode():
+    """Test prefix, case and whitespace handling, and invalid hex"""
+    assert catalog_tables.parse_opcode("0xAF23") == 0xAF23
+    assert catalog_tables.parse_opcode(" 0Xaf23 ") == 0xAF23
+    assert catalog_tables.parse_opcode("1A") == 0x1A
+    for text in ("0xG710", "0x", "", "-0x1", "0x1_0", "0x" + "F" * 16, None):
+        assert catalog_tables.parse_opcode(text) is None
+
+
+@pytest.mark.parametrize("dtype", ["string", object])
+def test_parse_opcodes(dtype):
+    """Test that the column parser agrees with parse_opcode()"""
+    texts = ["0xAF23", " af23 ", "0xG710", "0x", "+1", "0x1_0", "0x0001", pd.NA]
+    opcodes = catalog_tables.parse_opcodes(pd.Series(texts, dtype=dtype))
+    assert opcodes.tolist() == [0xAF23, 0xAF23, -1, -1, -1, -1, 1, -1]
+    assert catalog_tables.parse_opcodes(np.array([5, -3])).tolist() == [5, -1]
+    assert catalog_tables.parse_opcodes(["0x10", 16, True]).tolist() == [16, 16, -1]
+
+
+def test_parse_range():
+    """Test signed bounds, whitespace and malformed ranges"""
+    assert catalog_tables.parse_range("-180.0-180.0") == (-180.0, 180.0)
+    assert catalog_tables.parse_range("0-300") == (0.0, 300.0)
+    assert catalog_tables.parse_range(" -10 - -5 ") == (-10.0, -5.0)
+    assert catalog_tables.parse_range("1e-3-2E2") == (0.001, 200.0)
+    for text in ("", "abc", "1-2-3", "1..2", "-", "5-1"):
+        with pytest.raises(ValueError, match="Malformed range"):
+            catalog_tables.parse_range(text)
+
+    low, high, errors = catalog_tables.parse_ranges(
+        pd.Series(["0-300", pd.NA, "x", "-1--1", " "], dtype="string"))
+    np.testing.assert_array_equal(low, [0.0, np.nan, np.nan, -1.0, np.nan])
+    np.testing.assert_array_equal(high, [300.0, np.nan, np.nan, -1.0, np.nan])
+    assert list(errors) == [2]
+
+
+def test_param_table(splitter):
+    """Test first definition wins and undefined names become "unknown" specs"""
+    params_df = pd.DataFrame({
+        'ParamID': ["Mode", "Delay", "Mode"],
+        'Type': ["enum", "int", "float"],
+        'EnumSet': ["MODES", pd.NA, pd.NA],
+        'Range': [pd.NA, "0-10", "1-2"],
+    }, dtype="string").astype({'Type': 'category', 'EnumSet': 'category'})
+    command_params = pd.Series(["Mode,Delay", "Ghost,Mode", pd.NA], dtype="string")
+
+    table = ParamTable(params_df, command_params)
+    assert table.command_specs(0) == [
+        ParamSpec("Mode", "enum", None, "MODES"),
+        ParamSpec("Delay", "int", "0-10", None),
+    ]
+    assert table.command_specs(1) == [
+        ParamSpec("Ghost", "unknown", None, None),
+        ParamSpec("Mode", "enum", None, "MODES"),
+    ]
+    assert table.command_specs(2) == []
+    # Specs are shared, not rebuilt per command
+    assert table.command_specs(0)[0] is table.command_specs(1)[1]
+    assert table.codes.dtype == np.int32
+    assert [table.type_names[c] for c in table.type_codes] == ["enum", "int", "unknown"]
+    np.testing.assert_array_equal(table.range_min, [np.nan, 0.0, np.nan])
+    np.testing.assert_array_equal(table.range_max, [np.nan, 10.0, np.nan])
+    assert table.lookup(["Delay", "Ghost", "Nope"]).tolist() == [1, 2, -1]
+
+
+def test_enum_table():
+    """Test grouping per set and the row-by-row dict semantics"""
+    enums_df = pd.DataFrame({
+        'EnumSet': ["A", "B", "A", "A"],
+        'Value': np.array([1, 0, 0, 1], dtype=np.int32),
+        'Label': ["one", "zero", "zero", "uno"],
+    })
+    table = EnumTable(enums_df)
+    assert table.mapping("A") == {"1": "uno", "0": "zero"}
+    assert list(table.mapping("A")) == ["1", "0"]
+    assert table.mapping("B") == {"0": "zero"}
+    assert table.mapping("C") is None
+    assert table.mapping("A") is not table.mapping("A")
+
+
+@pytest.mark.parametrize("values", [[5, 3, 5, 9], [5, 3, 5, 10**12]],
+                         ids=["dense", "sparse"])
+def test_enum_codec_decode(values):
+    """Test bulk decoding against the dict, and unknown-value handling"""
+    codec = EnumCodec("S", values, ["a", "b", "c", "d"])
+    assert codec.dense == (values[-1] == 9)
+    assert codec.values.tolist() == sorted(set(values))
+
+    raw = np.array([values[-1], 3, 5, 4, -1, 2**62], dtype=np.int64)
+    assert codec.decode(raw).tolist() == ["d", "b", "c", None, None, None]
+    assert codec.decode(raw, unknown="?").tolist() == ["d", "b", "c", "?", "?", "?"]
+    assert codec.contains(raw).tolist() == [True, True, True, False, False, False]
+    # Floats must be integral; shape is kept
+    floats = np.array([[3.0, 3.5], [np.nan, 5.0]])
+    assert codec.decode(floats).tolist() == [["b", None], [None, "c"]]
+    with pytest.raises(KeyError, match="2 values not in enum set S"):
+        codec.decode(raw[2:5], unknown="raise")
+    with pytest.raises(TypeError):
+        codec.decode(["3"])
+
+
+def test_enum_codec_encode():
+    """Test label -> value, first value of a repeated label"""
+    codec = EnumCodec("S", [2, 1, 0], ["on", "off", "on"])
+    assert codec.encode(["on", "off", "ON"]).tolist() == [2, 1, -1]
+    with pytest.raises(KeyError, match="ON"):
+        codec.encode(["ON"], unknown="raise")
+    assert EnumCodec("E", [], []).decode([1]).tolist() == [None]
+
+
+def test_catalog_enum_codec():
+    """Test that the catalog's codec agrees with its per-command mapping"""
+    catalog = data_loader.load_catalog()
+    enum_set = catalog.enums_df['EnumSet'].iloc[0]
+    mapping = catalog._enum_table.mapping(enum_set)
+    codec = catalog.enum_codec(enum_set)
+    assert codec is catalog.enum_codec(enum_set)
+    assert codec.decode([int(v) for v in mapping]).tolist() == list(mapping.values())
+    with pytest.raises(KeyError, match="Unknown enum set"):
+        catalog.enum_codec("NO_SUCH_SET")
+
+
+def test_loaded_frames_are_compact():
+    """Test categorical codes for repeated strings in the loaded frames"""
+    commands_df, params_df, enums_df = data_loader.read_data_files()
+    assert isinstance(params_df['Type'].dtype, pd.CategoricalDtype)
+    assert isinstance(params_df['EnumSet'].dtype, pd.CategoricalDtype)
+    assert isinstance(enums_df['EnumSet'].dtype, pd.CategoricalDtype)
+    assert commands_df['Description'].dtype == data_loader.TEXT_DTYPE
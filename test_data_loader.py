@@ -11,6 +11,16 @@ Test Structure:
 1. test_load_data_returns_dataframes: Validates load_data() returns correct types
 2. test_load_data_has_expected_columns: Checks CSV files have required columns
 3. test_get_command_details_with_real_data: Tests command lookup with real data
+4. test_catalog_matches_dataframe_lookup: Indexed lookups agree with DataFrame masks
+5. test_catalog_unknown_command: Unknown commands raise KeyError
+6. test_cache_invalidates_on_file_change: Edited CSVs are reloaded
+7. test_cache_single_loader_under_concurrency: Concurrent first access loads once
+8. test_sharded_load_merges_shards: Shards parsed in a pool merge into one catalog
+9. test_sharded_load_reports_duplicates: Cross-shard Command/HexCode clashes warn
+10. test_reload_patches_changed_rows: Edited CSVs are diffed and patched in
+11. test_get_command_details_many_matches_single_lookups: Batch table agrees
+    with single lookups
+12. test_batch_mode_streams_json_lines: CLI batch mode emits JSON Lines
 
 How to run:
 - All tests: pytest test_data_loader.py
@@ -26,8 +36,14 @@ Examples:
 - pytest test_data_loader.py::test_get_command_details_with_real_data -s
 """
 
+import os
+import threading
+
+import numpy as np
 import pandas as pd
+import pytest
 import data_loader
+import search_index
 
 
 def test_load_data_returns_dataframes():
@@ -98,4 +114,316 @@ def test_get_command_details_with_real_data():
         if param.get('range'):
             print(f"    Range: {param['range']}")
     
-    print("✓ Command details test passed")
\ No newline at end of file
+    print("✓ Command details test passed")
+
+def test_catalog_matches_dataframe_lookup():
+    """Test that CommandCatalog lookups agree with plain DataFrame masks"""
+    commands_df, params_df, enums_df = data_loader.load_data()
+    catalog = data_loader.load_catalog()
+
+    for _, cmd in commands_df.iterrows():
+        hex_code, description, param_details = catalog.get_command_details(cmd['Command'])
+        assert hex_code == cmd['HexCode']
+        assert description == cmd['Description']
+
+        expected_names = [p.strip() for p in cmd['Params'].split(",")]
+        assert [p['name'] for p in param_details] == expected_names
+
+        for param in param_details:
+            row = params_df[params_df['ParamID'] == param['name']].iloc[0]
+            assert param['type'] == row['Type']
+            if param['enum_values']:
+                enum_rows = enums_df[enums_df['EnumSet'] == row['EnumSet']]
+                assert list(param['enum_values']) == list(enum_rows['Value'].astype(str))
+                assert list(param['enum_values'].values()) == list(enum_rows['Label'])
+
+
+def test_catalog_unknown_command():
+    """Test that unknown commands raise KeyError"""
+    catalog = data_loader.load_catalog()
+
+    assert "CMD_DOES_NOT_EXIST" not in catalog
+    with pytest.raises(KeyError):
+        catalog.get_command_details("CMD_DOES_NOT_EXIST")
+
+
+def test_adhoc_frames_reuse_one_details_catalog(monkeypatch):
+    """Test that other DataFrames build one catalog, without search structures"""
+    frames = [pd.read_csv(name) for name in data_loader.DATA_FILES]
+    builds = []
+    monkeypatch.setattr(data_loader, "SearchIndex", lambda *args: builds.append(args))
+
+    first = data_loader.get_command_details("CMD_ARM_SYSTEM", *frames)
+    catalog = data_loader._adhoc_catalog
+    assert data_loader.get_command_details("CMD_ARM_SYSTEM", *frames) == first
+    data_loader.get_command_details_many(["CMD_SET_MODE"], *frames)
+    assert data_loader._adhoc_catalog is catalog
+    assert builds == []
+
+    copies = [df.copy() for df in frames]
+    assert data_loader.get_command_details("CMD_ARM_SYSTEM", *copies) == first
+    assert data_loader._adhoc_catalog is not catalog
+
+
+def test_cache_invalidates_on_file_change(data_dir):
+    """Test that editing a CSV swaps in a rebuilt catalog on the next call"""
+    catalog = data_loader.load_catalog(data_dir)
+    assert data_loader.load_catalog(data_dir) is catalog
+    assert "CMD_NEW_COMMAND" not in catalog
+
+    commands_file = data_dir / data_loader.COMMANDS_FILE
+    with open(commands_file, "a") as f:
+        f.write("CMD_NEW_COMMAND,0xFF01,Newly added command,Mode\n")
+    stat = os.stat(commands_file)
+    os.utime(commands_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    reloaded = data_loader.load_catalog(data_dir)
+    assert reloaded is not catalog
+    assert "CMD_NEW_COMMAND" in reloaded
+    assert "CMD_NEW_COMMAND" not in catalog
+
+
+def test_cache_single_loader_under_concurrency(data_dir, monkeypatch):
+    """Test that concurrent first access parses the files only once"""
+    calls = []
+    read_data_files = data_loader.read_data_files
+
+    def counting_read(data_dir="."):
+        calls.append(data_dir)
+        return read_data_files(data_dir)
+
+    monkeypatch.setattr(data_loader, "read_data_files", counting_read)
+
+    results = []
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        results.append(data_loader.load_catalog(data_dir))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(catalog is results[0] for catalog in results)
+
+
+def _write_shards(target_dir, commands_df, params_df, enums_df, parts=3):
+    """Split the real data into per-subsystem shard files"""
+    for i in range(parts):
+        commands_df.iloc[i::parts].to_csv(target_dir / f"master_commands_s{i}.csv", index=False)
+    params_df.to_csv(target_dir / "parameter_metadata_all.csv", index=False)
+    enums_df.to_csv(target_dir / "enum_definitions_all.csv", index=False)
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_sharded_load_merges_shards(tmp_path, processes):
+    """Test that shards parsed in a pool merge into one catalog"""
+    commands_df, params_df, enums_df = data_loader.read_data_files()
+    _write_shards(tmp_path, commands_df, params_df, enums_df)
+
+    merged = data_loader.read_data_files(tmp_path, workers=4, processes=processes)
+    assert len(merged[0]) == len(commands_df)
+    assert sorted(merged[0]['Command']) == sorted(commands_df['Command'])
+    assert merged[1].equals(params_df)
+    assert merged[2].equals(enums_df)
+
+    catalog = data_loader.CommandCatalog(*merged)
+    for command in commands_df['Command']:
+        assert command in catalog
+
+
+def test_sharded_load_reports_duplicates(tmp_path):
+    """Test that a Command or HexCode defined by two shards is reported"""
+    commands_df, params_df, enums_df = data_loader.read_data_files()
+    _write_shards(tmp_path, commands_df, params_df, enums_df, parts=2)
+    clash = commands_df.iloc[[0]].assign(HexCode=commands_df['HexCode'].iloc[1].lower())
+    clash.to_csv(tmp_path / "master_commands_zz.csv", index=False)
+
+    with pytest.warns(data_loader.DuplicateEntryWarning, match="2 duplicate entries"):
+        merged = data_loader.read_data_files(tmp_path)
+
+    files, _, _ = data_loader.data_files(tmp_path)
+    duplicates = data_loader.find_shard_duplicates(
+        files, [pd.read_csv(path, dtype=data_loader.COMMANDS_DTYPES) for path in files]
+    )
+    assert list(duplicates['Column']) == ['Command', 'HexCode']
+    assert duplicates['Shards'].iloc[0] == ("master_commands_s0.csv", "master_commands_zz.csv")
+
+    # First definition still wins
+    catalog = data_loader.CommandCatalog(*merged)
+    first = commands_df.iloc[0]
+    assert catalog.get_command_details(first['Command'])[0] == first['HexCode']
+
+
+def test_reload_patches_changed_rows(data_dir, monkeypatch):
+    """Test that an edited CSV is diffed and patched into a new catalog"""
+    catalog = data_loader.load_catalog(data_dir)
+    os.remove(data_dir / data_loader.SNAPSHOT_FILE)
+
+    commands_file = data_dir / data_loader.COMMANDS_FILE
+    lines = commands_file.read_text().splitlines(keepends=True)
+    first = lines[1].split(",")[0]
+    lines[1] = lines[1].replace(first, "CMD_RENAMED", 1)
+    del lines[2]
+    lines.append("CMD_NEW_COMMAND,0xFF01,Newly added command,Mode\n")
+    commands_file.write_text("".join(lines))
+    stat = os.stat(commands_file)
+    os.utime(commands_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    def no_rebuild(*args, **kwargs):
+        raise AssertionError("search index rebuilt from scratch")
+
+    with monkeypatch.context() as m:
+        # The sample table is tiny: patch even though most rows are new
+        m.setattr(search_index, "_PATCH_FRACTION", 1)
+        m.setattr(search_index.SearchIndex, "_build", no_rebuild)
+        reloaded = data_loader.load_catalog(data_dir)
+
+    diff = reloaded.changes[data_loader.COMMANDS_FILE]
+    assert sorted(diff.added) == ["CMD_NEW_COMMAND", "CMD_RENAMED"]
+    assert diff.changed == []
+    assert len(diff.removed) == 2 and first in diff.removed
+    params_diff = reloaded.changes[data_loader.PARAMS_FILE]
+    assert params_diff.added == params_diff.changed == params_diff.removed == []
+
+    # The old version is untouched; the new one matches a fresh build
+    assert first in catalog and "CMD_RENAMED" not in catalog
+    fresh = data_loader.CommandCatalog(*data_loader.read_data_files(data_dir))
+    for query in ["renamed", "new", "power", "a"]:
+        assert list(reloaded.search(query).index) == list(fresh.search(query).index)
+
+
+def test_get_command_details_many_matches_single_lookups():
+    """Test that the columnar batch table agrees with get_command_details()"""
+    commands_df, params_df, enums_df = data_loader.load_data()
+    names = list(commands_df['Command']) + ["CMD_DOES_NOT_EXIST", commands_df['Command'].iloc[0]]
+
+    table = data_loader.get_command_details_many(names, commands_df, params_df, enums_df)
+    assert list(table.columns) == ['Command', 'Found', 'HexCode', 'Description', 'ParamIndex',
+                                   'Param', 'Type', 'Range', 'EnumSet', 'EnumValues']
+    assert list(table['Command'].unique()) == list(dict.fromkeys(names))
+
+    for name, rows in table.groupby('Command', sort=False):
+        if name == "CMD_DOES_NOT_EXIST":
+            assert len(rows) == 1 and not rows['Found'].iloc[0]
+            assert pd.isna(rows['Param'].iloc[0])
+            continue
+        hex_code, description, param_details = data_loader.get_command_details(
+            name, commands_df, params_df, enums_df
+        )
+        rows = rows.drop_duplicates('ParamIndex')
+        assert rows['Found'].all()
+        assert rows['HexCode'].iloc[0] == hex_code
+        assert rows['Description'].iloc[0] == description
+        assert list(rows['Param'].dropna()) == [p['name'] for p in param_details]
+        for row, param in zip(rows.itertuples(), param_details):
+            assert row.Type == param['type']
+            assert (None if pd.isna(row.Range) else row.Range) == param['range']
+            assert row.EnumValues == param['enum_values']
+
+
+def test_validate_params_reasons():
+    """Test type, enum, range and lookup violations, one reason per row"""
+    catalog = data_loader.load_catalog()
+    rows = [
+        ("CMD_ARM_SYSTEM", "Mode", "LIVE", None),
+        ("CMD_ARM_SYSTEM", "Mode", 2, None),
+        ("CMD_ARM_SYSTEM", "Mode", 7, "not a value or label of enum set ARM_MODE"),
+        ("CMD_ARM_SYSTEM", "Delay", 300, None),
+        ("CMD_ARM_SYSTEM", "Delay", 301, "301 outside range 0-300"),
+        ("CMD_ARM_SYSTEM", "Delay", 2.5, "expected an integer"),
+        ("CMD_ARM_SYSTEM", "Delay", True, "expected an integer"),
+        ("CMD_ARM_SYSTEM", "Delay", None, "missing value"),
+        ("CMD_ARM_SYSTEM", "Roll", 0.0, "not a parameter of CMD_ARM_SYSTEM"),
+        ("CMD_NOPE", "Mode", 1, "unknown command"),
+        ("CMD_SET_ATTITUDE", "Roll", -180.0, None),
+        ("CMD_SET_ATTITUDE", "Roll", -180.5, "-180.5 outside range -180.0-180.0"),
+        ("CMD_SET_ATTITUDE", "Roll", "level", "expected a finite number"),
+    ]
+    commands, params, values, expected = zip(*rows)
+    reasons = catalog.validate_params(pd.Series(commands, index=range(10, 23)), params, values)
+    assert list(reasons.index) == list(range(10, 23))
+    assert reasons.tolist() == list(expected)
+
+    # Typed arrays take the vectorized path without object conversion
+    reasons = catalog.validate_params(["CMD_ARM_SYSTEM"] * 3, ["Delay"] * 3, np.array([0, 150, -1]))
+    assert reasons.tolist() == [None, None, "-1 outside range 0-300"]
+    with pytest.raises(ValueError, match="2 commands, 1 parameters"):
+        catalog.validate_params(["CMD_ARM_SYSTEM"] * 2, ["Delay"], [1, 2])
+
+
+def test_malformed_range_warns(data_dir):
+    """Test that a bad Range warns at load and is reported by validation"""
+    params_file = data_dir / data_loader.PARAMS_FILE
+    params_file.write_text(params_file.read_text().replace("0-300", "0 to 300"))
+
+    with pytest.warns(data_loader.MalformedRangeWarning, match="Delay: Malformed range '0 to 300'"):
+        catalog = data_loader.CommandCatalog(*data_loader.read_data_files(data_dir))
+    reasons = catalog.validate_params(["CMD_ARM_SYSTEM"] * 2, ["Delay", "Mode"], [5, "SAFE"])
+    assert reasons.tolist() == ["Malformed range '0 to 300': expected '<min>-<max>'", None]
+
+
+def test_decode_opcodes_reports_unknown_and_duplicates(data_dir):
+    """Test normalized reverse lookups, unknown opcodes and shared HexCodes"""
+    commands_file = data_dir / data_loader.COMMANDS_FILE
+    commands_file.write_text(commands_file.read_text()
+                             + "CMD_ARM_AGAIN,0xaf23,Same opcode in lower case,\n")
+    catalog = data_loader.CommandCatalog(*data_loader.read_data_files(data_dir))
+
+    assert catalog.command_for_opcode("AF23") == "CMD_ARM_SYSTEM"
+    assert catalog.command_for_opcode(0xAF23) == "CMD_ARM_SYSTEM"
+    with pytest.raises(KeyError, match="Unknown opcode: 0xG710"):
+        catalog.command_for_opcode("0xG710")
+
+    decoded = catalog.decode_opcodes(["0xAF23", "0x0000", "0xG710", "0xe507"])
+    assert decoded['Opcode'].tolist() == [0xAF23, 0, pd.NA, 0xE507]
+    assert decoded['Command'].tolist() == ["CMD_ARM_SYSTEM", pd.NA, pd.NA, "CMD_SET_ATTITUDE"]
+    assert decoded['Description'].iloc[3].startswith("Sets satellite attitude")
+    assert decoded['Found'].tolist() == [True, False, False, True]
+    assert decoded['Duplicate'].tolist() == [True, False, False, False]
+
+    duplicates = catalog.duplicate_opcodes()
+    assert duplicates.to_dict('records') == [
+        {'Opcode': 0xAF23, 'Commands': ("CMD_ARM_SYSTEM", "CMD_ARM_AGAIN")},
+    ]
+
+
+def test_batch_mode_streams_json_lines(capsys, monkeypatch):
+    """Test that --batch writes one JSON record per input name, in order"""
+    import io
+    import json
+
+    catalog = data_loader.load_catalog()
+    known = list(catalog.commands_df['Command'][:3])
+    monkeypatch.setattr("sys.stdin", io.StringIO("\n".join(
+        [known[0], "CMD_DOES_NOT_EXIST", "", f"  {known[1]}  ", known[2]]
+    ) + "\n"))
+
+    data_loader.main(["--batch"])
+    captured = capsys.readouterr()
+    records = [json.loads(line) for line in captured.out.splitlines()]
+
+    assert [r["command"] for r in records] == [known[0], "CMD_DOES_NOT_EXIST", known[1], known[2]]
+    assert [r["found"] for r in records] == [True, False, True, True]
+    hex_code, description, param_details = catalog.get_command_details(known[0])
+    assert records[0]["hex_code"] == hex_code
+    assert records[0]["params"] == param_details
+    assert "4 records, 1 not found" in captured.err
+
+
+def test_batch_mode_blank_enum_label(data_dir, capsys, monkeypatch):
+    """Test that a blank enum Label is written as null, not a crash"""
+    import io
+    import json
+
+    enums_file = data_dir / data_loader.ENUMS_FILE
+    enums_file.write_text(enums_file.read_text().replace("ARM_MODE,1,LIVE", "ARM_MODE,1,"))
+    monkeypatch.setattr("sys.stdin", io.StringIO("CMD_ARM_SYSTEM\n"))
+
+    data_loader.main(["--batch", "--data-dir", str(data_dir)])
+    record = json.loads(capsys.readouterr().out)
+    assert record["params"][0]["enum_values"] == {"0": "SAFE", "1": None, "2": "TEST"}
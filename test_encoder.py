@@ -0,0 +1,107 @@
+"""
+Tests for encoder.py
+
+Uses the real CSV files through data_loader.load_catalog().
+
+How to run:
+- pytest test_encoder.py -v
+"""
+
+import struct
+
+import numpy as np
+import pytest
+
+import data_loader
+from encoder import CommandEncoder, EncodeError
+
+
+@pytest.fixture(scope="module")
+def encoder():
+    return CommandEncoder(data_loader.load_catalog())
+
+
+def test_encode_layout(encoder):
+    """Test opcode, field order, sizes and label translation"""
+    packet = encoder.encode("CMD_ARM_SYSTEM", {"Delay": 30, "Mode": "LIVE"})
+    assert packet == struct.pack(">HHi", 0xAF23, 1, 30)
+    assert encoder.encode("CMD_ARM_SYSTEM", [np.int64(1), 30.0]) == packet
+    assert encoder.layout("CMD_ARM_SYSTEM").size == 8
+    assert encoder.layout("CMD_ARM_SYSTEM") is encoder.layout("CMD_ARM_SYSTEM")
+
+
+@pytest.mark.parametrize("command, values, message", [
+    ("CMD_NOPE", [], "Unknown command"),
+    ("CMD_TRANSMIT_DATA", ["X", 1.0, 0.5], "invalid HexCode '0xG710'"),
+    ("CMD_ARM_SYSTEM", ["LIVE"], "expected 2 parameter values"),
+    ("CMD_ARM_SYSTEM", {"Mode": "LIVE", "Wait": 1}, "missing parameters \\['Delay'\\]"),
+    ("CMD_ARM_SYSTEM", ["ARMED", 30], "Mode: 'ARMED' is not a value or label"),
+    ("CMD_ARM_SYSTEM", [True, 30], "Mode: True is not"),
+    ("CMD_ARM_SYSTEM", ["LIVE", 1.5], "Delay: expected an integer"),
+    ("CMD_ARM_SYSTEM", ["LIVE", 2**40], "out of field range"),
+    ("CMD_SET_ATTITUDE", [1e40, 0.0, 0.0, 5], "out of field range"),
+])
+def test_encode_errors(encoder, command, values, message):
+    """Test that bad commands, metadata and values raise EncodeError"""
+    with pytest.raises(EncodeError, match=message):
+        encoder.encode(command, values)
+
+
+def test_encode_many(encoder):
+    """Test that a batch matches single encodes and reports the bad row"""
+    commands = ["CMD_ARM_SYSTEM", "CMD_ARM_SYSTEM"] * 1000
+    values = [("SAFE", 0), {"Mode": 2, "Delay": 300}] * 1000
+    packets = encoder.encode_many(commands, values)
+    assert len(packets) == 2000
+    assert packets[1] == encoder.encode("CMD_ARM_SYSTEM", ["TEST", 300])
+
+    with pytest.raises(EncodeError, match="Batch row 2: Unknown command: CMD_NOPE"):
+        encoder.encode_many(commands[:2] + ["CMD_NOPE"], values[:2] + [[]])
+    with pytest.raises(EncodeError, match="2 commands but 1 value lists"):
+        encoder.encode_many(commands[:2], values[:1])
+
+
+@pytest.mark.parametrize("command, param, others", [
+    ("CMD_ARM_SYSTEM", "Mode", {"Delay": 30}),
+    ("CMD_ARM_SYSTEM", "Delay", {"Mode": 0}),
+    ("CMD_DEPLOY_ANTENNA", "Confirm", {"DeployType": 0}),
+    ("CMD_SET_ATTITUDE", "Roll", {"Pitch": 0.0, "Yaw": 0.0}),
+])
+def test_encoder_accepts_what_validate_params_accepts(encoder, command, param, others):
+    """Test that validation and encoding agree on every kind of value"""
+    catalog = encoder.catalog
+    names = [p["name"] for p in catalog.get_command_details(command)[2]]
+    others = {name: others.get(name, 1) for name in names if name != param}
+    values = [1, 0, 2, -1, 1.0, np.float64(1), np.float32(0), np.int64(1), True, False,
+              np.bool_(True), 1.5, float("nan"), float("inf"), "1", "LIVE", "SAFE",
+              np.str_("TEST"), None, b"1"]
+    reasons = catalog.validate_params([command] * len(values), [param] * len(values),
+                                      values)
+    for value, reason in zip(values, reasons):
+        try:
+            encoder.encode(command, dict(others, **{param: value}))
+            encoded = True
+        except EncodeError:
+            encoded = False
+        # Ranges are only checked by validate_params
+        accepted = reason is None or "outside range" in reason
+        assert accepted == encoded, (value, reason)
+
+
+def test_mapped_catalog_encodes_the_same(encoder, data_dir):
+    """Test that a MappedCatalog compiles the same layouts as CommandCatalog"""
+    mapped = CommandEncoder(data_loader.load_mapped_catalog(str(data_dir)))
+
+    def compiled(encoder, command):
+        try:
+            layout = encoder.layout(command)
+        except EncodeError as e:
+            return str(e)
+        return layout.opcode, layout.params, layout.struct.format
+
+    for command in [*encoder.catalog.command_names, "CMD_NOPE"]:
+        assert compiled(mapped, command) == compiled(encoder, command)
+    packet = encoder.encode("CMD_ARM_SYSTEM", ["TEST", 5])
+    assert mapped.encode("CMD_ARM_SYSTEM", ["TEST", 5]) == packet
+    with pytest.raises(EncodeError, match="'ARMED' is not a value or label"):
+        mapped.encode("CMD_ARM_SYSTEM", ["ARMED", 5])
@@ -0,0 +1,69 @@
+"""
+Tests for fuzzy_search.py
+
+Uses the real CSV files through data_loader.load_catalog().
+
+How to run:
+- pytest test_fuzzy_search.py -v
+"""
+
+import data_loader
+import fuzzy_search
+
+
+def test_fuzzy_search_tolerates_typos():
+    """Test that misspelled queries rank the intended command first"""
+    catalog = data_loader.load_catalog()
+
+    assert catalog.search("CMD_DEPLY_ANTENA").empty
+    result = catalog.fuzzy_search("CMD_DEPLY_ANTENA")
+    assert result.iloc[0]['Command'] == "CMD_DEPLOY_ANTENNA"
+
+    result = catalog.fuzzy_search("calibrate sensr")
+    assert result.iloc[0]['Command'] == "CMD_CALIBRATE_SENSOR"
+    assert list(result['Score']) == sorted(result['Score'], reverse=True)
+
+
+def test_fuzzy_search_respects_limit_and_min_score():
+    """Test result limiting and rejection of unrelated queries"""
+    catalog = data_loader.load_catalog()
+
+    assert len(catalog.fuzzy_search("payload", limit=1)) == 1
+    assert catalog.fuzzy_search("xqzv").empty
+    assert catalog.fuzzy_search("").empty
+
+
+def test_fuzzy_search_zero_budget_still_returns():
+    """Test that an exhausted time budget degrades instead of failing"""
+    catalog = data_loader.load_catalog()
+
+    matches = catalog.fuzzy_searcher.search("CMD_DEPLY_ANTENA", time_budget=0.0, min_score=0.0)
+    assert len(matches) > 0
+    # Nothing was reranked: every row is in the trigram-coverage tier
+    scores = [m.score for m in matches]
+    assert scores == sorted(scores, reverse=True)
+    assert matches[0].command == "CMD_DEPLOY_ANTENNA"
+
+
+def test_fuzzy_search_unranked_rows_come_last(monkeypatch):
+    """Test that rows the budget didn't rerank follow the reranked ones"""
+    catalog = data_loader.load_catalog()
+    searcher = catalog.fuzzy_searcher
+    full = searcher.search("cmd", min_score=0.0)
+
+    # The clock jumps past any deadline once the first row is reranked
+    now = [0.0]
+    row_text = searcher._row_text
+
+    def slow_row_text(row):
+        now[0] = 1e9
+        return row_text(row)
+    monkeypatch.setattr(fuzzy_search.time, "perf_counter", lambda: now[0])
+    monkeypatch.setattr(searcher, "_row_text", slow_row_text)
+    matches = searcher.search("cmd", time_budget=1.0, min_score=0.0)
+
+    reranked, rest = matches[0], matches[1:]
+    assert reranked.score == next(m.score for m in full if m.row == reranked.row)
+    assert rest and reranked.row not in [m.row for m in rest]
+    assert [m.score for m in rest] == sorted((m.score for m in rest), reverse=True)
+    assert max(m.score for m in rest) > reranked.score
@@ -0,0 +1,60 @@
+"""
+Tests for generate_data.py
+
+Generates small synthetic dictionaries into scratch directories and loads
+them back through data_loader.
+
+How to run:
+- pytest test_generate_data.py -v
+"""
+
+import data_loader
+import generate_data
+
+
+def _read_all(directory):
+    return {
+        name: (directory / name).read_bytes() for name in data_loader.DATA_FILES
+    }
+
+
+def test_synthetic_data_is_consistent(tmp_path):
+    """Test that every reference in a synthetic dictionary resolves"""
+    generate_data.write_synthetic_data(
+        tmp_path, commands=500, params_per_command=6, enum_sets=5,
+        values_per_set=3, seed=1, chunk_size=64,
+    )
+    commands_df, params_df, enums_df = data_loader.read_data_files(tmp_path)
+
+    assert len(commands_df) == 500
+    assert commands_df['Command'].is_unique
+    assert commands_df['HexCode'].is_unique
+    assert len(enums_df) == 15
+
+    param_ids = set(params_df['ParamID'])
+    for params in commands_df['Params'].dropna():
+        assert set(params.split(",")) <= param_ids
+    enum_params = params_df[params_df['Type'] == "enum"]
+    assert set(enum_params['EnumSet']) <= set(enums_df['EnumSet'])
+
+    catalog = data_loader.CommandCatalog(commands_df, params_df, enums_df)
+    for command in commands_df['Command'].head(20):
+        for param in catalog.get_command_details(command)[2]:
+            assert param['type'] != "unknown"
+
+
+def test_synthetic_data_is_reproducible(tmp_path):
+    """Test that equal seeds give identical files and different seeds don't"""
+    for name, seed in [("a", 7), ("b", 7), ("c", 8)]:
+        generate_data.write_synthetic_data(tmp_path / name, commands=200, seed=seed)
+
+    assert _read_all(tmp_path / "a") == _read_all(tmp_path / "b")
+    assert _read_all(tmp_path / "a") != _read_all(tmp_path / "c")
+
+
+def test_default_writes_sample_data(tmp_path):
+    """Test that running without size options writes the sample dictionary"""
+    generate_data.main(["--output-dir", str(tmp_path)])
+
+    commands_df, _, _ = data_loader.read_data_files(tmp_path)
+    assert len(commands_df) == 14
@@ -0,0 +1,88 @@
+"""
+Tests for log_decoder.py
+
+Uses the real CSV files through data_loader.load_catalog().
+
+How to run:
+- pytest test_log_decoder.py -v
+"""
+
+import io
+import json
+
+import pytest
+
+import log_decoder
+
+LOG = (
+    "# uplink 2024-05-01\n"
+    "2024-05-01T12:00:00Z,0xAF23,1,30\n"
+    "\n"
+    "2024-05-01T12:00:05Z, af23 ,TEST,abc\r\n"
+    "2024-05-01T12:00:09Z,0xFFFF,1\n"
+    "2024-05-01T12:00:10Z,0xG710\n"
+    "2024-05-01T12:01:00Z,0xE507,10.5,-3,0,60,7\n"
+)
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    path = tmp_path / "uplink.log"
+    path.write_bytes(LOG.encode() * 20)
+    return str(path)
+
+
+def test_iter_chunks_cover_whole_lines(log_path):
+    """Test that chunks tile the file and end at line ends"""
+    data = open(log_path, "rb").read()
+    chunks = list(log_decoder.iter_chunks(log_path, chunk_bytes=50))
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(data)
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+    assert all(data[end - 1:end] == b"\n" for _, end in chunks)
+
+
+def test_decode_lines_annotates_records():
+    """Test names, enum labels, offsets and error records"""
+    text, records, errors = log_decoder.decode_lines(
+        log_decoder.data_loader.load_catalog(), LOG.encode(), base_offset=100)
+    decoded = [json.loads(line) for line in text.splitlines()]
+    assert (records, errors) == (5, 3)
+
+    assert decoded[0] == {
+        "offset": 100 + LOG.index("\n") + 1, "time": "2024-05-01T12:00:00Z",
+        "opcode": "0xAF23", "command": "CMD_ARM_SYSTEM",
+        "params": [{"name": "Mode", "value": "1", "label": "LIVE"},
+                   {"name": "Delay", "value": "30"}],
+    }
+    assert decoded[1]["command"] == "CMD_ARM_SYSTEM"
+    assert decoded[1]["params"][0] == {"name": "Mode", "value": "TEST", "label": None}
+    assert decoded[2]["command"] is None and decoded[2]["error"] == "unknown opcode"
+    assert decoded[3]["error"] == "invalid opcode"
+    assert decoded[4]["command"] == "CMD_SET_ATTITUDE"
+    assert decoded[4]["params"][-1] == {"name": None, "value": "7"}
+    assert decoded[4]["error"] == "expected 4 parameter values, got 5"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_decode_log_file_matches_in_order(log_path, workers):
+    """Test that pooled, chunked decoding gives the single-block output"""
+    expected, _, _ = log_decoder.decode_lines(
+        log_decoder.data_loader.load_catalog(), open(log_path, "rb").read())
+    out = io.StringIO()
+    records, errors = log_decoder.decode_log_file(log_path, out, workers=workers,
+                                                  chunk_bytes=64)
+    assert (records, errors) == (100, 60)
+    assert out.getvalue() == expected
+
+
+def test_decode_blank_enum_label(data_dir):
+    """Test that a blank Label in the enum CSV decodes to a null label"""
+    enums_path = data_dir / log_decoder.data_loader.ENUMS_FILE
+    enums_path.write_text(enums_path.read_text().replace("ARM_MODE,1,LIVE", "ARM_MODE,1,"))
+
+    text, records, errors = log_decoder.decode_lines(
+        log_decoder.data_loader.load_catalog(data_dir), b"t,0xAF23,1,30\nt,0xAF23,2,30\n")
+    decoded = [json.loads(line) for line in text.splitlines()]
+    assert (records, errors) == (2, 0)
+    assert decoded[0]["params"][0] == {"name": "Mode", "value": "1", "label": None}
+    assert decoded[1]["params"][0] == {"name": "Mode", "value": "2", "label": "TEST"}
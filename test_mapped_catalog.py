@@ -0,0 +1,116 @@
+"""
+Tests for mapped_catalog.py
+
+Compares the memory-mapped catalog against the in-memory CommandCatalog
+built from a scratch copy of the real CSV files.
+
+How to run:
+- pytest test_mapped_catalog.py -v
+"""
+
+import pytest
+
+import data_loader
+import mapped_catalog
+
+
+def test_mapped_lookups_match_catalog(data_dir):
+    """Test that every command resolves identically from the mapped file"""
+    catalog = data_loader.load_catalog(data_dir)
+    mapped = data_loader.load_mapped_catalog(data_dir)
+
+    assert len(mapped) == len(catalog.commands_df)
+    for command in catalog.commands_df['Command']:
+        assert command in mapped
+        assert mapped.get_command_details(command) == catalog.get_command_details(command)
+
+    assert "CMD_DOES_NOT_EXIST" not in mapped
+    with pytest.raises(KeyError):
+        mapped.get_command_details("CMD_DOES_NOT_EXIST")
+
+
+def test_mapped_search_matches_catalog(data_dir):
+    """Test substring and fuzzy search straight over the mapped buffers"""
+    catalog = data_loader.load_catalog(data_dir)
+    mapped = data_loader.load_mapped_catalog(data_dir)
+
+    for query in ["power", "a", "data recording", "zzz", ""]:
+        assert list(mapped.search(query)) == list(catalog.search(query).index)
+
+    best = mapped.fuzzy_search("CMD_DEPLY_ANTENA", limit=1)[0]
+    assert best.command == "CMD_DEPLOY_ANTENNA"
+
+
+def test_mapped_app_accessors_match_catalog(data_dir):
+    """Test the search and label accessors app.py uses on either catalog"""
+    catalog = data_loader.load_catalog(data_dir)
+    mapped = data_loader.open_catalog(data_dir)
+    assert isinstance(mapped, mapped_catalog.MappedCatalog)
+
+    for query in ["power", "a", "zzz", ""]:
+        rows = mapped.search_rows(query)
+        assert list(rows) == list(catalog.search_rows(query))
+        assert [mapped.command_names[row] for row in rows] == \
+            [catalog.command_names[row] for row in rows]
+        assert [mapped.display_strings[row] for row in rows] == \
+            [catalog.display_strings[row] for row in rows]
+    for query in ["CMD_DEPLY_ANTENA", "calibrate sensr"]:
+        assert mapped.fuzzy_searcher.search(query) == catalog.fuzzy_searcher.search(query)
+
+
+def test_mapped_file_rebuilt_when_stale(data_dir):
+    """Test that a changed CSV rewrites the mapped file"""
+    path = str(data_dir / data_loader.MAPPED_FILE)
+    data_loader.load_mapped_catalog(data_dir)
+    assert mapped_catalog.read_mapped_fingerprint(path) == data_loader.data_fingerprint(data_dir)
+
+    with open(data_dir / data_loader.COMMANDS_FILE, "a") as f:
+        f.write("CMD_NEW_COMMAND,0xFF01,Newly added command,Mode\n")
+
+    mapped = data_loader.load_mapped_catalog(data_dir)
+    assert "CMD_NEW_COMMAND" in mapped
+    assert mapped.get_command_details("CMD_NEW_COMMAND")[0] == "0xFF01"
+
+
+def test_chunked_build_matches_catalog(tmp_path, monkeypatch):
+    """Test that a build from many small chunks equals the in-memory index"""
+    import numpy as np
+
+    import generate_data
+
+    monkeypatch.setattr(mapped_catalog, "_POSTINGS_WINDOW", 50)
+    generate_data.write_synthetic_data(tmp_path, commands=300, enum_sets=5, seed=3)
+    data_loader.build_mapped_catalog(tmp_path, chunksize=7)
+    mapped = mapped_catalog.MappedCatalog(str(tmp_path / data_loader.MAPPED_FILE))
+    catalog = data_loader.CommandCatalog(*data_loader.read_data_files(tmp_path))
+
+    for name in ["row_starts", "byte_counts", "keys", "offsets", "postings"]:
+        assert np.array_equal(getattr(mapped.search_index, name),
+                              getattr(catalog.search_index, name))
+    assert bytes(mapped.search_index.heap) == catalog.search_index.heap
+    for command in catalog.commands_df['Command']:
+        assert mapped.get_command_details(command) == catalog.get_command_details(command)
+
+
+@pytest.mark.parametrize("pyarrow_split", [True, False], ids=["pyarrow", "pandas"])
+def test_param_list_edge_cases_match(data_dir, monkeypatch, pyarrow_split):
+    """Test that both catalogs keep empty parameter names and skip blank lists"""
+    import catalog_tables
+
+    if not pyarrow_split:
+        monkeypatch.setattr(catalog_tables, "pa", None)
+    param_lists = ['"Mode,,Delay"', '"Mode,"', '",Mode"', '" Mode , Delay "', '" "', '']
+    with open(data_dir / data_loader.COMMANDS_FILE, "a") as f:
+        for i, params in enumerate(param_lists):
+            f.write(f"CMD_EDGE_{i},0xFE0{i},Edge case {i},{params}\n")
+
+    catalog = data_loader.CommandCatalog(*data_loader.read_data_files(data_dir))
+    mapped = data_loader.load_mapped_catalog(data_dir)
+    for command in catalog.commands_df['Command']:
+        assert mapped.get_command_details(command) == catalog.get_command_details(command)
+
+    names = [[p['name'] for p in catalog.get_command_details(f"CMD_EDGE_{i}")[2]]
+             for i in range(len(param_lists))]
+    assert names == [["Mode", "", "Delay"], ["Mode", ""], ["", "Mode"],
+                     ["Mode", "Delay"], [], []]
+    assert catalog.get_command_details("CMD_EDGE_0")[2][1]['type'] == "unknown"
@@ -0,0 +1,113 @@
+"""
+Tests for metrics.py and the instrumented load, search and details paths
+
+How to run:
+- pytest test_metrics.py -v
+"""
+
+import os
+import threading
+
+import pytest
+
+import data_loader
+import metrics
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+
+def test_histogram_exposition():
+    """Test cumulative buckets, sum, count and label escaping"""
+    histogram = metrics.Histogram("test_latency_seconds", "Test.", ["stage"],
+                                  buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, stage='a"b')
+
+    lines = histogram.render().splitlines()
+    assert lines[:2] == ["# HELP test_latency_seconds Test.",
+                         "# TYPE test_latency_seconds histogram"]
+    assert lines[2:] == [
+        'test_latency_seconds_bucket{stage="a\\"b",le="0.1"} 1',
+        'test_latency_seconds_bucket{stage="a\\"b",le="1"} 3',
+        'test_latency_seconds_bucket{stage="a\\"b",le="+Inf"} 4',
+        'test_latency_seconds_sum{stage="a\\"b"} 6.05',
+        'test_latency_seconds_count{stage="a\\"b"} 4',
+    ]
+    with pytest.raises(ValueError):
+        histogram.observe(1.0)
+
+
+def test_cache_and_build_counters(data_dir):
+    """Test hit / miss and build-source counts across a reload"""
+    misses = metrics.CACHE_LOOKUPS.value(result="miss")
+    hits = metrics.CACHE_LOOKUPS.value(result="hit")
+    reloads = metrics.CATALOG_BUILDS.value(source="reload")
+
+    catalog = data_loader.load_catalog(str(data_dir))
+    data_loader.load_catalog(str(data_dir))
+    assert metrics.CACHE_LOOKUPS.value(result="miss") == misses + 1
+    assert metrics.CACHE_LOOKUPS.value(result="hit") == hits + 1
+
+    commands_path = data_dir / data_loader.COMMANDS_FILE
+    commands_path.write_text(commands_path.read_text() + "CMD_NEW,0x0001,New,\n")
+    os.utime(commands_path, ns=(0, 1))
+    data_loader.load_catalog(str(data_dir))
+    assert metrics.CATALOG_BUILDS.value(source="reload") == reloads + 1
+
+    assert catalog.memory_bytes() > 0
+    text = metrics.render()
+    assert "command_search_catalog_bytes " in text
+    assert 'command_search_stage_seconds_count{stage="build"}' in text
+
+
+def test_app_exports_metrics_file(data_dir, tmp_path, monkeypatch):
+    """Test that an app rerun times its stages and writes the metrics file"""
+    pytest.importorskip("streamlit")
+    from streamlit.testing.v1 import AppTest
+
+    metrics_path = tmp_path / "command_search.prom"
+    monkeypatch.setenv(metrics.METRICS_FILE_ENV, str(metrics_path))
+    monkeypatch.chdir(data_dir)
+    details = metrics.STAGE_SECONDS.count(stage="details")
+
+    app = AppTest.from_file(APP_PATH, default_timeout=60)
+    app.run()
+    app.text_input[0].input("antenna").run()
+    assert not app.exception
+
+    assert metrics.STAGE_SECONDS.count(stage="details") == details + 2
+    text = metrics_path.read_text()
+    for stage in ("load", "search", "options", "details", "render"):
+        assert f'command_search_stage_seconds_count{{stage="{stage}"}}' in text
+    assert "command_search_search_results_count" in text
+
+
+def test_concurrent_textfile_writers(tmp_path):
+    """Test that threads writing the metrics file never share a temp file"""
+    path = tmp_path / "command_search.prom"
+    errors = []
+
+    def write():
+        try:
+            for _ in range(50):
+                metrics.write_textfile(str(path))
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=write) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert os.listdir(tmp_path) == [path.name]
+    # A complete exposition (the resident bytes gauge moves between renders)
+    assert len(path.read_text().splitlines()) == len(metrics.render().splitlines())
+
+
+def test_failed_export_is_logged(tmp_path, monkeypatch, caplog):
+    """Test that an unwritable metrics file doesn't fail the rerun"""
+    monkeypatch.setenv(metrics.METRICS_FILE_ENV, str(tmp_path / "missing" / "x.prom"))
+    metrics.export_from_env()
+    assert "Could not write metrics file" in caplog.text
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,85 @@
+"""
+Tests for profiling.py
+
+How to run:
+- pytest test_profiling.py -v
+"""
+
+import os
+import pstats
+
+import pytest
+
+import profiling
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    """Enable profiling into a scratch directory, sampling nothing"""
+    directory = tmp_path / "profiles"
+    monkeypatch.setenv(profiling.PROFILE_DIR_ENV, str(directory))
+    monkeypatch.setenv(profiling.PROFILE_SAMPLE_ENV, "0")
+    monkeypatch.setenv(profiling.PROFILE_KEEP_ENV, "3")
+    return directory
+
+
+def test_disabled_without_directory(monkeypatch):
+    """Test that nothing is profiled unless the directory is configured"""
+    monkeypatch.delenv(profiling.PROFILE_DIR_ENV, raising=False)
+    assert profiling.start_rerun(force=True) is None
+    assert profiling.finish_rerun(None) is None
+
+
+def test_forced_rerun_writes_report(profile_dir):
+    """Test the .prof / .txt pair of a forced rerun, and sampling"""
+    assert profiling.start_rerun() is None
+
+    profile = profiling.start_rerun(force=True)
+    assert profile is not None
+    # One profile at a time
+    assert profiling.start_rerun(force=True) is None
+    blocks = [bytearray(1024) for _ in range(1000)]
+    sorted(range(10000), key=str)
+    report_path = profiling.finish_rerun(profile)
+    del blocks
+
+    report = open(report_path).read()
+    assert report.startswith("rerun: ")
+    assert "functions by cumulative time" in report
+    assert "allocation sites" in report
+    stats = pstats.Stats(report_path[:-len(".txt")] + ".prof")
+    assert stats.total_calls > 0
+
+
+def test_rotation_keeps_newest(profile_dir):
+    """Test that only the newest KEEP profiles survive"""
+    paths = []
+    for _ in range(5):
+        paths.append(profiling.finish_rerun(profiling.start_rerun(force=True)))
+
+    names = sorted(os.listdir(profile_dir))
+    assert len(names) == 6
+    kept = sorted(os.path.join(profile_dir, n) for n in names if n.endswith(".txt"))
+    assert kept == sorted(paths[-3:])
+
+
+def test_app_query_param_forces_profile(profile_dir, monkeypatch):
+    """Test that ?profile=1 profiles an app.py rerun"""
+    pytest.importorskip("streamlit")
+    from streamlit.testing.v1 import AppTest
+
+    # The app reads the CSV files next to it
+    monkeypatch.chdir(os.path.dirname(APP_PATH))
+    app = AppTest.from_file(APP_PATH, default_timeout=60)
+    app.run()
+    assert not app.exception
+    assert not profile_dir.exists()
+
+    app.query_params[profiling.PROFILE_QUERY_PARAM] = "1"
+    app.run()
+    assert not app.exception
+    reports = [n for n in os.listdir(profile_dir) if n.endswith(".txt")]
+    assert len(reports) == 1
+    assert "app.py" in open(profile_dir / reports[0]).read()
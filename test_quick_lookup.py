@@ -0,0 +1,117 @@
+"""
+Tests for quick_lookup.py
+
+Checks that single lookups answered from the mapped catalog match the
+full CLI, fall back when the mapped catalog is stale, and stay within an
+import-time budget without pandas, NumPy or argparse.
+
+How to run:
+- pytest test_quick_lookup.py -v
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import data_loader
+import quick_lookup
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Cumulative import time of quick_lookup, in microseconds (~8 ms measured;
+# pandas alone takes several hundred)
+IMPORT_BUDGET_US = 100_000
+
+# Modules the lookup path must not import
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "argparse")
+
+
+def _import_times(args):
+    """Run python -X importtime, return (stdout, {module: cumulative us})."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=HERE, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return result.stdout, times
+
+
+def test_parse_lookup_args():
+    """Test the accepted single-lookup forms and what falls through"""
+    parse = quick_lookup.parse_lookup_args
+    assert parse(["CMD_A"]) == ("CMD_A", ".")
+    assert parse(["--data-dir", "d", "CMD_A"]) == ("CMD_A", "d")
+    assert parse(["CMD_A", "--data-dir=d"]) == ("CMD_A", "d")
+    for argv in ([], ["--batch"], ["-h"], ["CMD_A", "CMD_B"], ["CMD_A", "--data-dir"]):
+        assert parse(argv) is None
+
+
+def test_quick_lookup_matches_full_cli(data_dir, capsys):
+    """Test identical output once the full CLI has built the mapped file"""
+    outputs = []
+    for command in ["CMD_ARM_SYSTEM", "CMD_SET_ATTITUDE", "CMD_DOES_NOT_EXIST"]:
+        argv = [command, "--data-dir", str(data_dir)]
+        data_loader.main(argv)
+        expected = capsys.readouterr().out
+        assert quick_lookup.main(argv) is True
+        assert capsys.readouterr().out == expected
+        outputs.append(expected)
+    assert "Hex Code: 0xAF23" in outputs[0]
+    assert outputs[2] == "Command 'CMD_DOES_NOT_EXIST' not found\n"
+
+
+def test_stale_mapped_catalog_falls_back(data_dir, capsys):
+    """Test that a missing or stale mapped file is left to the full CLI"""
+    argv = ["CMD_ARM_SYSTEM", "--data-dir", str(data_dir)]
+    assert quick_lookup.main(argv) is False
+
+    data_loader.main(argv)
+    assert quick_lookup.main(argv) is True
+    with open(data_dir / data_loader.COMMANDS_FILE, "a") as f:
+        f.write('CMD_NEW,0xFFF0,"Added later",\n')
+    assert quick_lookup.main(argv) is False
+    assert quick_lookup.main(["--batch"]) is False
+    capsys.readouterr()
+
+
+def test_unwritable_data_dir_falls_back(data_dir, capsys, monkeypatch):
+    """Test that the full CLI still answers when the mapped file can't be written"""
+    argv = ["CMD_ARM_SYSTEM", "--data-dir", str(data_dir)]
+    data_loader.main(argv)
+    expected = capsys.readouterr().out
+    os.remove(data_dir / data_loader.MAPPED_FILE)
+
+    def read_only(*args, **kwargs):
+        raise PermissionError(13, "Permission denied")
+    monkeypatch.setattr(data_loader, "build_mapped_catalog", read_only)
+    data_loader.main(argv)
+    assert capsys.readouterr().out == expected
+    assert not os.path.exists(data_dir / data_loader.MAPPED_FILE)
+
+
+def test_import_budget():
+    """Test that quick_lookup imports fast and without heavy modules"""
+    _, times = _import_times(["-c", "import quick_lookup"])
+    assert "quick_lookup" in times
+    assert not [name for name in HEAVY_MODULES if name in times]
+    assert times["quick_lookup"] < IMPORT_BUDGET_US
+
+
+def test_script_lookup_skips_heavy_imports(data_dir):
+    """Test that `python data_loader.py CMD` takes the fast path when current"""
+    argv = ["data_loader.py", "CMD_ARM_SYSTEM", "--data-dir", str(data_dir)]
+    # First call builds the mapped catalog through the full CLI
+    cold, times = _import_times(argv)
+    assert "pandas" in times
+
+    warm, times = _import_times(argv)
+    assert warm == cold
+    assert "Hex Code: 0xAF23" in warm
+    assert not [name for name in HEAVY_MODULES if name in times]
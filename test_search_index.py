@@ -0,0 +1,81 @@
+"""
+Tests for search_index.py
+
+Checks that the trigram index returns exactly the rows the original
+``str.contains(case=False)`` filter in app.py returned.
+
+How to run:
+- pytest test_search_index.py -v
+"""
+
+import re
+
+import pandas as pd
+
+import data_loader
+from search_index import SearchIndex
+
+
+def _scan(commands_df, query):
+    """Reference implementation: the original app.py filter (literal query)."""
+    pattern = re.escape(query)
+    mask = (
+        commands_df['Command'].str.contains(pattern, case=False, na=False) |
+        commands_df['Description'].str.contains(pattern, case=False, na=False)
+    )
+    return list(commands_df.index[mask])
+
+
+def test_search_matches_str_contains():
+    """Test index results against the DataFrame scan for assorted queries"""
+    commands_df, _, _ = data_loader.load_data()
+    catalog = data_loader.load_catalog()
+
+    queries = ["a", "po", "ant", "antenna", "POWER", "data recording",
+               "cmd_set", "(safe/live", "payload", "zzz", "mode "]
+    for query in queries:
+        assert list(catalog.search(query).index) == _scan(commands_df, query), query
+
+
+def test_search_does_not_match_across_fields():
+    """Test that trigrams spanning Command and Description are not indexed"""
+    commands = pd.Series(["CMD_AB", "CMD_CD"])
+    descriptions = pd.Series(["xyz", None])
+    index = SearchIndex(commands, descriptions)
+
+    assert list(index.search("abx")) == []
+    assert list(index.search("b\0x")) == []
+    assert list(index.search("xyz")) == [0]
+    assert list(index.search("cmd_")) == [0, 1]
+    assert list(index.search("")) == [0, 1]
+
+
+
+def test_patched_index_equals_rebuild(tmp_path):
+    """Test that patching removed, changed and added rows matches a full build"""
+    import numpy as np
+
+    import generate_data
+
+    generate_data.write_synthetic_data(tmp_path, commands=200, seed=1)
+    commands_df, _, _ = data_loader.read_data_files(tmp_path)
+    old = SearchIndex(commands_df['Command'], commands_df['Description'])
+
+    # Drop a row, change one, insert one in the middle and one at the end
+    new_df = commands_df.drop(index=1).reset_index(drop=True)
+    new_df.loc[2, 'Description'] = "Recalibrate the star tracker"
+    new_df = pd.concat([
+        new_df.iloc[:50],
+        pd.DataFrame({'Command': ["CMD_NEW_A"], 'Description': ["Brand new antenna mode"]}),
+        new_df.iloc[50:],
+        pd.DataFrame({'Command': ["CMD_NEW_B"], 'Description': [None]}),
+    ], ignore_index=True).astype(commands_df.dtypes.to_dict())
+
+    row_map = data_loader.diff_rows(commands_df, new_df, ['Command']).row_map
+    assert list(row_map[:4]) == [0, -1, 1, -1]
+
+    patched = old.patched(row_map, new_df['Command'].to_numpy(), new_df['Description'].to_numpy())
+    rebuilt = SearchIndex(new_df['Command'], new_df['Description'])
+    assert bytes(patched.heap) == rebuilt.heap
+    for name in ["row_starts", "byte_counts", "keys", "offsets", "postings"]:
+        assert np.array_equal(getattr(patched, name), getattr(rebuilt, name)), name
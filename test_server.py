@@ -0,0 +1,181 @@
+"""
+Tests for server.py
+
+Starts the lookup server on a free localhost port in a background thread
+and talks to it over one keep-alive connection with http.client.
+
+How to run:
+- pytest test_server.py -v
+"""
+
+import asyncio
+import http.client
+import json
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+import data_loader
+import server
+
+
+@pytest.fixture
+def lookup_server(data_dir, monkeypatch):
+    """Serve a copy of the sample CSVs; yields (connection, data_dir)"""
+    monkeypatch.setattr(server, "RELOAD_CHECK_INTERVAL", 0.0)
+
+    loop = asyncio.new_event_loop()
+    lookup = server.LookupServer(server.LookupService(str(data_dir)), port=0)
+    loop.run_until_complete(lookup.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    connection = http.client.HTTPConnection("127.0.0.1", lookup.port, timeout=10)
+    yield connection, data_dir
+
+    connection.close()
+    asyncio.run_coroutine_threadsafe(lookup.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def request(connection, method, path, body=None, headers=None):
+    connection.request(method, path, body=body, headers=headers or {})
+    response = connection.getresponse()
+    payload = response.read()
+    return response, json.loads(payload) if payload else None
+
+
+def test_endpoints_over_keep_alive(lookup_server):
+    """Test search, details, batch details and autocomplete on one connection"""
+    connection, _ = lookup_server
+
+    response, body = request(connection, "GET", "/search?q=antenna")
+    assert response.status == 200
+    assert response.getheader("Connection") == "keep-alive"
+    assert [r["command"] for r in body["results"]] == ["CMD_DEPLOY_ANTENNA"]
+    assert not body["fuzzy"]
+
+    _, body = request(connection, "GET", "/search?q=CMD_DEPLY_ANTENA")
+    assert body["fuzzy"]
+    assert body["results"][0]["command"] == "CMD_DEPLOY_ANTENNA"
+
+    response, body = request(connection, "GET", "/details?command=CMD_ARM_SYSTEM")
+    assert response.status == 200
+    assert body["hex_code"] == "0xAF23"
+    assert [p["name"] for p in body["params"]] == ["Mode", "Delay"]
+
+    response, body = request(connection, "GET", "/details?command=CMD_NOPE")
+    assert response.status == 404
+    assert "error" in body
+
+    response, body = request(
+        connection, "POST", "/details",
+        body=json.dumps({"commands": ["CMD_ARM_SYSTEM", "CMD_NOPE"]}),
+        headers={"Content-Type": "application/json"},
+    )
+    assert response.status == 200
+    assert [r["found"] for r in body["results"]] == [True, False]
+    assert body["not_found"] == 1
+
+    _, body = request(connection, "GET", "/autocomplete?prefix=cmd_se&limit=2")
+    assert body["suggestions"] == ["CMD_SET_ATTITUDE", "CMD_SET_MODE"]
+
+    response, _ = request(connection, "GET", "/search?limit=x")
+    assert response.status == 400
+    response, _ = request(connection, "DELETE", "/search")
+    assert response.status == 405
+
+
+def test_etag_follows_dictionary_version(lookup_server):
+    """Test 304 revalidation until a CSV edit produces a new version"""
+    connection, data_dir = lookup_server
+
+    response, body = request(connection, "GET", "/details?command=CMD_ARM_SYSTEM")
+    etag = response.getheader("ETag")
+    assert etag == f'"{body["version"]}"'
+
+    response, body = request(connection, "GET", "/details?command=CMD_ARM_SYSTEM",
+                             headers={"If-None-Match": etag})
+    assert response.status == 304
+    assert body is None
+
+    commands_path = data_dir / "master_commands.csv"
+    text = commands_path.read_text().replace("Arms the safety-critical", "Arms critical")
+    commands_path.write_text(text)
+    os.utime(commands_path, ns=(time.time_ns(), time.time_ns() + 10**9))
+
+    # The reload runs in the background; the old version is served meanwhile
+    deadline = time.monotonic() + 10
+    while True:
+        response, body = request(connection, "GET", "/details?command=CMD_ARM_SYSTEM",
+                                 headers={"If-None-Match": etag})
+        if response.status == 200 or time.monotonic() > deadline:
+            break
+        time.sleep(0.05)
+    assert response.status == 200
+    assert response.getheader("ETag") != etag
+    assert body["description"].startswith("Arms critical")
+
+
+def test_metrics_endpoint(lookup_server):
+    """Test the Prometheus exposition, including response cache counters"""
+    connection, _ = lookup_server
+    request(connection, "GET", "/search?q=mode")
+    request(connection, "GET", "/search?q=mode")
+
+    connection.request("GET", "/metrics")
+    response = connection.getresponse()
+    text = response.read().decode("utf-8")
+    assert response.status == 200
+    assert response.getheader("Content-Type").startswith("text/plain")
+    assert 'command_search_stage_seconds_count{stage="http_search"}' in text
+    assert 'command_search_response_cache_lookups_total{result="hit"}' in text
+
+
+def test_blank_enum_label_and_internal_errors(lookup_server, monkeypatch):
+    """Test null for a missing enum label, and 500 instead of a dropped connection"""
+    connection, data_dir = lookup_server
+    enums_path = data_dir / data_loader.ENUMS_FILE
+    enums_path.write_text(enums_path.read_text().replace("ARM_MODE,1,LIVE", "ARM_MODE,1,"))
+    os.utime(enums_path, ns=(time.time_ns(), time.time_ns() + 10**9))
+
+    deadline = time.monotonic() + 10
+    while True:
+        response, body = request(connection, "GET", "/details?command=CMD_ARM_SYSTEM")
+        labels = body["params"][0]["enum_values"] if response.status == 200 else None
+        if labels == {"0": "SAFE", "1": None, "2": "TEST"} or time.monotonic() > deadline:
+            break
+        time.sleep(0.05)
+    assert labels == {"0": "SAFE", "1": None, "2": "TEST"}
+
+    monkeypatch.setattr(data_loader, "details_record", lambda catalog, name: {"x": object()})
+    response, body = request(connection, "GET", "/details?command=CMD_SET_ATTITUDE")
+    assert response.status == 500
+    assert body["error"] == "Internal server error"
+    # The connection is still usable
+    response, _ = request(connection, "GET", "/version")
+    assert response.status == 200
+
+
+@pytest.mark.parametrize("length, status, message", [
+    ("abc", 400, "Malformed Content-Length header"),
+    (str(server.MAX_BODY_BYTES + 1), 413, f"Body exceeds {server.MAX_BODY_BYTES} bytes"),
+])
+def test_unreadable_body(lookup_server, length, status, message):
+    """Test an error and a closed connection for a malformed or oversized body"""
+    connection, _ = lookup_server
+    with socket.create_connection(("127.0.0.1", connection.port), timeout=10) as sock:
+        sock.sendall(f"POST /details HTTP/1.1\r\nHost: x\r\n"
+                     f"Content-Length: {length}\r\n\r\n".encode("latin-1"))
+        response = b""
+        while chunk := sock.recv(4096):
+            response += chunk
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert head.startswith(f"HTTP/1.1 {status} ".encode())
+    assert b"Connection: close" in head
+    assert json.loads(body) == {"error": message}
@@ -0,0 +1,70 @@
+"""
+Tests for snapshot.py and the snapshot path of data_loader.load_catalog()
+
+Each test works on a scratch copy of the real CSV files.
+
+How to run:
+- pytest test_snapshot.py -v
+"""
+
+import os
+
+import pytest
+
+import data_loader
+import snapshot
+
+
+def _fail_read(data_dir="."):
+    raise AssertionError("CSV files should not be parsed")
+
+
+def test_cold_start_uses_snapshot(data_dir, monkeypatch):
+    """Test that a second cold start loads the snapshot instead of the CSVs"""
+    catalog = data_loader.load_catalog(data_dir)
+    assert (data_dir / data_loader.SNAPSHOT_FILE).exists()
+
+    monkeypatch.setattr(data_loader, "_cache_entry", None)
+    monkeypatch.setattr(data_loader, "read_data_files", _fail_read)
+    restored = data_loader.load_catalog(data_dir)
+
+    assert restored is not catalog
+    assert restored.commands_df.equals(catalog.commands_df)
+    assert restored.get_command_details("CMD_SET_MODE") == catalog.get_command_details("CMD_SET_MODE")
+    assert list(restored.search("power").index) == list(catalog.search("power").index)
+
+
+def test_stale_snapshot_is_rebuilt(data_dir, monkeypatch):
+    """Test that editing a CSV makes the loader rebuild and rewrite the snapshot"""
+    data_loader.load_catalog(data_dir)
+
+    commands_file = data_dir / data_loader.COMMANDS_FILE
+    with open(commands_file, "a") as f:
+        f.write("CMD_NEW_COMMAND,0xFF01,Newly added command,Mode\n")
+    stat = os.stat(commands_file)
+    os.utime(commands_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    monkeypatch.setattr(data_loader, "_cache_entry", None)
+    assert "CMD_NEW_COMMAND" in data_loader.load_catalog(data_dir)
+
+    fingerprint = data_loader.data_fingerprint(data_dir)
+    stored = snapshot.read_snapshot(str(data_dir / data_loader.SNAPSHOT_FILE), fingerprint)
+    assert stored is not None and "CMD_NEW_COMMAND" in stored
+
+
+def test_snapshot_rejects_other_versions_and_garbage(data_dir, monkeypatch):
+    """Test that version mismatches and corrupt files read as missing"""
+    catalog = data_loader.load_catalog(data_dir)
+    fingerprint = data_loader.data_fingerprint(data_dir)
+    path = str(data_dir / data_loader.SNAPSHOT_FILE)
+
+    with monkeypatch.context() as m:
+        m.setattr(snapshot, "SNAPSHOT_VERSION", snapshot.SNAPSHOT_VERSION + 1)
+        assert snapshot.read_snapshot(path, fingerprint) is None
+
+    assert snapshot.read_snapshot(path, fingerprint) is not None
+    with open(path, "r+b") as f:
+        f.truncate(64)
+    assert snapshot.read_snapshot(path, fingerprint) is None
+    assert snapshot.read_snapshot(str(data_dir / "missing"), fingerprint) is None
+    assert len(catalog) > 0